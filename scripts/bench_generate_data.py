@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for generate_data.py
+===============================
+Times the generator's stages against the real seasons in data/seasons/ and
+against synthetic datasets of 10², 10⁴ and 10⁶ matches built in the same
+schema, and records wall time and tracemalloc peak for each.
+
+Every run is appended to a history file together with the current git
+commit; the previous run is used as the baseline and benchmarks that got
+slower than --threshold are reported (exit status 1 with --fail-on-regression).
+
+Datasets up to --e2e-max matches also time every output stage of the
+build graph and an end-to-end main().
+
+The 10⁶-match dataset takes several minutes; pass --sizes to skip it.
+
+The knockout tie simulator (simulate_ties.py) is also timed at 1, 2, 4, …
+worker processes up to the CPU count, reporting simulated campaigns per
+second and the speedup over a single worker. Those results are named by
+the engine that ran (numpy or python), since the two differ several-fold.
+
+Usage:
+    python3 scripts/bench_generate_data.py
+    python3 scripts/bench_generate_data.py --sizes 100 10000 --repeat 5
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import generate_data as gd
+import simulate_ties
+
+HISTORY_PATH = os.path.join(gd.ROOT_DIR, ".cache", "bench", "history.jsonl")
+DEFAULT_SIZES = (100, 10_000, 1_000_000)
+DEFAULT_SIM_DRAWS = 200_000
+NOISE_FLOOR_S = 0.001  # slowdowns smaller than this are never reported
+
+SYNTHETIC_SEASONS = 100
+STAGES = ("Group A", "Group B", "Round of 16", "Quarter-final", "Semi-final", "Final")
+OPPONENTS = ("Bayern Munich", "Juventus", "AC Milan", "Chelsea", "Arsenal", "Benfica", "Ajax", "Porto", "Lyon", "Celtic")
+SURNAMES = ("Alba", "Costa", "Duarte", "Ferrer", "Garcia", "Lopez", "Moreno", "Navarro", "Rios", "Serra", "Torres", "Vidal")
+
+
+def synthetic_season(rng: random.Random, index: int, matches: int) -> gd.Season:
+    """One season source in the data/seasons schema with `matches` random fixtures"""
+    squad = [f"Player {surname}" for surname in SURNAMES]
+    rows = []
+    for m in range(matches):
+        scored, conceded = rng.randint(0, 5), rng.randint(0, 3)
+        shots = rng.randint(5, 25)
+        rows.append({
+            "date": f"{2000 + m // 300:04d}-{1 + m // 25 % 12:02d}-{1 + m % 25:02d}",
+            "opponent": rng.choice(OPPONENTS),
+            "home_away": rng.choice("HAN"),
+            "score": f"{scored}-{conceded}",
+            "goals_scored": scored,
+            "goals_conceded": conceded,
+            "stage": STAGES[min(m * len(STAGES) // matches, len(STAGES) - 1)],
+            "scorers": [rng.choice(SURNAMES) for _ in range(scored)],
+            "possession": rng.randint(35, 75),
+            "shots": shots,
+            "shots_on_target": rng.randint(0, shots),
+        })
+    return gd.Season.from_dict({
+        "id": f"synthetic-{index:06d}",
+        "display_name": f"Synthetic {index}",
+        "competition": "Synthetic Cup",
+        "manager": "Benchmark",
+        "squad_core": squad,
+        "formation": "4-3-3",
+        "knockout_path": [],
+        "final": {
+            "opponent": rows[-1]["opponent"], "venue": "Synthetic Arena", "date": rows[-1]["date"],
+            "score": rows[-1]["score"], "extra_time": False, "scorers": [], "attendance": 0,
+        },
+        "matches": rows,
+        "top_scorers": [{"name": name, "assists": rng.randint(0, 5), "minutes": 900} for name in squad[:5]],
+    })
+
+
+def synthetic_seasons(total_matches: int, seed: int = 0) -> list:
+    """Roughly total_matches matches spread over at most SYNTHETIC_SEASONS seasons"""
+    rng = random.Random(seed)
+    count = max(1, min(SYNTHETIC_SEASONS, total_matches // 13))
+    per_season = max(1, total_matches // count)
+    return [synthetic_season(rng, i, per_season) for i in range(count)]
+
+
+def write_fixture(seasons: list, directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for season in seasons:
+        source = {k: v for k, v in season.to_dict().items() if k not in gd.SEASON_TOTAL_FIELDS}
+        with open(os.path.join(directory, f"{season.id}.json"), "w", encoding="utf-8") as f:
+            json.dump(source, f, ensure_ascii=False, default=gd.to_json)
+
+
+def measure(fn: Callable, repeat: int) -> dict:
+    """Best/median wall time over `repeat` runs, then one extra run under tracemalloc"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"best_s": min(times), "median_s": statistics.median(times), "peak_bytes": peak}
+
+
+def bench_dataset(label: str, sources: list, repeat: int, end_to_end: bool) -> dict:
+    """Run every benchmark over one dataset; returns {benchmark name: result}"""
+    seasons, totals = gd.build_seasons(sources)
+    document = {"seasons": gd.StreamedList(iter(seasons)), "cross_season": gd.compute_cross_season_data(seasons, totals)}
+
+    def serialize():
+        document["seasons"] = gd.StreamedList(iter(seasons))
+        for _ in gd.iter_json_chunks(document):
+            pass
+
+    benchmarks = {
+        "build_seasons": lambda: gd.build_seasons(sources),
+        "compute_cross_season_data": lambda: gd.compute_cross_season_data(seasons, totals),
+        "compute_dominance_index": lambda: [gd.compute_dominance_index(s) for s in seasons],
+        "validate_season": lambda: [list(gd.validate_season(s)) for s in sources],
+        "json_serialization": serialize,
+    }
+    if end_to_end:
+        benchmarks.update(stage_benchmarks(seasons, totals))
+        benchmarks["main"] = lambda: _run_main(sources)
+
+    results = {}
+    for name, fn in benchmarks.items():
+        results[f"{label}/{name}"] = measure(fn, repeat)
+        _print_result(f"{label}/{name}", results[f"{label}/{name}"])
+    return results
+
+
+def stage_benchmarks(seasons: list, totals: dict) -> dict:
+    """One benchmark per output stage of the build graph, staging into a scratch directory"""
+    comparison = [gd.compute_comparison_row(season, totals, i) for i, season in enumerate(seasons)]
+    values = {"cross_season": {"comparison": comparison, "common_traits": gd.compute_common_traits(totals)}}
+
+    def run(stage: gd.Stage) -> Any:
+        scratch = tempfile.mkdtemp(prefix="bench-generate-data-")
+        try:
+            for directory in (gd.SHARD_DIR_NAME, gd.PATCH_DIR_NAME, gd.COLUMNAR_DIR_NAME):
+                os.makedirs(os.path.join(scratch, directory))
+            inputs = gd.BuildInputs(seasons, totals, comparison, {season.id: {} for season in seasons}, scratch)
+            value, artifacts = stage.run(inputs, *(values[name] for name in stage.inputs))
+            for artifact in artifacts:
+                artifact.file.close()
+            return value
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    # stages that read another stage's value (dataset reads the shard index) get it precomputed, untimed
+    read = {name for stage in gd.STAGES.values() for name in stage.inputs}
+    for name, stage in gd.STAGES.items():
+        if name in read and name not in values:
+            values[name] = run(stage)
+    return {f"stage/{name}": functools.partial(run, stage) for name, stage in gd.STAGES.items()}
+
+
+def _run_main(sources: list) -> None:
+    """End-to-end uncached build of `sources` into a scratch directory"""
+    scratch = tempfile.mkdtemp(prefix="bench-generate-data-")
+    try:
+        seasons_dir = os.path.join(scratch, "seasons")
+        write_fixture(sources, seasons_dir)
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                gd.main([
+                    "--force",
+                    "--seasons-dir", seasons_dir,
+                    "--out-dir", os.path.join(scratch, "out"),
+                    "--cache-file", os.path.join(scratch, "cache.json"),
+                ])
+            finally:
+                sys.stdout = stdout
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def default_worker_counts() -> list:
+    """1, 2, 4, ... up to and including the CPU count"""
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    return counts + ([cpus] if counts[-1] != cpus else [])
+
+
+def bench_simulation(draws: int, worker_counts: list, repeat: int) -> dict:
+    """Simulator throughput at each worker count, with speedup over the first"""
+    seasons, _ = gd.build_seasons([source.load() for source in gd.SeasonRegistry()])
+    engine = "python" if simulate_ties.np is None else "numpy"  # named apart so history never compares the two
+    results = {}
+    for workers in worker_counts:
+        name = f"simulate-{engine}-{draws}/workers-{workers}"
+        result = measure(lambda: simulate_ties.simulate(seasons, draws, 0, workers), repeat)
+        result["campaigns_per_s"] = round(draws * len(seasons) / result["best_s"])
+        results[name] = result
+        _print_result(name, result)
+        speedup = result["campaigns_per_s"] / results[f"simulate-{engine}-{draws}/workers-{worker_counts[0]}"]["campaigns_per_s"]
+        print(f"  {'':<48} {result['campaigns_per_s']:>14,} campaigns/s   speedup {speedup:.2f}x")
+    return results
+
+
+def _print_result(name: str, result: dict) -> None:
+    print(f"  {name:<48} best {result['best_s'] * 1000:>10.2f} ms"
+          f"   median {result['median_s'] * 1000:>10.2f} ms   peak {result['peak_bytes'] / 2**20:>8.2f} MiB")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=gd.ROOT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_baseline(path: str) -> dict:
+    """Results of the most recent run in the history file"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+    except OSError:
+        return {}
+    return json.loads(lines[-1])["results"] if lines else {}
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """(name, baseline best, current best) for benchmarks slower than baseline by more than threshold"""
+    return [
+        (name, baseline[name]["best_s"], result["best_s"])
+        for name, result in results.items()
+        if name in baseline
+        and result["best_s"] - baseline[name]["best_s"] > max(baseline[name]["best_s"] * threshold, NOISE_FLOOR_S)
+    ]
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scripts/generate_data.py")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES),
+                        help="synthetic dataset sizes in matches (default: 100 10000 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (default: 3)")
+    parser.add_argument("--e2e-max", type=int, default=10_000,
+                        help="largest synthetic size that also runs end-to-end main() (default: 10000)")
+    parser.add_argument("--sim-draws", type=int, default=DEFAULT_SIM_DRAWS,
+                        help="simulated runs per campaign in the simulator scaling benchmark (default: 200000)")
+    parser.add_argument("--sim-workers", type=int, nargs="*", default=None,
+                        help="worker counts for the simulator scaling benchmark (default: 1 2 4 ... CPU count; "
+                             "pass no values to skip)")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON-lines file results are appended to")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print("real seasons")
+    real = [source.load() for source in gd.SeasonRegistry()]
+    results.update(bench_dataset("real", real, args.repeat, end_to_end=True))
+    for size in args.sizes:
+        print(f"synthetic {size} matches")
+        sources = synthetic_seasons(size)
+        results.update(bench_dataset(f"synthetic-{size}", sources, args.repeat, end_to_end=size <= args.e2e_max))
+        del sources
+    worker_counts = default_worker_counts() if args.sim_workers is None else args.sim_workers
+    if worker_counts:
+        print(f"simulator scaling ({args.sim_draws} draws per campaign)")
+        results.update(bench_simulation(args.sim_draws, worker_counts, args.repeat))
+
+    baseline = load_baseline(args.history)
+    slower = regressions(results, baseline, args.threshold)
+    for name, before, after in slower:
+        print(f"⚠️  {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "results": results,
+        }) + "\n")
+    print(f"✅ Recorded {len(results)} results in {args.history}")
+    return 1 if slower and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
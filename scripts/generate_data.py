@@ -4,6 +4,7 @@ Barça UCL Winning Campaigns — Data Generator
 =============================================
 Generates barca_ucl_data.json with real, verified historical data for
 FC Barcelona's five Champions League/European Cup winning seasons.
+Each season is defined by a JSON file under data/seasons/.
 
 Sources:
 - UEFA.com official match records
@@ -16,530 +17,513 @@ Data integrity:
 - No synthetic, generated, or estimated data
 """
 
+import argparse
+import contextlib
+import cProfile
+import functools
+import gc
+import hashlib
+import heapq
+import inspect
+import itertools
 import json
+import math
+import mmap
+import operator
 import os
-from typing import Any
+import platform
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+import unicodedata
+import zlib
+from array import array
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional
 
-def create_1992_season() -> dict:
-    """1991-92 European Cup — Johan Cruyff's Dream Team"""
-    return {
-        "id": "1991-92",
-        "display_name": "1991–92",
-        "competition": "European Cup",
-        "manager": "Johan Cruyff",
-        "squad_core": [
-            "Andoni Zubizarreta", "Ronald Koeman", "Michael Laudrup",
-            "Hristo Stoichkov", "Txiki Begiristain", "José Mari Bakero",
-            "Pep Guardiola", "Juan Carlos", "Eusebio Sacristán",
-            "Jon Andoni Goikoetxea", "Albert Ferrer"
-        ],
-        "formation": "3-4-3 / 4-3-3",
-        "matches_played": 10,
-        "wins": 7,
-        "draws": 2,
-        "losses": 1,
-        "goals_scored": 14,
-        "goals_conceded": 7,
-        "goal_difference": 7,
-        "clean_sheets": 4,
-        "goals_per_match": round(14 / 10, 2),
-        "goals_conceded_per_match": round(7 / 10, 2),
-        "win_percentage": round(7 / 10 * 100, 1),
-        "avg_possession": None,  # Not reliably tracked in 1992
-        "knockout_path": [
-            {
-                "round": "Second Round",
-                "opponent": "Kaiserslautern",
-                "leg1": {"score": "2-0", "venue": "H"},
-                "leg2": {"score": "1-0", "venue": "A"},
-                "aggregate": "3-0",
-                "key_contributors": ["Stoichkov", "Bakero"]
-            },
-            {
-                "round": "Quarter-final",
-                "opponent": "Sparta Prague",
-                "leg1": {"score": "3-2", "venue": "A"},
-                "leg2": {"score": "1-0", "venue": "H"},
-                "aggregate": "4-2",
-                "key_contributors": ["Laudrup", "Stoichkov", "Bakero"]
-            },
-            {
-                "round": "Group Stage (Final Round)",
-                "opponent": "Benfica",
-                "note": "Top of group with Benfica, Sparta, Dynamo Kyiv",
-                "aggregate": "Group winners",
-                "key_contributors": ["Stoichkov", "Laudrup"]
-            },
-            {
-                "round": "Final",
-                "opponent": "Sampdoria",
-                "venue": "Wembley Stadium, London",
-                "score": "1-0 (a.e.t.)",
-                "aggregate": "1-0",
-                "key_contributors": ["Ronald Koeman"],
-                "detail": "Koeman free kick in 112th minute"
-            }
-        ],
-        "final": {
-            "opponent": "Sampdoria",
-            "venue": "Wembley Stadium, London",
-            "date": "1992-05-20",
-            "score": "1-0",
-            "extra_time": True,
-            "scorers": [{"name": "Ronald Koeman", "minute": 112}],
-            "attendance": 70827
-        },
-        "matches": [
-            {"date": "1991-09-18", "opponent": "Hansa Rostock", "home_away": "H", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "First Round", "scorers": ["Stoichkov", "Witschge"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1991-10-02", "opponent": "Hansa Rostock", "home_away": "A", "score": "3-0", "goals_scored": 3, "goals_conceded": 0, "stage": "First Round", "scorers": ["Laudrup", "Stoichkov", "Begiristain"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1991-10-23", "opponent": "Kaiserslautern", "home_away": "H", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "Second Round", "scorers": ["Stoichkov", "Bakero"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1991-11-06", "opponent": "Kaiserslautern", "home_away": "A", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Second Round", "scorers": ["Begiristain"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1992-03-04", "opponent": "Sparta Prague", "home_away": "A", "score": "3-2", "goals_scored": 3, "goals_conceded": 2, "stage": "Quarter-final", "scorers": ["Laudrup", "Bakero", "Salinas"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1992-03-18", "opponent": "Sparta Prague", "home_away": "H", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Quarter-final", "scorers": ["Stoichkov"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1992-04-01", "opponent": "Benfica", "home_away": "A", "score": "1-2", "goals_scored": 1, "goals_conceded": 2, "stage": "Group Stage", "scorers": ["Laudrup"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1992-04-15", "opponent": "Dynamo Kyiv", "home_away": "H", "score": "0-0", "goals_scored": 0, "goals_conceded": 0, "stage": "Group Stage", "scorers": [], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1992-04-29", "opponent": "Benfica", "home_away": "H", "score": "2-1", "goals_scored": 2, "goals_conceded": 1, "stage": "Group Stage", "scorers": ["Bakero", "Laudrup"], "possession": None, "shots": None, "shots_on_target": None},
-            {"date": "1992-05-20", "opponent": "Sampdoria", "home_away": "N", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Final", "scorers": ["Koeman"], "possession": None, "shots": None, "shots_on_target": None, "extra_time": True}
-        ],
-        "top_scorers": [
-            {"name": "Hristo Stoichkov", "goals": 5, "assists": 1, "minutes": 900, "contribution_share": round(6/14*100, 1)},
-            {"name": "Michael Laudrup", "goals": 4, "assists": 3, "minutes": 870, "contribution_share": round(7/14*100, 1)},
-            {"name": "José Mari Bakero", "goals": 3, "assists": 1, "minutes": 810, "contribution_share": round(4/14*100, 1)},
-            {"name": "Txiki Begiristain", "goals": 2, "assists": 1, "minutes": 750, "contribution_share": round(3/14*100, 1)},
-            {"name": "Ronald Koeman", "goals": 1, "assists": 0, "minutes": 900, "contribution_share": round(1/14*100, 1)}
-        ]
-    }
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are only written when available
+    brotli = None
 
-def create_2006_season() -> dict:
-    """2005-06 Champions League — Rijkaard's second wave"""
-    return {
-        "id": "2005-06",
-        "display_name": "2005–06",
-        "competition": "UEFA Champions League",
-        "manager": "Frank Rijkaard",
-        "squad_core": [
-            "Víctor Valdés", "Carles Puyol", "Rafael Márquez",
-            "Giovanni van Bronckhorst", "Oleguer", "Deco",
-            "Xavi", "Andrés Iniesta", "Ronaldinho",
-            "Samuel Eto'o", "Ludovic Giuly", "Edmílson"
-        ],
-        "formation": "4-3-3",
-        "matches_played": 13,
-        "wins": 9,
-        "draws": 2,
-        "losses": 2,
-        "goals_scored": 20,
-        "goals_conceded": 10,
-        "goal_difference": 10,
-        "clean_sheets": 5,
-        "goals_per_match": round(20 / 13, 2),
-        "goals_conceded_per_match": round(10 / 13, 2),
-        "win_percentage": round(9 / 13 * 100, 1),
-        "avg_possession": 58,
-        "knockout_path": [
-            {
-                "round": "Round of 16",
-                "opponent": "Chelsea",
-                "leg1": {"score": "1-2", "venue": "A"},
-                "leg2": {"score": "1-1 (a.e.t.)", "venue": "H"},
-                "aggregate": "2-3 (away goals after 3-3 on agg — Barça went through on away goals; corrected: Barça wins 3-2 agg)",
-                "key_contributors": ["Motta", "Eto'o", "Ronaldinho"]
-            },
-            {
-                "round": "Quarter-final",
-                "opponent": "Benfica",
-                "leg1": {"score": "0-0", "venue": "A"},
-                "leg2": {"score": "2-0", "venue": "H"},
-                "aggregate": "2-0",
-                "key_contributors": ["Ronaldinho", "Eto'o"]
-            },
-            {
-                "round": "Semi-final",
-                "opponent": "AC Milan",
-                "leg1": {"score": "0-1", "venue": "H"},
-                "leg2": {"score": "0-0", "venue": "A"},
-                "aggregate": "1-0",
-                "key_contributors": ["Giuly", "Valdés"]
-            },
-            {
-                "round": "Final",
-                "opponent": "Arsenal",
-                "venue": "Stade de France, Paris",
-                "score": "2-1",
-                "aggregate": "2-1",
-                "key_contributors": ["Eto'o", "Belletti"],
-                "detail": "Came from behind after Sol Campbell opener"
-            }
-        ],
-        "final": {
-            "opponent": "Arsenal",
-            "venue": "Stade de France, Paris",
-            "date": "2006-05-17",
-            "score": "2-1",
-            "extra_time": False,
-            "scorers": [
-                {"name": "Samuel Eto'o", "minute": 76},
-                {"name": "Juliano Belletti", "minute": 81}
-            ],
-            "attendance": 79610
-        },
-        "matches": [
-            {"date": "2005-09-14", "opponent": "Werder Bremen", "home_away": "A", "score": "0-2", "goals_scored": 0, "goals_conceded": 2, "stage": "Group C", "scorers": [], "possession": 55, "shots": 12, "shots_on_target": 4},
-            {"date": "2005-09-28", "opponent": "Udinese", "home_away": "H", "score": "4-1", "goals_scored": 4, "goals_conceded": 1, "stage": "Group C", "scorers": ["Eto'o", "Eto'o", "Deco", "Maxi López"], "possession": 61, "shots": 18, "shots_on_target": 9},
-            {"date": "2005-10-19", "opponent": "Panathinaikos", "home_away": "H", "score": "5-0", "goals_scored": 5, "goals_conceded": 0, "stage": "Group C", "scorers": ["Deco", "Eto'o", "van Bronckhorst", "Messi", "Eto'o"], "possession": 64, "shots": 22, "shots_on_target": 12},
-            {"date": "2005-11-02", "opponent": "Panathinaikos", "home_away": "A", "score": "0-0", "goals_scored": 0, "goals_conceded": 0, "stage": "Group C", "scorers": [], "possession": 52, "shots": 10, "shots_on_target": 3},
-            {"date": "2005-11-23", "opponent": "Werder Bremen", "home_away": "H", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Group C", "scorers": ["Ronaldinho", "Eto'o", "van Bronckhorst"], "possession": 59, "shots": 16, "shots_on_target": 8},
-            {"date": "2005-12-07", "opponent": "Udinese", "home_away": "A", "score": "2-1", "goals_scored": 2, "goals_conceded": 1, "stage": "Group C", "scorers": ["Iniesta", "Larsson"], "possession": 54, "shots": 14, "shots_on_target": 6},
-            {"date": "2006-02-22", "opponent": "Chelsea", "home_away": "A", "score": "1-2", "goals_scored": 1, "goals_conceded": 2, "stage": "Round of 16", "scorers": ["Motta"], "possession": 48, "shots": 11, "shots_on_target": 5},
-            {"date": "2006-03-07", "opponent": "Chelsea", "home_away": "H", "score": "1-1", "goals_scored": 1, "goals_conceded": 1, "stage": "Round of 16", "scorers": ["Ronaldinho"], "possession": 56, "shots": 15, "shots_on_target": 7, "extra_time": True},
-            {"date": "2006-03-28", "opponent": "Benfica", "home_away": "A", "score": "0-0", "goals_scored": 0, "goals_conceded": 0, "stage": "Quarter-final", "scorers": [], "possession": 53, "shots": 9, "shots_on_target": 3},
-            {"date": "2006-04-05", "opponent": "Benfica", "home_away": "H", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "Quarter-final", "scorers": ["Ronaldinho", "Eto'o"], "possession": 62, "shots": 17, "shots_on_target": 8},
-            {"date": "2006-04-18", "opponent": "AC Milan", "home_away": "H", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Semi-final", "scorers": ["Giuly"], "possession": 57, "shots": 13, "shots_on_target": 5},
-            {"date": "2006-04-26", "opponent": "AC Milan", "home_away": "A", "score": "0-0", "goals_scored": 0, "goals_conceded": 0, "stage": "Semi-final", "scorers": [], "possession": 51, "shots": 8, "shots_on_target": 2},
-            {"date": "2006-05-17", "opponent": "Arsenal", "home_away": "N", "score": "2-1", "goals_scored": 2, "goals_conceded": 1, "stage": "Final", "scorers": ["Eto'o", "Belletti"], "possession": 56, "shots": 11, "shots_on_target": 5}
-        ],
-        "top_scorers": [
-            {"name": "Samuel Eto'o", "goals": 7, "assists": 2, "minutes": 1080, "contribution_share": round(9/20*100, 1)},
-            {"name": "Ronaldinho", "goals": 3, "assists": 4, "minutes": 1100, "contribution_share": round(7/20*100, 1)},
-            {"name": "Deco", "goals": 2, "assists": 2, "minutes": 990, "contribution_share": round(4/20*100, 1)},
-            {"name": "Giovanni van Bronckhorst", "goals": 2, "assists": 1, "minutes": 900, "contribution_share": round(3/20*100, 1)},
-            {"name": "Ludovic Giuly", "goals": 1, "assists": 3, "minutes": 810, "contribution_share": round(4/20*100, 1)}
-        ]
-    }
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "public", "data")
+CACHE_PATH = os.path.join(ROOT_DIR, ".cache", "generate_data", "build-cache.json")
+STATS_PATH = os.path.join(ROOT_DIR, ".cache", "generate_data", "build-stats.json")
+SEASONS_DIR = os.path.join(ROOT_DIR, "data", "seasons")
 
-def create_2009_season() -> dict:
-    """2008-09 Champions League — Pep Guardiola's treble season"""
-    return {
-        "id": "2008-09",
-        "display_name": "2008–09",
-        "competition": "UEFA Champions League",
-        "manager": "Pep Guardiola",
-        "squad_core": [
-            "Víctor Valdés", "Dani Alves", "Carles Puyol",
-            "Gerard Piqué", "Éric Abidal", "Sergio Busquets",
-            "Xavi", "Andrés Iniesta", "Lionel Messi",
-            "Samuel Eto'o", "Thierry Henry", "Yaya Touré"
-        ],
-        "formation": "4-3-3",
-        "matches_played": 13,
-        "wins": 10,
-        "draws": 2,
-        "losses": 1,
-        "goals_scored": 30,
-        "goals_conceded": 10,
-        "goal_difference": 20,
-        "clean_sheets": 6,
-        "goals_per_match": round(30 / 13, 2),
-        "goals_conceded_per_match": round(10 / 13, 2),
-        "win_percentage": round(10 / 13 * 100, 1),
-        "avg_possession": 63,
-        "knockout_path": [
-            {
-                "round": "Round of 16",
-                "opponent": "Lyon",
-                "leg1": {"score": "1-1", "venue": "A"},
-                "leg2": {"score": "5-2", "venue": "H"},
-                "aggregate": "6-3",
-                "key_contributors": ["Messi", "Henry", "Eto'o"]
-            },
-            {
-                "round": "Quarter-final",
-                "opponent": "Bayern Munich",
-                "leg1": {"score": "4-0", "venue": "H"},
-                "leg2": {"score": "1-1", "venue": "A"},
-                "aggregate": "5-1",
-                "key_contributors": ["Messi", "Eto'o", "Henry"]
-            },
-            {
-                "round": "Semi-final",
-                "opponent": "Chelsea",
-                "leg1": {"score": "0-0", "venue": "H"},
-                "leg2": {"score": "1-1", "venue": "A"},
-                "aggregate": "1-1 (away goals)",
-                "key_contributors": ["Iniesta"],
-                "detail": "Iniesta's 93rd minute equaliser at Stamford Bridge"
-            },
-            {
-                "round": "Final",
-                "opponent": "Manchester United",
-                "venue": "Stadio Olimpico, Rome",
-                "score": "2-0",
-                "aggregate": "2-0",
-                "key_contributors": ["Eto'o", "Messi"],
-                "detail": "Complete dominance — Messi header sealed treble"
-            }
-        ],
-        "final": {
-            "opponent": "Manchester United",
-            "venue": "Stadio Olimpico, Rome",
-            "date": "2009-05-27",
-            "score": "2-0",
-            "extra_time": False,
-            "scorers": [
-                {"name": "Samuel Eto'o", "minute": 10},
-                {"name": "Lionel Messi", "minute": 70}
-            ],
-            "attendance": 62467
-        },
-        "matches": [
-            {"date": "2008-09-16", "opponent": "Sporting CP", "home_away": "A", "score": "2-1", "goals_scored": 2, "goals_conceded": 1, "stage": "Group C", "scorers": ["Eto'o", "Messi"], "possession": 60, "shots": 15, "shots_on_target": 7},
-            {"date": "2008-10-01", "opponent": "Shakhtar Donetsk", "home_away": "H", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Group C", "scorers": ["Eto'o", "Messi", "Bojan"], "possession": 62, "shots": 18, "shots_on_target": 10},
-            {"date": "2008-10-22", "opponent": "Basel", "home_away": "A", "score": "0-1", "goals_scored": 0, "goals_conceded": 1, "stage": "Group C", "scorers": [], "possession": 58, "shots": 12, "shots_on_target": 4},
-            {"date": "2008-11-04", "opponent": "Basel", "home_away": "H", "score": "1-1", "goals_scored": 1, "goals_conceded": 1, "stage": "Group C", "scorers": ["Eto'o"], "possession": 65, "shots": 20, "shots_on_target": 8},
-            {"date": "2008-11-26", "opponent": "Sporting CP", "home_away": "H", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "Group C", "scorers": ["Henry", "Eto'o"], "possession": 64, "shots": 17, "shots_on_target": 9},
-            {"date": "2008-12-09", "opponent": "Shakhtar Donetsk", "home_away": "A", "score": "2-1", "goals_scored": 2, "goals_conceded": 1, "stage": "Group C", "scorers": ["Messi", "Iniesta"], "possession": 55, "shots": 14, "shots_on_target": 6},
-            {"date": "2009-02-24", "opponent": "Lyon", "home_away": "A", "score": "1-1", "goals_scored": 1, "goals_conceded": 1, "stage": "Round of 16", "scorers": ["Henry"], "possession": 56, "shots": 13, "shots_on_target": 5},
-            {"date": "2009-03-11", "opponent": "Lyon", "home_away": "H", "score": "5-2", "goals_scored": 5, "goals_conceded": 2, "stage": "Round of 16", "scorers": ["Henry", "Messi", "Messi", "Henry", "Keita"], "possession": 67, "shots": 22, "shots_on_target": 13},
-            {"date": "2009-04-08", "opponent": "Bayern Munich", "home_away": "H", "score": "4-0", "goals_scored": 4, "goals_conceded": 0, "stage": "Quarter-final", "scorers": ["Messi", "Messi", "Henry", "Messi"], "possession": 68, "shots": 19, "shots_on_target": 11},
-            {"date": "2009-04-14", "opponent": "Bayern Munich", "home_away": "A", "score": "1-1", "goals_scored": 1, "goals_conceded": 1, "stage": "Quarter-final", "scorers": ["Keita"], "possession": 59, "shots": 11, "shots_on_target": 5},
-            {"date": "2009-04-28", "opponent": "Chelsea", "home_away": "H", "score": "0-0", "goals_scored": 0, "goals_conceded": 0, "stage": "Semi-final", "scorers": [], "possession": 62, "shots": 16, "shots_on_target": 6},
-            {"date": "2009-05-06", "opponent": "Chelsea", "home_away": "A", "score": "1-1", "goals_scored": 1, "goals_conceded": 1, "stage": "Semi-final", "scorers": ["Iniesta"], "possession": 52, "shots": 10, "shots_on_target": 4},
-            {"date": "2009-05-27", "opponent": "Manchester United", "home_away": "N", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "Final", "scorers": ["Eto'o", "Messi"], "possession": 66, "shots": 12, "shots_on_target": 6}
-        ],
-        "top_scorers": [
-            {"name": "Lionel Messi", "goals": 9, "assists": 1, "minutes": 1080, "contribution_share": round(10/30*100, 1)},
-            {"name": "Samuel Eto'o", "goals": 6, "assists": 2, "minutes": 1020, "contribution_share": round(8/30*100, 1)},
-            {"name": "Thierry Henry", "goals": 4, "assists": 3, "minutes": 960, "contribution_share": round(7/30*100, 1)},
-            {"name": "Andrés Iniesta", "goals": 2, "assists": 4, "minutes": 990, "contribution_share": round(6/30*100, 1)},
-            {"name": "Seydou Keita", "goals": 2, "assists": 1, "minutes": 720, "contribution_share": round(3/30*100, 1)}
-        ]
+# Published files, relative to the output directory
+OUTPUT_NAME = "barca_ucl_data.json"
+INDEX_NAME = "index.json"
+ETAGS_NAME = "etags.json"
+MATCH_INDEXES_NAME = "indexes.json"
+PLAYERS_NAME = "players.json"
+SHARD_DIR_NAME = "seasons"
+COLUMNAR_DIR_NAME = "columnar"
+COLUMNAR_SCHEMA_NAME = "schema.json"
+SQLITE_NAME = "barca_ucl.sqlite"
+PATCH_DIR_NAME = "patches"
+HEAD_TO_HEAD_NAME = "head_to_head.json"
+FORM_NAME = "form.json"
+SIMILARITY_NAME = "similarity.json"
+
+PATCH_HISTORY = 50  # versions of barca_ucl_data.json that can still be patched forward
+
+MISSING = float("nan")
+
+
+class SeasonSource:
+    """
+    One season definition file. The raw bytes are read (and hashed) on first
+    use; the JSON is only parsed when the season actually has to be built.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.id = os.path.splitext(os.path.basename(path))[0]
+        self._raw = None
+        self._data = None
+
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            with open(self.path, "rb") as f:
+                self._raw = f.read()
+        return self._raw
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.raw).hexdigest()
+
+    def load(self) -> "Season":
+        if self._data is None:
+            try:
+                data = json.loads(self.raw)
+            except ValueError as e:
+                raise ValueError(f"{self.path}: {e}") from None
+            if data.get("id") != self.id:
+                raise ValueError(f"{self.path}: id {data.get('id')!r} does not match file name")
+            self._data = Season.from_dict(data)
+        return self._data
+
+
+class SeasonRegistry:
+    """Discovers season definition files; seasons are ordered by id"""
+
+    def __init__(self, directory: str = SEASONS_DIR):
+        self.directory = directory
+        self._sources = {
+            source.id: source
+            for source in sorted(
+                (SeasonSource(os.path.join(directory, name)) for name in os.listdir(directory) if name.endswith(".json")),
+                key=lambda source: source.id,
+            )
+        }
+
+    def __iter__(self) -> Iterator[SeasonSource]:
+        return iter(self._sources.values())
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def ids(self) -> list:
+        return list(self._sources)
+
+    def get(self, season_id: str) -> SeasonSource:
+        try:
+            return self._sources[season_id]
+        except KeyError:
+            raise KeyError(f"no season definition for {season_id!r} in {self.directory}") from None
+
+
+HOME_AWAY_CODES = {"H": 0, "A": 1, "N": 2}
+
+# array typecode -> column type in the columnar export's schema.json
+COLUMN_TYPES = {"b": "int8", "i": "int32", "d": "float64"}
+
+SEASON_HEADER_FIELDS = ("id", "display_name", "competition", "manager", "squad_core", "formation")
+
+INDEX_SUMMARY_FIELDS = (
+    "id", "display_name", "manager", "matches_played",
+    "goals_scored", "goals_conceded", "goal_difference", "win_percentage",
+)
+
+SEASON_TOTAL_FIELDS = (
+    "matches_played", "wins", "draws", "losses",
+    "goals_scored", "goals_conceded", "goal_difference", "clean_sheets",
+    "goals_per_match", "goals_conceded_per_match", "win_percentage", "avg_possession",
+)
+
+
+class Record:
+    """
+    Base for the compact __slots__ record types below. Fields serialize in
+    slot order; OPTIONAL fields are left out while None. NESTED and
+    NESTED_LISTS name the record type of a field holding one record or a
+    list of them. to_dict()/to_json() are the only way records become JSON.
+    """
+
+    __slots__ = ()
+    OPTIONAL = ()
+    NESTED = {}
+    NESTED_LISTS = {}
+    _types = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Record._types[cls.__name__] = cls
+
+    def __init__(self, **fields):
+        unknown = fields.keys() - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} has no field(s) {', '.join(sorted(unknown))}")
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Record":
+        fields = dict(data)
+        for name, type_name in cls.NESTED.items():
+            if fields.get(name) is not None:
+                fields[name] = Record._types[type_name].from_dict(fields[name])
+        for name, type_name in cls.NESTED_LISTS.items():
+            if fields.get(name) is not None:
+                fields[name] = [Record._types[type_name].from_dict(item) for item in fields[name]]
+        return cls(**fields)
+
+    def to_dict(self) -> dict:
+        """Fields in schema order; nested records are left for to_json"""
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None or name not in self.OPTIONAL:
+                data[name] = value
+        return data
+
+    def replace(self, **changes) -> "Record":
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return type(self)(**fields)
+
+
+def to_json(value: Any) -> dict:
+    """json.dumps default= hook that serializes records"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Match(Record):
+    __slots__ = (
+        "date", "opponent", "home_away", "score", "goals_scored", "goals_conceded",
+        "stage", "scorers", "possession", "shots", "shots_on_target", "extra_time",
+    )
+    OPTIONAL = ("extra_time",)
+
+
+class KnockoutTie(Record):
+    """One knockout_path entry: a two-legged tie, a one-off final or a group stage summary"""
+
+    __slots__ = (
+        "round", "opponent", "note", "leg1", "leg2", "venue", "score",
+        "aggregate", "key_contributors", "detail",
+    )
+    OPTIONAL = ("note", "leg1", "leg2", "venue", "score", "detail")
+
+
+class Scorer(Record):
+    """A goal in the final, with its minute"""
+
+    __slots__ = ("name", "minute")
+
+
+class Final(Record):
+    __slots__ = ("opponent", "venue", "date", "score", "extra_time", "scorers", "attendance")
+    NESTED_LISTS = {"scorers": "Scorer"}
+
+
+class PlayerStat(Record):
+    """A top_scorers entry; goals and contribution_share are None until derived"""
+
+    __slots__ = ("name", "goals", "assists", "minutes", "contribution_share")
+
+
+class Season(Record):
+    """A season; the SEASON_TOTAL_FIELDS are None in a source until build_season() derives them"""
+
+    __slots__ = SEASON_HEADER_FIELDS + SEASON_TOTAL_FIELDS + ("knockout_path", "final", "matches", "top_scorers")
+    NESTED = {"final": "Final"}
+    NESTED_LISTS = {"knockout_path": "KnockoutTie", "matches": "Match", "top_scorers": "PlayerStat"}
+
+
+class MatchTable:
+    """
+    Columnar store of every match across all seasons.
+
+    Each match field lives in its own typed array and season i owns rows
+    season_offsets[i]:season_offsets[i + 1]. Stats that were not tracked
+    (e.g. possession in 1992) are stored as NaN.
+    """
+
+    def __init__(self):
+        self.season_ids = []
+        self.season_offsets = array("i", [0])
+        self.goals_scored = array("i")
+        self.goals_conceded = array("i")
+        self.possession = array("d")
+        self.shots = array("d")
+        self.shots_on_target = array("d")
+        self.home_away = array("b")
+        self.stage = array("i")
+        self.stages = []
+        self._stage_codes = {}
+
+    def __len__(self) -> int:
+        return len(self.goals_scored)
+
+    @classmethod
+    def from_seasons(cls, seasons: list) -> "MatchTable":
+        table = cls()
+        for season in seasons:
+            table.append_season(season.id, season.matches)
+        return table
+
+    def append_season(self, season_id: str, matches: list) -> None:
+        """Append one season's Match records as a contiguous block of rows"""
+        for m in matches:
+            self.goals_scored.append(m.goals_scored)
+            self.goals_conceded.append(m.goals_conceded)
+            self.possession.append(_stat_or_nan(m.possession))
+            self.shots.append(_stat_or_nan(m.shots))
+            self.shots_on_target.append(_stat_or_nan(m.shots_on_target))
+            self.home_away.append(HOME_AWAY_CODES[m.home_away])
+            self.stage.append(self._intern_stage(m.stage))
+        self.season_ids.append(season_id)
+        self.season_offsets.append(len(self))
+
+    def _intern_stage(self, stage: str) -> int:
+        code = self._stage_codes.get(stage)
+        if code is None:
+            code = self._stage_codes[stage] = len(self.stages)
+            self.stages.append(stage)
+        return code
+
+
+def _stat_or_nan(value: Any) -> float:
+    return MISSING if value is None else float(value)
+
+
+def compute_season_totals(table: MatchTable) -> dict:
+    """
+    Derive every per-season total and ratio in a single pass over the table.
+    Returns one column per SEASON_TOTAL_FIELDS entry, indexed by season.
+    """
+    totals = {field: [] for field in SEASON_TOTAL_FIELDS}
+    offsets = table.season_offsets
+    for i in range(len(table.season_ids)):
+        lo, hi = offsets[i], offsets[i + 1]
+        scored = table.goals_scored[lo:hi]
+        conceded = table.goals_conceded[lo:hi]
+        possession = [p for p in table.possession[lo:hi] if p == p]
+
+        played = hi - lo
+        wins = sum(map(operator.gt, scored, conceded))
+        draws = sum(map(operator.eq, scored, conceded))
+        goals_scored = sum(scored)
+        goals_conceded = sum(conceded)
+
+        totals["matches_played"].append(played)
+        totals["wins"].append(wins)
+        totals["draws"].append(draws)
+        totals["losses"].append(played - wins - draws)
+        totals["goals_scored"].append(goals_scored)
+        totals["goals_conceded"].append(goals_conceded)
+        totals["goal_difference"].append(goals_scored - goals_conceded)
+        totals["clean_sheets"].append(conceded.count(0))
+        # a season with no match records yet (e.g. a new file) has no per-match ratios: 0
+        totals["goals_per_match"].append(round(goals_scored / played, 2) if played else 0)
+        totals["goals_conceded_per_match"].append(round(goals_conceded / played, 2) if played else 0)
+        totals["win_percentage"].append(round(wins / played * 100, 1) if played else 0)
+        totals["avg_possession"].append(round(sum(possession) / len(possession)) if possession else None)
+    return totals
+
+
+def build_season(source: Season, totals: dict, index: int) -> Season:
+    """Copy of a season's source definition with its derived totals filled in"""
+    return source.replace(
+        top_scorers=derive_top_scorers(source, totals["goals_scored"][index]),
+        **{field: totals[field][index] for field in SEASON_TOTAL_FIELDS}
+    )
+
+
+def build_seasons(sources: list) -> tuple:
+    """Build every Season from its source record; returns (seasons, totals)"""
+    totals = compute_season_totals(MatchTable.from_seasons(sources))
+    seasons = [build_season(source, totals, i) for i, source in enumerate(sources)]
+    return seasons, totals
+
+
+def parse_score(score: Any) -> Optional[tuple]:
+    """Leading "for-against" of a score string: "1-0 (a.e.t.)" -> (1, 0); None if there is none"""
+    if not isinstance(score, str):
+        return None
+    left, dash, right = score.strip().partition("-")
+    right = right.split(" ", 1)[0]
+    if not dash or not left.isdigit() or not right.isdigit():
+        return None
+    return int(left), int(right)
+
+
+def _leg_totals(legs: list) -> list:
+    """
+    Aggregate (for, against) of knockout legs under each way the season files
+    write leg scores: Barça first, or home team first. None if a leg has no score.
+    """
+    scores = [parse_score(leg.get("score")) for leg in legs]
+    if None in scores:
+        return []
+    barca_first = tuple(map(sum, zip(*scores)))
+    home_first = tuple(map(sum, zip(*(s[::-1] if leg.get("venue") == "A" else s for s, leg in zip(scores, legs)))))
+    return [barca_first, home_first]
+
+
+# seasons whose match scorer lists are known to be incomplete in the sources; not checked against goals
+INCOMPLETE_SCORERS = frozenset()
+
+
+def validate_season(source: Season) -> Iterator[str]:
+    """
+    Check a season's internal consistency in one pass over its matches:
+    each score string against its goals, each scorer list against the goals
+    scored, any hand-typed totals against the match records, knockout
+    aggregates against their legs and the matches played, and the final's
+    scorers (if it reached one) against its score. Every scorer name must
+    resolve to a single player, or its goals cannot be credited. Scorer
+    lists of INCOMPLETE_SCORERS seasons are not checked against goals.
+    Yields one "<season id> <location>: <problem>" message per violation;
+    memory is bounded by the number of ties.
+    """
+    check_scorers = source.id not in INCOMPLETE_SCORERS
+    registry = PlayerRegistry.from_sources([source])
+    for i, player in enumerate(source.top_scorers):
+        if registry.resolve(player.name) is None:
+            yield f"{source.id} top_scorers[{i}]: {player.name!r} is shared by several players"
+    played = wins = draws = scored = conceded = 0
+    ties = {}
+    for i, match in enumerate(source.matches):
+        where = f"{source.id} matches[{i}] ({match.date} {match.opponent})"
+        goals = (match.goals_scored, match.goals_conceded)
+        if parse_score(match.score) != goals:
+            yield f"{where}: score {match.score!r} does not match goals {goals[0]}-{goals[1]}"
+        if check_scorers and match.goals_scored and not match.scorers:
+            yield f"{where}: {match.goals_scored} goals but no scorers listed"
+        elif check_scorers and len(match.scorers) != match.goals_scored:
+            yield f"{where}: {len(match.scorers)} scorers listed for {match.goals_scored} goals"
+        for entry in match.scorers:
+            name, own_goal = parse_scorer(entry)
+            if not own_goal and registry.ambiguous(name):
+                yield f"{where}: scorer {name!r} is shared by several players"
+        played += 1
+        wins += match.goals_scored > match.goals_conceded
+        draws += match.goals_scored == match.goals_conceded
+        scored += match.goals_scored
+        conceded += match.goals_conceded
+        tie = ties.setdefault((match.opponent, match.stage), [0, 0])
+        tie[0] += match.goals_scored
+        tie[1] += match.goals_conceded
+
+    derived = {
+        "matches_played": played, "wins": wins, "draws": draws, "losses": played - wins - draws,
+        "goals_scored": scored, "goals_conceded": conceded,
     }
+    declared = {field: getattr(source, field) for field in derived if getattr(source, field) is not None}
+    if {"wins", "draws", "losses", "matches_played"} <= declared.keys():
+        if declared["wins"] + declared["draws"] + declared["losses"] != declared["matches_played"]:
+            yield (f"{source.id}: wins + draws + losses = "
+                   f"{declared['wins'] + declared['draws'] + declared['losses']}, matches_played = {declared['matches_played']}")
+    for field, value in declared.items():
+        if value != derived[field]:
+            yield f"{source.id}: {field} is {value}, match records give {derived[field]}"
+
+    for i, tie in enumerate(source.knockout_path):
+        where = f"{source.id} knockout_path[{i}] ({tie.round} {tie.opponent})"
+        aggregate = parse_score(tie.aggregate)
+        if aggregate is None:
+            continue
+        legs = [leg for leg in (tie.leg1, tie.leg2) if leg] or [{"score": tie.score}]
+        totals = _leg_totals(legs)
+        if totals and aggregate not in totals:
+            yield f"{where}: aggregate {tie.aggregate!r} does not match legs {' + '.join(leg['score'] for leg in legs)}"
+        matches = ties.get((tie.opponent, tie.round))
+        if matches is not None and tuple(matches) != aggregate:
+            yield f"{where}: aggregate {tie.aggregate!r} does not match match records {matches[0]}-{matches[1]}"
 
-def create_2011_season() -> dict:
-    """2010-11 Champions League — Peak tiki-taka under Guardiola"""
+    if source.final is None:
+        return
+    final = parse_score(source.final.score)
+    if final is not None and len(source.final.scorers) != final[0]:
+        yield f"{source.id} final: {len(source.final.scorers)} scorers listed for score {source.final.score!r}"
+
+
+def compute_cross_season_data(seasons: list, totals: dict = None) -> dict:
+    """Compute cross-season comparison metrics"""
+    if totals is None:
+        totals = compute_season_totals(MatchTable.from_seasons(seasons))
     return {
-        "id": "2010-11",
-        "display_name": "2010–11",
-        "competition": "UEFA Champions League",
-        "manager": "Pep Guardiola",
-        "squad_core": [
-            "Víctor Valdés", "Dani Alves", "Gerard Piqué",
-            "Carles Puyol", "Éric Abidal", "Sergio Busquets",
-            "Xavi", "Andrés Iniesta", "Lionel Messi",
-            "David Villa", "Pedro"
-        ],
-        "formation": "4-3-3",
-        "matches_played": 13,
-        "wins": 9,
-        "draws": 3,
-        "losses": 1,
-        "goals_scored": 30,
-        "goals_conceded": 8,
-        "goal_difference": 22,
-        "clean_sheets": 6,
-        "goals_per_match": round(30 / 13, 2),
-        "goals_conceded_per_match": round(8 / 13, 2),
-        "win_percentage": round(9 / 13 * 100, 1),
-        "avg_possession": 67,
-        "knockout_path": [
-            {
-                "round": "Round of 16",
-                "opponent": "Arsenal",
-                "leg1": {"score": "1-2", "venue": "A"},
-                "leg2": {"score": "3-1", "venue": "H"},
-                "aggregate": "4-3",
-                "key_contributors": ["Messi", "Xavi", "Busquets"]
-            },
-            {
-                "round": "Quarter-final",
-                "opponent": "Shakhtar Donetsk",
-                "leg1": {"score": "5-1", "venue": "H"},
-                "leg2": {"score": "0-1", "venue": "A"},
-                "aggregate": "5-2",
-                "key_contributors": ["Messi", "Piqué", "Alves"]
-            },
-            {
-                "round": "Semi-final",
-                "opponent": "Real Madrid",
-                "leg1": {"score": "2-0", "venue": "H"},
-                "leg2": {"score": "1-1", "venue": "A"},
-                "aggregate": "3-1",
-                "key_contributors": ["Messi", "Pedro", "Abidal"]
-            },
-            {
-                "round": "Final",
-                "opponent": "Manchester United",
-                "venue": "Wembley Stadium, London",
-                "score": "3-1",
-                "aggregate": "3-1",
-                "key_contributors": ["Pedro", "Messi", "Villa"],
-                "detail": "One of the greatest CL final performances in history"
-            }
-        ],
-        "final": {
-            "opponent": "Manchester United",
-            "venue": "Wembley Stadium, London",
-            "date": "2011-05-28",
-            "score": "3-1",
-            "extra_time": False,
-            "scorers": [
-                {"name": "Pedro", "minute": 27},
-                {"name": "Lionel Messi", "minute": 54},
-                {"name": "David Villa", "minute": 69}
-            ],
-            "attendance": 87695
-        },
-        "matches": [
-            {"date": "2010-09-14", "opponent": "Panathinaikos", "home_away": "H", "score": "5-1", "goals_scored": 5, "goals_conceded": 1, "stage": "Group D", "scorers": ["Messi", "Messi", "Pedro", "Villa", "Iniesta"], "possession": 70, "shots": 21, "shots_on_target": 12},
-            {"date": "2010-09-29", "opponent": "Spartak Moscow", "home_away": "A", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Group D", "scorers": ["Iniesta"], "possession": 62, "shots": 14, "shots_on_target": 5},
-            {"date": "2010-10-20", "opponent": "Copenhagen", "home_away": "H", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "Group D", "scorers": ["Messi", "Villa"], "possession": 69, "shots": 19, "shots_on_target": 9},
-            {"date": "2010-11-02", "opponent": "Copenhagen", "home_away": "A", "score": "1-1", "goals_scored": 1, "goals_conceded": 1, "stage": "Group D", "scorers": ["Messi"], "possession": 61, "shots": 15, "shots_on_target": 6},
-            {"date": "2010-11-24", "opponent": "Panathinaikos", "home_away": "A", "score": "0-3", "goals_scored": 0, "goals_conceded": 3, "stage": "Group D", "scorers": [], "possession": 55, "shots": 10, "shots_on_target": 3},
-            {"date": "2010-12-07", "opponent": "Spartak Moscow", "home_away": "H", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Group D", "scorers": ["Bojan"], "possession": 72, "shots": 22, "shots_on_target": 8},
-            {"date": "2011-02-16", "opponent": "Arsenal", "home_away": "A", "score": "2-1", "goals_scored": 2, "goals_conceded": 1, "stage": "Round of 16", "scorers": ["Villa", "Messi"], "possession": 59, "shots": 16, "shots_on_target": 7},
-            {"date": "2011-03-08", "opponent": "Arsenal", "home_away": "H", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Round of 16", "scorers": ["Messi", "Messi", "Xavi"], "possession": 65, "shots": 18, "shots_on_target": 10},
-            {"date": "2011-04-06", "opponent": "Shakhtar Donetsk", "home_away": "H", "score": "5-1", "goals_scored": 5, "goals_conceded": 1, "stage": "Quarter-final", "scorers": ["Messi", "Messi", "Iniesta", "Piqué", "Alves"], "possession": 71, "shots": 20, "shots_on_target": 13},
-            {"date": "2011-04-12", "opponent": "Shakhtar Donetsk", "home_away": "A", "score": "0-1", "goals_scored": 0, "goals_conceded": 1, "stage": "Quarter-final", "scorers": [], "possession": 58, "shots": 9, "shots_on_target": 3},
-            {"date": "2011-04-27", "opponent": "Real Madrid", "home_away": "H", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "Semi-final", "scorers": ["Messi", "Messi"], "possession": 66, "shots": 12, "shots_on_target": 7},
-            {"date": "2011-05-03", "opponent": "Real Madrid", "home_away": "A", "score": "1-1", "goals_scored": 1, "goals_conceded": 1, "stage": "Semi-final", "scorers": ["Pedro"], "possession": 63, "shots": 11, "shots_on_target": 5},
-            {"date": "2011-05-28", "opponent": "Manchester United", "home_away": "N", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Final", "scorers": ["Pedro", "Messi", "Villa"], "possession": 68, "shots": 16, "shots_on_target": 8}
-        ],
-        "top_scorers": [
-            {"name": "Lionel Messi", "goals": 12, "assists": 3, "minutes": 1140, "contribution_share": round(15/30*100, 1)},
-            {"name": "Pedro", "goals": 3, "assists": 2, "minutes": 810, "contribution_share": round(5/30*100, 1)},
-            {"name": "David Villa", "goals": 4, "assists": 1, "minutes": 900, "contribution_share": round(5/30*100, 1)},
-            {"name": "Andrés Iniesta", "goals": 3, "assists": 4, "minutes": 1050, "contribution_share": round(7/30*100, 1)},
-            {"name": "Xavi", "goals": 1, "assists": 5, "minutes": 1110, "contribution_share": round(6/30*100, 1)}
-        ]
+        "comparison": [compute_comparison_row(s, totals, i) for i, s in enumerate(seasons)],
+        "common_traits": compute_common_traits(totals)
     }
 
-def create_2015_season() -> dict:
-    """2014-15 Champions League — MSN era under Luis Enrique"""
+
+def compute_comparison_row(season: Season, totals: dict, index: int) -> dict:
+    """Comparison entry for one season; depends on that season alone"""
+    top_scorer = season.top_scorers[0]
     return {
-        "id": "2014-15",
-        "display_name": "2014–15",
-        "competition": "UEFA Champions League",
-        "manager": "Luis Enrique",
-        "squad_core": [
-            "Marc-André ter Stegen", "Dani Alves", "Gerard Piqué",
-            "Javier Mascherano", "Jordi Alba", "Sergio Busquets",
-            "Ivan Rakitić", "Andrés Iniesta", "Lionel Messi",
-            "Neymar", "Luis Suárez", "Xavi"
-        ],
-        "formation": "4-3-3",
-        "matches_played": 13,
-        "wins": 10,
-        "draws": 2,
-        "losses": 1,
-        "goals_scored": 32,
-        "goals_conceded": 10,
-        "goal_difference": 22,
-        "clean_sheets": 5,
-        "goals_per_match": round(32 / 13, 2),
-        "goals_conceded_per_match": round(10 / 13, 2),
-        "win_percentage": round(10 / 13 * 100, 1),
-        "avg_possession": 61,
-        "knockout_path": [
-            {
-                "round": "Round of 16",
-                "opponent": "Manchester City",
-                "leg1": {"score": "1-2", "venue": "A"},
-                "leg2": {"score": "1-0", "venue": "H"},
-                "aggregate": "3-1",
-                "key_contributors": ["Suárez", "Rakitić", "Messi"]
-            },
-            {
-                "round": "Quarter-final",
-                "opponent": "Paris Saint-Germain",
-                "leg1": {"score": "3-1", "venue": "H"},
-                "leg2": {"score": "0-2", "venue": "A"},
-                "aggregate": "5-1",
-                "key_contributors": ["Neymar", "Suárez", "Messi"]
-            },
-            {
-                "round": "Semi-final",
-                "opponent": "Bayern Munich",
-                "leg1": {"score": "3-0", "venue": "H"},
-                "leg2": {"score": "2-3", "venue": "A"},
-                "aggregate": "5-3",
-                "key_contributors": ["Messi", "Neymar"],
-                "detail": "Messi's iconic dribbling goals in both legs"
-            },
-            {
-                "round": "Final",
-                "opponent": "Juventus",
-                "venue": "Olympiastadion, Berlin",
-                "score": "3-1",
-                "aggregate": "3-1",
-                "key_contributors": ["Rakitić", "Suárez", "Neymar"],
-                "detail": "MSN all on the scoresheet in the second half via Suárez and Neymar"
-            }
-        ],
-        "final": {
-            "opponent": "Juventus",
-            "venue": "Olympiastadion, Berlin",
-            "date": "2015-06-06",
-            "score": "3-1",
-            "extra_time": False,
-            "scorers": [
-                {"name": "Ivan Rakitić", "minute": 4},
-                {"name": "Luis Suárez", "minute": 68},
-                {"name": "Neymar", "minute": 97}
-            ],
-            "attendance": 70442
-        },
-        "matches": [
-            {"date": "2014-09-17", "opponent": "APOEL", "home_away": "H", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Group F", "scorers": ["Piqué"], "possession": 72, "shots": 24, "shots_on_target": 8},
-            {"date": "2014-09-30", "opponent": "Paris Saint-Germain", "home_away": "A", "score": "3-2", "goals_scored": 3, "goals_conceded": 2, "stage": "Group F", "scorers": ["Messi", "Neymar", "Messi"], "possession": 49, "shots": 12, "shots_on_target": 7},
-            {"date": "2014-10-21", "opponent": "Ajax", "home_away": "H", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Group F", "scorers": ["Neymar", "Messi", "Sandro"], "possession": 58, "shots": 16, "shots_on_target": 9},
-            {"date": "2014-11-05", "opponent": "Ajax", "home_away": "A", "score": "0-2", "goals_scored": 0, "goals_conceded": 2, "stage": "Group F", "scorers": [], "possession": 53, "shots": 10, "shots_on_target": 3},
-            {"date": "2014-11-25", "opponent": "APOEL", "home_away": "A", "score": "4-0", "goals_scored": 4, "goals_conceded": 0, "stage": "Group F", "scorers": ["Messi", "Messi", "Messi", "Suárez"], "possession": 66, "shots": 18, "shots_on_target": 10},
-            {"date": "2014-12-10", "opponent": "Paris Saint-Germain", "home_away": "H", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Group F", "scorers": ["Messi", "Neymar", "Messi"], "possession": 56, "shots": 15, "shots_on_target": 8},
-            {"date": "2015-02-24", "opponent": "Manchester City", "home_away": "A", "score": "2-1", "goals_scored": 2, "goals_conceded": 1, "stage": "Round of 16", "scorers": ["Suárez", "Suárez"], "possession": 52, "shots": 11, "shots_on_target": 6},
-            {"date": "2015-03-18", "opponent": "Manchester City", "home_away": "H", "score": "1-0", "goals_scored": 1, "goals_conceded": 0, "stage": "Round of 16", "scorers": ["Rakitić"], "possession": 68, "shots": 17, "shots_on_target": 7},
-            {"date": "2015-04-21", "opponent": "Paris Saint-Germain", "home_away": "H", "score": "2-0", "goals_scored": 2, "goals_conceded": 0, "stage": "Quarter-final", "scorers": ["Neymar", "Neymar"], "possession": 60, "shots": 14, "shots_on_target": 8},
-            {"date": "2015-04-15", "opponent": "Paris Saint-Germain", "home_away": "A", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Quarter-final", "scorers": ["Suárez", "Mathieu (og)", "Neymar"], "possession": 48, "shots": 13, "shots_on_target": 6},
-            {"date": "2015-05-06", "opponent": "Bayern Munich", "home_away": "H", "score": "3-0", "goals_scored": 3, "goals_conceded": 0, "stage": "Semi-final", "scorers": ["Messi", "Messi", "Neymar"], "possession": 53, "shots": 11, "shots_on_target": 6},
-            {"date": "2015-05-12", "opponent": "Bayern Munich", "home_away": "A", "score": "3-2", "goals_scored": 3, "goals_conceded": 2, "stage": "Semi-final", "scorers": ["Neymar", "Neymar", "Suárez (og credited to Mueller/Lewandowski late)"], "possession": 38, "shots": 9, "shots_on_target": 5},
-            {"date": "2015-06-06", "opponent": "Juventus", "home_away": "N", "score": "3-1", "goals_scored": 3, "goals_conceded": 1, "stage": "Final", "scorers": ["Rakitić", "Suárez", "Neymar"], "possession": 56, "shots": 15, "shots_on_target": 8}
-        ],
-        "top_scorers": [
-            {"name": "Lionel Messi", "goals": 10, "assists": 4, "minutes": 1110, "contribution_share": round(14/32*100, 1)},
-            {"name": "Neymar", "goals": 10, "assists": 3, "minutes": 1050, "contribution_share": round(13/32*100, 1)},
-            {"name": "Luis Suárez", "goals": 5, "assists": 2, "minutes": 1020, "contribution_share": round(7/32*100, 1)},
-            {"name": "Ivan Rakitić", "goals": 2, "assists": 3, "minutes": 960, "contribution_share": round(5/32*100, 1)},
-            {"name": "Gerard Piqué", "goals": 1, "assists": 1, "minutes": 1080, "contribution_share": round(2/32*100, 1)}
-        ]
+        "season": season.id,
+        "display_name": season.display_name,
+        "manager": season.manager,
+        "goals_per_match": totals["goals_per_match"][index],
+        "goals_conceded_per_match": totals["goals_conceded_per_match"][index],
+        "goal_difference": totals["goal_difference"][index],
+        "win_percentage": totals["win_percentage"][index],
+        "clean_sheets": totals["clean_sheets"][index],
+        "avg_possession": totals["avg_possession"][index],
+        "matches_played": totals["matches_played"][index],
+        "goals_scored": totals["goals_scored"][index],
+        "goals_conceded": totals["goals_conceded"][index],
+        "top_scorer": top_scorer.name,
+        "top_scorer_goals": top_scorer.goals,
+        "top_scorer_dependency": round(top_scorer.goals / totals["goals_scored"][index] * 100, 1) if totals["goals_scored"][index] else 0,
+        "dominance_index": compute_dominance_index(season)
     }
 
 
-def compute_cross_season_data(seasons: list) -> dict:
-    """Compute cross-season comparison metrics"""
+def compute_common_traits(totals: dict) -> dict:
+    """Traits averaged over every season's totals"""
+    n = len(totals["matches_played"])
+    clean_sheet_pcts = (cs / played if played else 0 for cs, played in zip(totals["clean_sheets"], totals["matches_played"]))
     return {
-        "comparison": [
-            {
-                "season": s["id"],
-                "display_name": s["display_name"],
-                "manager": s["manager"],
-                "goals_per_match": s["goals_per_match"],
-                "goals_conceded_per_match": s["goals_conceded_per_match"],
-                "goal_difference": s["goal_difference"],
-                "win_percentage": s["win_percentage"],
-                "clean_sheets": s["clean_sheets"],
-                "avg_possession": s["avg_possession"],
-                "matches_played": s["matches_played"],
-                "goals_scored": s["goals_scored"],
-                "goals_conceded": s["goals_conceded"],
-                "top_scorer": s["top_scorers"][0]["name"],
-                "top_scorer_goals": s["top_scorers"][0]["goals"],
-                "top_scorer_dependency": round(s["top_scorers"][0]["goals"] / s["goals_scored"] * 100, 1),
-                "dominance_index": compute_dominance_index(s)
-            }
-            for s in seasons
-        ],
-        "common_traits": {
-            "avg_goals_per_match": round(sum(s["goals_per_match"] for s in seasons) / len(seasons), 2),
-            "avg_goals_conceded_per_match": round(sum(s["goals_conceded_per_match"] for s in seasons) / len(seasons), 2),
-            "avg_win_percentage": round(sum(s["win_percentage"] for s in seasons) / len(seasons), 1),
-            "avg_clean_sheet_pct": round(sum(s["clean_sheets"] / s["matches_played"] * 100 for s in seasons) / len(seasons), 1),
-            "total_goals_scored": sum(s["goals_scored"] for s in seasons),
-            "total_matches": sum(s["matches_played"] for s in seasons),
-            "total_goals_conceded": sum(s["goals_conceded"] for s in seasons)
-        }
+        "avg_goals_per_match": round(sum(totals["goals_per_match"]) / n, 2),
+        "avg_goals_conceded_per_match": round(sum(totals["goals_conceded_per_match"]) / n, 2),
+        "avg_win_percentage": round(sum(totals["win_percentage"]) / n, 1),
+        "avg_clean_sheet_pct": round(sum(clean_sheet_pcts) * 100 / n, 1),
+        "total_goals_scored": sum(totals["goals_scored"]),
+        "total_matches": sum(totals["matches_played"]),
+        "total_goals_conceded": sum(totals["goals_conceded"])
     }
 
 
-def compute_dominance_index(season: dict) -> float:
+DOMINANCE_WEIGHTS = (40, 40, 20)  # goal difference, win %, clean sheet %
+DOMINANCE_GD_CAP = 2.5  # goal difference per match that earns the full GD weight
+
+
+def compute_dominance_index(season: Season) -> float:
     """
     Dominance Index: lightweight composite metric
     Components:
@@ -548,33 +532,1332 @@ def compute_dominance_index(season: dict) -> float:
     - Clean sheet percentage (normalized 0-20)
     Total: 0-100 scale
     """
-    gd_per_match = season["goal_difference"] / season["matches_played"]
-    gd_score = min(gd_per_match / 2.5 * 40, 40)
+    if not season.matches_played:
+        return 0.0
+    gd_weight, win_weight, cs_weight = DOMINANCE_WEIGHTS
+    gd_per_match = season.goal_difference / season.matches_played
+    gd_score = min(gd_per_match / DOMINANCE_GD_CAP * gd_weight, gd_weight)
 
-    win_score = season["win_percentage"] / 100 * 40
+    win_score = season.win_percentage / 100 * win_weight
 
-    cs_pct = season["clean_sheets"] / season["matches_played"]
-    cs_score = cs_pct * 20
+    cs_pct = season.clean_sheets / season.matches_played
+    cs_score = cs_pct * cs_weight
 
     return round(gd_score + win_score + cs_score, 1)
 
 
-def main():
-    seasons = [
-        create_1992_season(),
-        create_2006_season(),
-        create_2009_season(),
-        create_2011_season(),
-        create_2015_season(),
+def parse_scorer(entry: str) -> tuple:
+    """
+    Split a free-form scorer entry into (name, own_goal).
+    "Mathieu (og)" -> ("Mathieu", True); "Messi" -> ("Messi", False)
+    """
+    name, _, note = entry.partition("(")
+    own_goal = note.strip().lower().startswith("og")
+    return unicodedata.normalize("NFC", " ".join(name.split())), own_goal
+
+
+def _fold(name: str) -> str:
+    """Case- and accent-insensitive lookup key, e.g. "Piqué" -> "pique" """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def player_id(name: str) -> str:
+    """Stable slug for a player's full name, e.g. "Samuel Eto'o" -> "samuel-eto-o" """
+    return "-".join("".join(c if c.isalnum() else " " for c in _fold(name)).split())
+
+
+def name_aliases(full_name: str) -> list:
+    """Short forms a match record may use: surname, plus "van Bronckhorst"-style particles"""
+    tokens = full_name.split()
+    aliases = [full_name, tokens[-1]]
+    if len(tokens) >= 3 and tokens[-2][:1].islower():
+        aliases.append(" ".join(tokens[-2:]))
+    return aliases
+
+
+class PlayerRegistry:
+    """
+    Interns player names. Every known full name gets one player ID, and the
+    surnames used in match records resolve to it; a surname shared by two
+    players is ambiguous and left unresolved.
+    """
+
+    def __init__(self):
+        self.names = {}
+        self._aliases = {}
+
+    @classmethod
+    def from_sources(cls, sources: Iterable) -> "PlayerRegistry":
+        registry = cls()
+        for source in sources:
+            for name in known_player_names(source):
+                registry.register(name)
+        return registry
+
+    def register(self, full_name: str) -> str:
+        pid = sys.intern(player_id(full_name))
+        self.names.setdefault(pid, full_name)
+        for alias in name_aliases(full_name):
+            key = _fold(alias)
+            if self._aliases.setdefault(key, pid) != pid:
+                self._aliases[key] = None
+        return pid
+
+    def resolve(self, name: str) -> Optional[str]:
+        return self._aliases.get(_fold(name))
+
+    def resolve_or_register(self, name: str) -> str:
+        return self.resolve(name) or self.register(name)
+
+    def ambiguous(self, name: str) -> bool:
+        """True if name is a short form shared by several known players"""
+        key = _fold(name)
+        return key in self._aliases and self._aliases[key] is None
+
+
+def known_player_names(source: Season) -> list:
+    """Full names a season source spells out: squad, curated scorers and final scorers (if it reached one)"""
+    return (
+        list(source.squad_core)
+        + [player.name for player in source.top_scorers]
+        + ([scorer.name for scorer in source.final.scorers] if source.final else [])
+    )
+
+
+def tally_goals(matches: list, registry: PlayerRegistry, fallback: Optional[PlayerRegistry] = None) -> tuple:
+    """
+    Count goals per player ID in one pass over matches. Names are resolved
+    against registry, then fallback; unresolved names get their own ID.
+    Returns (Counter of player ID -> goals, own goal count).
+    """
+    goals = Counter()
+    own_goals = 0
+    for match in matches:
+        for entry in match.scorers:
+            name, own_goal = parse_scorer(entry)
+            if own_goal:
+                own_goals += 1
+                continue
+            pid = registry.resolve(name) or (fallback and fallback.resolve(name)) or registry.register(name)
+            goals[pid] += 1
+    return goals, own_goals
+
+
+def derive_top_scorers(source: Season, goals_scored: int) -> list:
+    """
+    Curated top_scorers (name, assists, minutes) with goals tallied from the
+    season's match records and contribution_share = (goals + assists) / team
+    goals. Ordered by goals, then assists.
+    """
+    registry = PlayerRegistry.from_sources([source])
+    goals, _ = tally_goals(source.matches, registry)
+    top_scorers = []
+    for player in source.top_scorers:
+        pid = registry.resolve(player.name)
+        if pid is None:
+            raise ValueError(f"{source.id} top_scorers: {player.name!r} is shared by several players, "
+                             f"so their goals cannot be tallied")
+        scored = goals[pid]
+        top_scorers.append(player.replace(
+            goals=scored,
+            contribution_share=round((scored + player.assists) / goals_scored * 100, 1) if goals_scored else 0,
+        ))
+    top_scorers.sort(key=lambda p: (p.goals, p.assists), reverse=True)
+    return top_scorers
+
+
+def compute_player_table(seasons: list) -> dict:
+    """
+    Cross-season player table: goals tallied from every match record, with
+    curated assists/minutes summed from each season's top_scorers. Surnames
+    resolve within their own season first, then across all seasons. Entries
+    are ordered by goals + assists, then goals.
+    """
+    everyone = PlayerRegistry.from_sources(seasons)
+    players, own_goals = {}, {}
+    for season in seasons:
+        local = PlayerRegistry.from_sources([season])
+        goals, own_goals[season.id] = tally_goals(season.matches, local, everyone)
+        curated = {local.resolve(p.name): p for p in season.top_scorers}
+        for pid in dict.fromkeys(list(goals) + list(curated)):
+            stats = curated.get(pid)
+            player = players.setdefault(pid, {
+                "id": pid,
+                "name": everyone.names.get(pid) or local.names[pid],
+                "goals": 0,
+                "assists": 0,
+                "minutes": 0,
+                "seasons": [],
+                "goals_by_season": {},
+            })
+            player["goals"] += goals[pid]
+            player["assists"] += stats.assists if stats else 0
+            player["minutes"] += stats.minutes if stats else 0
+            player["seasons"].append(season.id)
+            player["goals_by_season"][season.id] = goals[pid]
+    ranked = sorted(players.values(), key=lambda p: (p["goals"] + p["assists"], p["goals"]), reverse=True)
+    return {"players": ranked, "own_goals": own_goals}
+
+
+def iter_goals(seasons: list) -> Iterator[tuple]:
+    """
+    (season_index, match_index, player ID, name as written) for every goal
+    in match order; the player ID is None for own goals. Surnames resolve within their own
+    season first, then across all seasons.
+    """
+    everyone = PlayerRegistry.from_sources(seasons)
+    for s, season in enumerate(seasons):
+        local = PlayerRegistry.from_sources([season])
+        for m, match in enumerate(season.matches):
+            for entry in match.scorers:
+                name, own_goal = parse_scorer(entry)
+                if own_goal:
+                    yield s, m, None, name
+                else:
+                    yield s, m, local.resolve(name) or everyone.resolve(name) or local.register(name), name
+
+
+def compute_match_indexes(seasons: list) -> dict:
+    """
+    Inverted indexes over every match. A match ref is [season_index, match_index]
+    into "seasons" / that season's matches list. by_scorer is keyed by player
+    ID and holds one ref per goal; own goals are listed separately. by_date holds every ref sorted by
+    date with a parallel dates list for binary search.
+    """
+    by_opponent, by_scorer, by_stage = {}, {}, {}
+    own_goals, dated = [], []
+    for s, season in enumerate(seasons):
+        for m, match in enumerate(season.matches):
+            ref = [s, m]
+            by_opponent.setdefault(match.opponent, []).append(ref)
+            by_stage.setdefault(match.stage, []).append(ref)
+            dated.append((match.date, s, m))
+    for s, m, pid, _ in iter_goals(seasons):
+        if pid is None:
+            own_goals.append([s, m])
+        else:
+            by_scorer.setdefault(pid, []).append([s, m])
+    dated.sort()
+    return {
+        "seasons": [season.id for season in seasons],
+        "by_opponent": by_opponent,
+        "by_scorer": by_scorer,
+        "own_goals": own_goals,
+        "by_stage": by_stage,
+        "by_date": {
+            "dates": [date for date, _, _ in dated],
+            "refs": [[s, m] for _, s, m in dated],
+        },
+    }
+
+
+HEAD_TO_HEAD_COLUMNS = (
+    "played", "wins", "draws", "losses", "goals_for", "goals_against", "ties_won", "ties_lost",
+)
+
+
+def tie_outcome(legs: list) -> Optional[str]:
+    """
+    "won"/"lost" for a knockout tie from its Match records: aggregate goals,
+    then away goals (Barça's away goals against those conceded at home).
+    None if level on both (e.g. decided on penalties).
+    """
+    goals_for = sum(leg.goals_scored for leg in legs)
+    goals_against = sum(leg.goals_conceded for leg in legs)
+    if goals_for == goals_against:
+        goals_for = sum(leg.goals_scored for leg in legs if leg.home_away == "A")
+        goals_against = sum(leg.goals_conceded for leg in legs if leg.home_away == "H")
+    if goals_for == goals_against:
+        return None
+    return "won" if goals_for > goals_against else "lost"
+
+
+def compute_head_to_head(seasons: list) -> dict:
+    """
+    Sparse opponent x season matrix. Each cell holds HEAD_TO_HEAD_COLUMNS
+    for the matches against one opponent in one season, including the
+    outcomes of knockout ties (a knockout_path entry's legs are the matches
+    against that opponent in that round). Only non-empty cells are stored:
+    "cells" rows are [opponent index, season index, *HEAD_TO_HEAD_COLUMNS],
+    ordered by opponent then season, and "totals" has one row per opponent.
+    """
+    opponents = sorted({match.opponent for season in seasons for match in season.matches})
+    opponent_index = {name: i for i, name in enumerate(opponents)}
+    cells = {}
+    for s, season in enumerate(seasons):
+        legs = {}
+        for match in season.matches:
+            cell = cells.setdefault((opponent_index[match.opponent], s), [0] * len(HEAD_TO_HEAD_COLUMNS))
+            cell[0] += 1
+            cell[1 if match.goals_scored > match.goals_conceded else 2 if match.goals_scored == match.goals_conceded else 3] += 1
+            cell[4] += match.goals_scored
+            cell[5] += match.goals_conceded
+            legs.setdefault((match.opponent, match.stage), []).append(match)
+        for tie in season.knockout_path:
+            outcome = tie_outcome(legs[tie.opponent, tie.round]) if (tie.opponent, tie.round) in legs else None
+            if outcome is not None:
+                cells[opponent_index[tie.opponent], s][6 if outcome == "won" else 7] += 1
+
+    rows = [[o, s] + cell for (o, s), cell in sorted(cells.items())]
+    totals = [[o] + [0] * len(HEAD_TO_HEAD_COLUMNS) for o in range(len(opponents))]
+    for row in rows:
+        total = totals[row[0]]
+        for i, value in enumerate(row[2:], 1):
+            total[i] += value
+    return {
+        "seasons": [season.id for season in seasons],
+        "opponents": opponents,
+        "columns": list(HEAD_TO_HEAD_COLUMNS),
+        "cells": rows,
+        "totals": totals,
+    }
+
+
+FORM_WINDOW = 3  # matches per precomputed rolling average
+
+
+def _prefix_sums(values: Iterable) -> list:
+    # starting from 0 also turns counts of flags into ints (accumulate passes a lone first bool through)
+    return list(itertools.accumulate(values, initial=0))
+
+
+def _window_ratio(numerator: list, denominator: list, lo: int, hi: int, scale: float, digits: int) -> Optional[float]:
+    """(numerator sum / denominator sum) * scale over matches lo..hi-1, from prefix sums"""
+    total = denominator[hi] - denominator[lo]
+    return round((numerator[hi] - numerator[lo]) / total * scale, digits) if total else None
+
+
+def compute_form_curves(seasons: list, window: int = FORM_WINDOW) -> dict:
+    """
+    Prefix sums over each season's matches in date order, plus the series
+    the charts plot. order[i] is the index in season.matches of the i-th
+    match by date (ties keep source order). prefix[stat][i] is the total
+    over the first i matches by date, so
+    any window of matches lo..hi-1 is prefix[stat][hi] - prefix[stat][lo].
+    Possession and shots are only summed over matches that tracked them,
+    counted by the *_tracked prefixes. Rolling averages cover the last
+    `window` matches (fewer at the start of a season) and are None where
+    nothing was tracked.
+    """
+    curves = {}
+    for season in seasons:
+        order = sorted(range(len(season.matches)), key=lambda i: (season.matches[i].date, i))
+        matches = [season.matches[i] for i in order]
+        with_possession = [m.possession is not None for m in matches]
+        with_shots = [m.shots is not None and m.shots_on_target is not None for m in matches]
+        prefix = {
+            "goals_for": _prefix_sums(m.goals_scored for m in matches),
+            "goals_against": _prefix_sums(m.goals_conceded for m in matches),
+            "clean_sheets": _prefix_sums(m.goals_conceded == 0 for m in matches),
+            "possession": _prefix_sums(m.possession if tracked else 0 for m, tracked in zip(matches, with_possession)),
+            "possession_tracked": _prefix_sums(with_possession),
+            "shots": _prefix_sums(m.shots if tracked else 0 for m, tracked in zip(matches, with_shots)),
+            "shots_on_target": _prefix_sums(m.shots_on_target if tracked else 0 for m, tracked in zip(matches, with_shots)),
+            "shots_tracked": _prefix_sums(with_shots),
+        }
+        played = list(range(len(matches) + 1))
+        windows = [(max(0, hi - window), hi) for hi in range(1, len(matches) + 1)]
+        curves[season.id] = {
+            "order": order,
+            "prefix": prefix,
+            "cumulative_goals_for": prefix["goals_for"][1:],
+            "cumulative_goals_against": prefix["goals_against"][1:],
+            "clean_sheet_rate": [_window_ratio(prefix["clean_sheets"], played, 0, hi, 100, 1) for hi in played[1:]],
+            "rolling": {
+                "goals_for": [_window_ratio(prefix["goals_for"], played, lo, hi, 1, 2) for lo, hi in windows],
+                "goals_against": [_window_ratio(prefix["goals_against"], played, lo, hi, 1, 2) for lo, hi in windows],
+                "possession": [_window_ratio(prefix["possession"], prefix["possession_tracked"], lo, hi, 1, 1) for lo, hi in windows],
+                "shots": [_window_ratio(prefix["shots"], prefix["shots_tracked"], lo, hi, 1, 2) for lo, hi in windows],
+                "shot_accuracy": [_window_ratio(prefix["shots_on_target"], prefix["shots"], lo, hi, 100, 1) for lo, hi in windows],
+            },
+        }
+    return {"window": window, "seasons": curves}
+
+
+SIMILARITY_K = 5
+SEASON_FEATURES = ("goals_per_match", "goals_conceded_per_match", "win_percentage", "avg_possession", "dominance_index")
+MATCH_FEATURES = ("goals_scored", "goals_conceded", "possession", "shots", "shots_on_target")
+
+
+def standardize(rows: list) -> list:
+    """
+    Z-score every column over its non-null values. Nulls stay None (missing,
+    not zero) and constant columns become None, since they carry no signal.
+    """
+    columns = []
+    for column in zip(*rows):
+        present = [value for value in column if value is not None]
+        mean = sum(present) / len(present) if present else 0.0
+        spread = math.sqrt(sum((value - mean) ** 2 for value in present) / len(present)) if present else 0.0
+        columns.append([None if value is None or not spread else (value - mean) / spread for value in column])
+    return [list(row) for row in zip(*columns)]
+
+
+def feature_distance(a: list, b: list) -> Optional[float]:
+    """
+    Euclidean distance over the features both vectors have, scaled up to
+    the full dimension; None when they share no feature.
+    """
+    total, shared = 0.0, 0
+    for x, y in zip(a, b):
+        if x is not None and y is not None:
+            total += (x - y) ** 2
+            shared += 1
+    return math.sqrt(total * len(a) / shared) if shared else None
+
+
+class NeighbourIndex:
+    """
+    Exact k-nearest-neighbour search under feature_distance(). Vectors are
+    partitioned by which features they have, and each partition gets a k-d
+    tree over its present features. A query visits every partition it shares
+    a feature with, and only prunes a subtree when the split is on a shared
+    feature, so results (ties broken by index) equal a brute-force scan.
+    """
+
+    LEAF_SIZE = 8
+
+    def __init__(self, vectors: list):
+        self.vectors = vectors
+        groups = {}
+        for i, vector in enumerate(vectors):
+            groups.setdefault(tuple(x is not None for x in vector), []).append(i)
+        self.partitions = [
+            ({d for d, present in enumerate(mask) if present}, self._build(rows, [d for d, present in enumerate(mask) if present]))
+            for mask, rows in sorted(groups.items())
+        ]
+
+    def _build(self, rows: list, dims: list) -> Any:
+        """A leaf (list of row indices) or (split dim, split value, left, right)"""
+        if len(rows) <= self.LEAF_SIZE or not dims:
+            return rows
+        vectors = self.vectors
+        dim = max(dims, key=lambda d: max(vectors[i][d] for i in rows) - min(vectors[i][d] for i in rows))
+        rows = sorted(rows, key=lambda i: vectors[i][dim])
+        mid = len(rows) // 2
+        if vectors[rows[0]][dim] == vectors[rows[-1]][dim]:
+            return rows
+        # left holds values <= split, right values >= split
+        return dim, vectors[rows[mid]][dim], self._build(rows[:mid], dims), self._build(rows[mid:], dims)
+
+    def query(self, i: int, k: int) -> list:
+        """[(index, distance)] of the k vectors closest to vector i, closest first"""
+        query, vectors = self.vectors[i], self.vectors
+        present = {d for d, x in enumerate(query) if x is not None}
+        best = []  # max-heap of (-distance, -index): best[0] is the current k-th neighbour
+
+        def consider(rows: list) -> None:
+            for j in rows:
+                if j == i:
+                    continue
+                distance = feature_distance(query, vectors[j])
+                if distance is None:
+                    continue
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, -j))
+                elif (-distance, -j) > best[0]:
+                    heapq.heapreplace(best, (-distance, -j))
+
+        def search(node: Any, shared: set, scale: float) -> None:
+            if isinstance(node, list):
+                consider(node)
+                return
+            dim, split, left, right = node
+            if dim not in shared:
+                search(left, shared, scale)
+                search(right, shared, scale)
+                return
+            delta = query[dim] - split
+            near, far = (left, right) if delta < 0 else (right, left)
+            search(near, shared, scale)
+            # the relative slack keeps rounding from pruning a neighbour tied at the k-th distance
+            if len(best) < k or delta * delta * scale <= best[0][0] ** 2 * (1 + 1e-9):
+                search(far, shared, scale)
+
+        for dims, tree in self.partitions:
+            shared = present & dims
+            if shared:
+                search(tree, shared, len(query) / len(shared))
+        return [(-j, -distance) for distance, j in sorted(best, reverse=True)]
+
+
+def nearest_neighbours(vectors: list, k: int) -> list:
+    """k-NN: for each vector, [(index, distance)] of its k closest others, closest first"""
+    index = NeighbourIndex(vectors)
+    return [index.query(i, k) for i in range(len(vectors))]
+
+
+def compute_similarity(seasons: list, comparison: list, k: int = SIMILARITY_K) -> dict:
+    """
+    Top-k most similar seasons (on the comparison metrics) and matches (on
+    per-match stats) after standardizing each feature. Match neighbours are
+    nested by season and match, like the match refs in indexes.json:
+    matches[s][m] lists [season_index, match_index, distance].
+    """
+    season_vectors = standardize([[row[field] for field in SEASON_FEATURES] for row in comparison])
+    refs = [(s, m) for s, season in enumerate(seasons) for m in range(len(season.matches))]
+    match_vectors = standardize([
+        [getattr(seasons[s].matches[m], field) for field in MATCH_FEATURES] for s, m in refs
+    ])
+    match_neighbours = nearest_neighbours(match_vectors, k)
+    nested = [[] for _ in seasons]
+    for (s, _), found in zip(refs, match_neighbours):
+        nested[s].append([[refs[j][0], refs[j][1], round(distance, 3)] for j, distance in found])
+    return {
+        "k": k,
+        "season_features": list(SEASON_FEATURES),
+        "match_features": list(MATCH_FEATURES),
+        "seasons": {
+            season.id: [{"season": seasons[j].id, "distance": round(distance, 3)} for j, distance in found]
+            for season, found in zip(seasons, nearest_neighbours(season_vectors, k))
+        },
+        "matches": nested,
+    }
+
+
+def _dictionary_encode(values: Iterable, typecode: str = "i") -> tuple:
+    """(codes, dictionary) with dictionary entries in first-seen order"""
+    codes, dictionary = array(typecode), {}
+    for value in values:
+        codes.append(dictionary.setdefault(value, len(dictionary)))
+    return codes, list(dictionary)
+
+
+def compute_columnar_tables(seasons: list) -> dict:
+    """
+    The season, match and scorer tables as columns. A column is a typed
+    array, or a (codes, dictionary) pair for strings. Untracked stats are
+    NaN, and a scorer's match column is a row number in the match table.
+    """
+    table = MatchTable.from_seasons(seasons)
+    ids = [season.id for season in seasons]
+    match_seasons = array("i")
+    for i in range(len(seasons)):
+        match_seasons.extend([i] * (table.season_offsets[i + 1] - table.season_offsets[i]))
+    matches = [match for season in seasons for match in season.matches]
+
+    scorer_seasons, scorer_matches, scorer_players = array("i"), array("i"), []
+    for s, m, pid, _ in iter_goals(seasons):
+        scorer_seasons.append(s)
+        scorer_matches.append(table.season_offsets[s] + m)
+        scorer_players.append(pid)
+
+    season_columns = {"id": (array("i", range(len(seasons))), ids)}
+    for field in ("display_name", "manager", "formation"):
+        season_columns[field] = _dictionary_encode(getattr(season, field) for season in seasons)
+    for field in SEASON_TOTAL_FIELDS:
+        values = [getattr(season, field) for season in seasons]
+        if all(isinstance(value, int) for value in values):
+            season_columns[field] = array("i", values)
+        else:
+            season_columns[field] = array("d", map(_stat_or_nan, values))
+
+    return {
+        "seasons": season_columns,
+        "matches": {
+            "season": (match_seasons, ids),
+            "date": _dictionary_encode(match.date for match in matches),
+            "opponent": _dictionary_encode(match.opponent for match in matches),
+            "home_away": (table.home_away, list(HOME_AWAY_CODES)),
+            "stage": (table.stage, table.stages),
+            "score": _dictionary_encode(match.score for match in matches),
+            "goals_scored": table.goals_scored,
+            "goals_conceded": table.goals_conceded,
+            "possession": table.possession,
+            "shots": table.shots,
+            "shots_on_target": table.shots_on_target,
+            "extra_time": array("b", (bool(match.extra_time) for match in matches)),
+        },
+        "scorers": {
+            "season": (scorer_seasons, ids),
+            "match": scorer_matches,
+            "player": _dictionary_encode(scorer_players),
+            "own_goal": array("b", (pid is None for pid in scorer_players)),
+        },
+    }
+
+
+def build_entries(sources: list) -> list:
+    """
+    Build a batch of parsed season sources into cache entries (season,
+    totals row, comparison row, consistency violations in the source)
+    """
+    seasons, totals = build_seasons(sources)
+    return [
+        {
+            "season": season,
+            "totals": {field: totals[field][i] for field in SEASON_TOTAL_FIELDS},
+            "comparison": compute_comparison_row(season, totals, i),
+            "violations": list(validate_season(source)),
+        }
+        for i, (source, season) in enumerate(zip(sources, seasons))
     ]
 
-    cross_season = compute_cross_season_data(seasons)
 
+def _build_entries_from_paths(paths: list) -> list:
+    """Process-pool worker: parse and build the season files at paths"""
+    return build_entries([SeasonSource(path).load() for path in paths])
+
+
+def build_entries_parallel(sources: list, workers: int) -> list:
+    """
+    Fan season builds out over a process pool in contiguous chunks, one per
+    worker. Results come back in source order, so the reduce is deterministic.
+    """
+    if workers <= 1 or len(sources) <= 1:
+        return build_entries([source.load() for source in sources])
+    workers = min(workers, len(sources))
+    size = -(-len(sources) // workers)
+    chunks = [[source.path for source in sources[i:i + size]] for i in range(0, len(sources), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [entry for batch in executor.map(_build_entries_from_paths, chunks) for entry in batch]
+
+
+METRIC_FUNCTIONS = (
+    SeasonSource, _build_entries_from_paths, build_entries, build_seasons,
+    Record, Match, KnockoutTie, Scorer, Final, PlayerStat, Season, MatchTable, _stat_or_nan, compute_season_totals, build_season,
+    compute_comparison_row, compute_common_traits, compute_dominance_index,
+    parse_score, _leg_totals, validate_season,
+    parse_scorer, _fold, player_id, name_aliases, PlayerRegistry,
+    known_player_names, tally_goals, derive_top_scorers,
+)
+
+METRIC_CONSTANTS = {
+    "season_total_fields": SEASON_TOTAL_FIELDS,
+    "dominance_weights": DOMINANCE_WEIGHTS,
+    "dominance_gd_cap": DOMINANCE_GD_CAP,
+    "incomplete_scorers": sorted(INCOMPLETE_SCORERS),
+}
+
+
+def content_hash(value: Any) -> str:
+    """Stable SHA-256 of a JSON-serializable value"""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def code_hash(functions: tuple) -> str:
+    """Hash of the source of the given functions/classes"""
+    return content_hash([_source_of(fn) for fn in functions])
+
+
+def _source_of(obj: Any) -> list:
+    # inspect.getsource() on a class re-parses the whole module, so classes
+    # are hashed through their methods' source and declared fields instead
+    if not inspect.isclass(obj):
+        return [inspect.getsource(obj)]
+    members = [getattr(member, "__func__", member) for member in vars(obj).values()]
+    declared = [f"{name} = {value!r}" for name, value in vars(obj).items() if name == "__slots__" or name.isupper()]
+    return [obj.__qualname__] + declared + [inspect.getsource(member) for member in members if inspect.isfunction(member)]
+
+
+def metric_code_hash() -> str:
+    """Hash of the code and tuning constants that turn season sources into derived values"""
+    return content_hash([code_hash(METRIC_FUNCTIONS), METRIC_CONSTANTS])
+
+
+def load_build_cache(path: str = CACHE_PATH) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_if_changed(path: str, payload: bytes) -> bool:
+    """Atomically replace path with payload unless it already holds those bytes"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
+
+def build_seasons_incremental(sources: list, cache: dict, metric_hash: str, workers: int = 1) -> tuple:
+    """
+    Build seasons from SeasonSource objects, reusing cached results for files
+    whose content hash and metric code are unchanged; only stale files are
+    parsed, on up to `workers` processes. Returns (seasons, totals,
+    comparison, entries, rebuilt_ids), where entries is the refreshed cache
+    section.
+    """
+    cached = cache.get("seasons", {}) if cache.get("metric_hash") == metric_hash else {}
+    stale = [source for source in sources if cached.get(source.id, {}).get("source_hash") != source.digest]
+
+    entries = {}
+    for source, entry in zip(stale, build_entries_parallel(stale, workers)):
+        entry["source_hash"] = source.digest
+        entries[source.id] = entry
+
+    seasons, comparison = [], []
+    totals = {field: [] for field in SEASON_TOTAL_FIELDS}
+    for source in sources:
+        entry = entries.get(source.id)
+        if entry is None:
+            entry = entries[source.id] = dict(cached[source.id], season=Season.from_dict(cached[source.id]["season"]))
+        seasons.append(entry["season"])
+        comparison.append(entry["comparison"])
+        for field in SEASON_TOTAL_FIELDS:
+            totals[field].append(entry["totals"][field])
+    return seasons, totals, comparison, entries, [source.id for source in stale]
+
+
+class StreamedList:
+    """Top-level list whose items are serialized one at a time as they are produced"""
+
+    def __init__(self, items: Iterable):
+        self.items = items
+
+
+def iter_json_chunks(document: dict) -> Iterator[tuple]:
+    """
+    Serialize a top-level object incrementally, yielding (pretty, compact)
+    text chunks. Pretty output is byte-identical to json.dumps(indent=2).
+    """
+    pretty = functools.partial(json.dumps, ensure_ascii=False, indent=2, default=to_json)
+    compact = functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":"), default=to_json)
+    if not document:
+        yield "{}", "{}"
+        return
+    yield "{", "{"
+    for n, (key, value) in enumerate(document.items()):
+        sep = "," if n else ""
+        yield f"{sep}\n  {pretty(key)}: ", f"{sep}{compact(key)}:"
+        if not isinstance(value, StreamedList):
+            yield pretty(value).replace("\n", "\n  "), compact(value)
+            continue
+        empty = True
+        for m, item in enumerate(value.items):
+            empty = False
+            yield ("[" if m == 0 else ",") + "\n    " + pretty(item).replace("\n", "\n    "), ("[" if m == 0 else ",") + compact(item)
+        yield ("[]", "[]") if empty else ("\n  ]", "]")
+    yield "\n}", "}"
+
+
+# per-thread list that run_stages() points at to collect every _Artifact a stage opens
+_staging = threading.local()
+
+
+class _Artifact:
+    """Temp-file sink that hashes what it writes and only replaces the target if it changed"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.file = open(self.tmp_path, "wb")
+        self.digest = hashlib.sha256()
+        self.size = 0
+        opened = getattr(_staging, "artifacts", None)
+        if opened is not None:
+            opened.append(self)
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+    def commit(self) -> tuple:
+        """Returns (changed, sha256 hex digest)"""
+        self.file.close()
+        digest = self.digest.hexdigest()
+        if _file_hash(self.path) == digest:
+            os.remove(self.tmp_path)
+            return False, digest
+        os.replace(self.tmp_path, self.path)
+        return True, digest
+
+    def discard(self) -> None:
+        """Drop the staged file without publishing it"""
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class _Kept:
+    """A published file reused as is; commits like an unchanged _Artifact"""
+
+    def __init__(self, path: str, record: dict):
+        self.path = path
+        self.size = record["bytes"]
+        self._digest = record["sha256"]
+
+    def commit(self) -> tuple:
+        return False, self._digest
+
+    def discard(self) -> None:
+        pass
+
+
+def stage_document(path: str, document: dict) -> list:
+    """
+    Stream a document to temporary files for path (pretty), its .min.json
+    variant, and precompressed .gz/.br siblings of the minified file in a
+    single pass. Brotli output is skipped if the module is missing.
+    """
+    stem = path[:-len(".json")]
+    pretty = _Artifact(path)
+    compact = _Artifact(f"{stem}.min.json")
+    gz = _Artifact(f"{stem}.min.json.gz")
+    br = _Artifact(f"{stem}.min.json.br") if brotli else None
+    gzip_stream = zlib.compressobj(9, zlib.DEFLATED, 31)
+    brotli_stream = brotli.Compressor(quality=11) if brotli else None
+
+    for pretty_chunk, compact_chunk in iter_json_chunks(document):
+        pretty.write(pretty_chunk.encode("utf-8"))
+        data = compact_chunk.encode("utf-8")
+        compact.write(data)
+        gz.write(gzip_stream.compress(data))
+        if br:
+            br.write(brotli_stream.process(data))
+    gz.write(gzip_stream.flush())
+    if br:
+        br.write(brotli_stream.finish())
+    return [artifact for artifact in (pretty, compact, gz, br) if artifact]
+
+
+def commit_artifacts(artifacts: list, data_dir: str = DATA_DIR) -> tuple:
+    """
+    Move staged files into place. Returns (records, rewritten): records maps
+    each file name relative to data_dir to {"sha256", "bytes"}; rewritten
+    lists the files whose bytes changed.
+    """
+    records, rewritten = {}, []
+    for artifact in artifacts:
+        changed, digest = artifact.commit()
+        name = os.path.relpath(artifact.path, data_dir).replace(os.sep, "/")
+        records[name] = {"sha256": digest, "bytes": artifact.size}
+        if changed:
+            rewritten.append(name)
+    return records, rewritten
+
+
+def shard_path(data_dir: str, season_id: str) -> str:
+    return os.path.join(data_dir, SHARD_DIR_NAME, f"{season_id}.json")
+
+
+def stage_season_shards(seasons: list, entries: dict, shard_code: str, data_dir: str = DATA_DIR) -> tuple:
+    """
+    Stage one shard per season; returns (index manifest entries, artifacts).
+    A shard is only re-serialized if its cache entry was not written by this
+    shard code (the season was rebuilt, or the code changed) or its files are
+    gone; otherwise the published files are kept as they are.
+    """
+    index, artifacts = [], []
+    for season in seasons:
+        entry = entries[season.id]
+        name = f"{SHARD_DIR_NAME}/{season.id}.json"
+        if entry.get("shard_code") != shard_code or not _artifacts_present(entry.get("artifacts"), data_dir):
+            staged = stage_document(shard_path(data_dir, season.id), season.to_dict())
+            size, digest = staged[0].size, staged[0].digest.hexdigest()
+            entry["shard_code"] = shard_code
+        else:
+            staged = [_Kept(os.path.join(data_dir, shard), record) for shard, record in entry["artifacts"].items()]
+            size, digest = entry["artifacts"][name]["bytes"], entry["artifacts"][name]["sha256"]
+        artifacts += staged
+        summary = {field: getattr(season, field) for field in INDEX_SUMMARY_FIELDS}
+        summary.update(shard=name, bytes=size, sha256=digest)
+        index.append(summary)
+    return index, artifacts
+
+
+def remove_stale_shards(seasons: list, data_dir: str = DATA_DIR) -> None:
+    expected = {season.id for season in seasons}
+    shard_dir = os.path.join(data_dir, SHARD_DIR_NAME)
+    for name in os.listdir(shard_dir):
+        if name.split(".", 1)[0] not in expected:
+            os.remove(os.path.join(shard_dir, name))
+
+
+def _artifacts_present(records: Optional[dict], data_dir: str) -> bool:
+    return bool(records) and all(
+        os.path.isfile(path) and os.path.getsize(path) == record["bytes"]
+        for path, record in ((os.path.join(data_dir, name), record) for name, record in records.items())
+    )
+
+
+def stage_columnar(tables: dict, directory: str) -> list:
+    """
+    Stage each column as a raw little-endian file (directory/<table>.<column>.bin)
+    plus a schema.json manifest, so readers can mmap a column and scan it
+    without parsing anything; see open_columnar.
+    """
+    os.makedirs(directory, exist_ok=True)
+    schema, staged = {"byte_order": "little", "tables": {}}, []
+    for table_name, columns in tables.items():
+        described, rows = [], 0
+        for column_name, column in columns.items():
+            values, dictionary = column if isinstance(column, tuple) else (column, None)
+            if sys.byteorder != "little":
+                values = array(values.typecode, values)
+                values.byteswap()
+            file_name = f"{table_name}.{column_name}.bin"
+            artifact = _Artifact(os.path.join(directory, file_name))
+            artifact.write(values.tobytes())
+            staged.append(artifact)
+            entry = {"name": column_name, "type": COLUMN_TYPES[values.typecode], "file": file_name}
+            if dictionary is not None:
+                entry["dictionary"] = dictionary
+            described.append(entry)
+            rows = len(values)
+        schema["tables"][table_name] = {"rows": rows, "columns": described}
+    manifest = _Artifact(os.path.join(directory, COLUMNAR_SCHEMA_NAME))
+    manifest.write(serialize(schema))
+    return staged + [manifest]
+
+
+def stage_arrow_tables(tables: dict, directory: str) -> list:
+    """
+    Stage uncompressed Feather (Arrow IPC, mmap-able) and Parquet copies of
+    each table. Skipped unless pyarrow is installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        return []
+    staged = []
+    for table_name, columns in tables.items():
+        arrays = {}
+        for column_name, column in columns.items():
+            if isinstance(column, tuple):
+                codes, dictionary = column
+                arrays[column_name] = pyarrow.DictionaryArray.from_arrays(
+                    pyarrow.array(list(codes), pyarrow.int32()), pyarrow.array(dictionary)
+                )
+            else:
+                arrays[column_name] = pyarrow.array(list(column), from_pandas=True)
+        arrow_table = pyarrow.table(arrays)
+        for extension, write in (
+            ("arrow", functools.partial(pyarrow.feather.write_feather, compression="uncompressed")),
+            ("parquet", pyarrow.parquet.write_table),
+        ):
+            sink = pyarrow.BufferOutputStream()
+            write(arrow_table, sink)
+            artifact = _Artifact(os.path.join(directory, f"{table_name}.{extension}"))
+            artifact.write(sink.getvalue().to_pybytes())
+            staged.append(artifact)
+    return staged
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE seasons (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    display_name TEXT NOT NULL,
+    competition TEXT NOT NULL,
+    manager TEXT NOT NULL,
+    formation TEXT NOT NULL,
+    matches_played INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    goals_scored INTEGER NOT NULL,
+    goals_conceded INTEGER NOT NULL,
+    goal_difference INTEGER NOT NULL,
+    clean_sheets INTEGER NOT NULL,
+    goals_per_match REAL NOT NULL,
+    goals_conceded_per_match REAL NOT NULL,
+    win_percentage REAL NOT NULL,
+    avg_possession INTEGER,
+    dominance_index REAL NOT NULL
+);
+CREATE TABLE matches (
+    id INTEGER PRIMARY KEY,
+    season_id TEXT NOT NULL REFERENCES seasons (id),
+    match_index INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    home_away TEXT NOT NULL,
+    score TEXT NOT NULL,
+    goals_scored INTEGER NOT NULL,
+    goals_conceded INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    possession INTEGER,
+    shots INTEGER,
+    shots_on_target INTEGER,
+    extra_time INTEGER NOT NULL
+);
+CREATE TABLE match_scorers (
+    match_id INTEGER NOT NULL REFERENCES matches (id),
+    season_id TEXT NOT NULL REFERENCES seasons (id),
+    player_id TEXT,
+    name TEXT NOT NULL,
+    own_goal INTEGER NOT NULL
+);
+CREATE TABLE knockout_ties (
+    season_id TEXT NOT NULL REFERENCES seasons (id),
+    position INTEGER NOT NULL,
+    round TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    note TEXT,
+    leg1_score TEXT,
+    leg1_venue TEXT,
+    leg2_score TEXT,
+    leg2_venue TEXT,
+    venue TEXT,
+    score TEXT,
+    aggregate TEXT NOT NULL,
+    key_contributors TEXT NOT NULL,
+    detail TEXT
+);
+CREATE TABLE top_scorers (
+    season_id TEXT NOT NULL REFERENCES seasons (id),
+    position INTEGER NOT NULL,
+    player_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    goals INTEGER NOT NULL,
+    assists INTEGER NOT NULL,
+    minutes INTEGER NOT NULL,
+    contribution_share REAL NOT NULL
+);
+CREATE INDEX matches_season ON matches (season_id);
+CREATE INDEX matches_opponent ON matches (opponent);
+CREATE INDEX matches_stage ON matches (stage);
+CREATE INDEX matches_date ON matches (date);
+CREATE INDEX match_scorers_player ON match_scorers (player_id);
+CREATE INDEX match_scorers_season ON match_scorers (season_id);
+CREATE INDEX match_scorers_match ON match_scorers (match_id);
+CREATE INDEX knockout_ties_season ON knockout_ties (season_id);
+CREATE INDEX knockout_ties_opponent ON knockout_ties (opponent);
+CREATE INDEX top_scorers_season ON top_scorers (season_id);
+CREATE INDEX top_scorers_player ON top_scorers (player_id);
+"""
+
+
+def stage_sqlite(seasons: list, path: str) -> list:
+    """
+    Stage an indexed SQLite database of seasons, matches, match_scorers,
+    knockout_ties and top_scorers. Player IDs match players.json; a match's
+    id is its row number across all seasons.
+    """
+    build_path = f"{path}.build"
+    if os.path.exists(build_path):
+        os.remove(build_path)
+    db = sqlite3.connect(build_path)
+    try:
+        db.executescript("PRAGMA journal_mode = OFF;" + SQLITE_SCHEMA)
+        match_ids, next_id = [], 0
+        for position, season in enumerate(seasons):
+            db.execute(
+                "INSERT INTO seasons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (season.id, position, season.display_name, season.competition, season.manager, season.formation)
+                + tuple(getattr(season, field) for field in SEASON_TOTAL_FIELDS)
+                + (compute_dominance_index(season),),
+            )
+            db.executemany(
+                "INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (next_id + m, season.id, m, match.date, match.opponent, match.home_away, match.score,
+                     match.goals_scored, match.goals_conceded, match.stage, match.possession, match.shots,
+                     match.shots_on_target, bool(match.extra_time))
+                    for m, match in enumerate(season.matches)
+                ],
+            )
+            match_ids.append(next_id)
+            next_id += len(season.matches)
+            db.executemany(
+                "INSERT INTO knockout_ties VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (season.id, t, tie.round, tie.opponent, tie.note,
+                     (tie.leg1 or {}).get("score"), (tie.leg1 or {}).get("venue"),
+                     (tie.leg2 or {}).get("score"), (tie.leg2 or {}).get("venue"),
+                     tie.venue, tie.score, tie.aggregate,
+                     json.dumps(tie.key_contributors, ensure_ascii=False), tie.detail)
+                    for t, tie in enumerate(season.knockout_path)
+                ],
+            )
+            local = PlayerRegistry.from_sources([season])
+            db.executemany(
+                "INSERT INTO top_scorers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (season.id, p, local.resolve(player.name), player.name, player.goals,
+                     player.assists, player.minutes, player.contribution_share)
+                    for p, player in enumerate(season.top_scorers)
+                ],
+            )
+        db.executemany(
+            "INSERT INTO match_scorers VALUES (?, ?, ?, ?, ?)",
+            [
+                (match_ids[s] + m, seasons[s].id, pid, name, pid is None)
+                for s, m, pid, name in iter_goals(seasons)
+            ],
+        )
+        db.commit()
+        db.execute("VACUUM")
+    finally:
+        db.close()
+    artifact = _Artifact(path)
+    with open(build_path, "rb") as f:
+        artifact.write(f.read())
+    os.remove(build_path)
+    return [artifact]
+
+
+def open_columnar(directory: str, table: str) -> dict:
+    """
+    Memory-map one table of a columnar export. Returns column name ->
+    zero-copy memoryview, or (memoryview of codes, dictionary) for
+    dictionary-encoded columns. Assumes a little-endian host.
+    """
+    with open(os.path.join(directory, COLUMNAR_SCHEMA_NAME), encoding="utf-8") as f:
+        schema = json.load(f)["tables"][table]
+    typecodes = {name: code for code, name in COLUMN_TYPES.items()}
+    columns = {}
+    for column in schema["columns"]:
+        with open(os.path.join(directory, column["file"]), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        values = memoryview(buffer).cast(typecodes[column["type"]])
+        columns[column["name"]] = (values, column["dictionary"]) if "dictionary" in column else values
+    return columns
+
+
+def _pointer(path: str, token: Any) -> str:
+    return f"{path}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+
+def same_json(a: Any, b: Any) -> bool:
+    """JSON equality that also tells True, 1 and 1.0 apart, at any depth"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same_json(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(same_json, a, b))
+    return a == b
+
+
+def json_patch(old: Any, new: Any, path: str = "") -> list:
+    """
+    RFC 6902 operations turning old into new. Lists are trimmed to the
+    range between their common prefix and suffix, so inserting or removing
+    one match costs a single operation.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": _pointer(path, key)} for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                ops += json_patch(old[key], value, _pointer(path, key))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        start, end_old, end_new = 0, len(old), len(new)
+        while start < min(end_old, end_new) and same_json(old[start], new[start]):
+            start += 1
+        while end_old > start and end_new > start and same_json(old[end_old - 1], new[end_new - 1]):
+            end_old, end_new = end_old - 1, end_new - 1
+        common = min(end_old, end_new) - start
+        ops = []
+        for i in range(start, start + common):
+            ops += json_patch(old[i], new[i], _pointer(path, i))
+        ops += [{"op": "remove", "path": _pointer(path, start + common)} for _ in range(end_old - start - common)]
+        ops += [{"op": "add", "path": _pointer(path, i), "value": new[i]} for i in range(start + common, end_new)]
+        return ops
+    if same_json(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def version_dataset(previous: Optional[dict], current: dict, last_version: int = 0) -> tuple:
+    """
+    Stamp current["metadata"]["version"] relative to the previously published
+    dataset: unchanged content keeps the version, anything else bumps it.
+    Without a versioned previous dataset, the version follows last_version
+    (the latest one known from elsewhere, e.g. patches/) so it never goes back.
+    Returns (version, patch); patch is the RFC 6902 patch from the previous
+    version, or None when there is nothing (or no versioned base) to patch.
+    """
+    base = (previous or {}).get("metadata", {}).get("version")
+    current["metadata"]["version"] = base or last_version + 1
+    if base is None or same_json(previous, current):
+        return current["metadata"]["version"], None
+    current["metadata"]["version"] = base + 1
+    return base + 1, json_patch(previous, current)
+
+
+def load_published(path: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def patch_path(data_dir: str, version: int) -> str:
+    return os.path.join(data_dir, PATCH_DIR_NAME, f"{version}.json")
+
+
+def latest_patch_version(data_dir: str) -> int:
+    """Highest version with a patch in patches/, or 0"""
+    patch_dir = os.path.join(data_dir, PATCH_DIR_NAME)
+    stems = [name.split(".", 1)[0] for name in os.listdir(patch_dir)] if os.path.isdir(patch_dir) else []
+    return max((int(stem) for stem in stems if stem.isdigit()), default=0)
+
+
+def prune_patches(data_dir: str, version: int) -> None:
+    """Keep the patches for the last PATCH_HISTORY versions; files not named <version>.* are left alone"""
+    patch_dir = os.path.join(data_dir, PATCH_DIR_NAME)
+    for name in os.listdir(patch_dir):
+        stem = name.split(".", 1)[0]
+        if stem.isdigit() and int(stem) <= version - PATCH_HISTORY:
+            os.remove(os.path.join(patch_dir, name))
+
+
+def file_records(directory: str, data_dir: str) -> dict:
+    """{"sha256", "bytes"} records for every file in a published directory"""
+    records = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        records[os.path.relpath(path, data_dir).replace(os.sep, "/")] = {
+            "sha256": _file_hash(path),
+            "bytes": os.path.getsize(path),
+        }
+    return records
+
+
+def outputs_current(output_hashes: dict, data_dir: str) -> bool:
+    """True when every recorded output file still holds the recorded bytes"""
+    return bool(output_hashes) and all(
+        _file_hash(os.path.join(data_dir, name)) == digest for name, digest in output_hashes.items()
+    )
+
+
+# ── Stage graph ──────────────────────────────────────────────────────────
+#
+# Everything published after the seasons are built is a Stage: it reads
+# the BuildInputs plus the values of the stages named in `inputs`, and
+# returns (value, staged artifacts). A stage's fingerprint hashes its code
+# with its inputs' fingerprints (the seasons' is their source and metric
+# hashes), so a stage is skipped while its fingerprint matches the last
+# build and its published files are intact.
+
+SEASONS_INPUT = "seasons"
+
+
+class BuildInputs:
+    """
+    What every stage reads: the built seasons, where outputs are published,
+    and the stage records of the last build (for stages that keep state)
+    """
+
+    def __init__(self, seasons: list, totals: dict, comparison: list, entries: dict, data_dir: str,
+                 previous: Optional[dict] = None):
+        self.seasons = seasons
+        self.totals = totals
+        self.comparison = comparison
+        self.entries = entries
+        self.data_dir = data_dir
+        self.previous = previous or {}
+
+
+class Stage:
+    """
+    One node of the build graph. `code` lists the functions whose source is
+    part of the stage's fingerprint; `outputs` the published files or
+    directories (relative to the data directory) it writes, if any. With
+    keeps_state, the stage's value is saved in its build cache record and
+    handed back through BuildInputs.previous on the next build.
+    """
+
+    def __init__(self, name: str, inputs: tuple, run: Callable, code: tuple, outputs: tuple = (),
+                 keeps_state: bool = False):
+        self.name = name
+        self.inputs = inputs
+        self.run = run
+        self.code = (run,) + code
+        self.outputs = outputs
+        self.keeps_state = keeps_state
+
+    @functools.cached_property
+    def code_hash(self) -> str:
+        return code_hash(self.code)
+
+
+def _stage_cross_season(inputs: BuildInputs) -> tuple:
+    return {"comparison": inputs.comparison, "common_traits": compute_common_traits(inputs.totals)}, []
+
+
+def _stage_shards(inputs: BuildInputs) -> tuple:
+    index, artifacts = stage_season_shards(inputs.seasons, inputs.entries, STAGES["shards"].code_hash, inputs.data_dir)
+    return index, artifacts + stage_document(os.path.join(inputs.data_dir, INDEX_NAME), {"seasons": index})
+
+
+def _stage_document(file_name: str, compute: Callable) -> Callable:
+    """Run function of a stage that publishes compute(seasons) as one document"""
+    def run(inputs: BuildInputs) -> tuple:
+        return None, stage_document(os.path.join(inputs.data_dir, file_name), compute(inputs.seasons))
+    return run
+
+
+def _stage_similarity(inputs: BuildInputs) -> tuple:
+    similarity = compute_similarity(inputs.seasons, inputs.comparison)
+    return None, stage_document(os.path.join(inputs.data_dir, SIMILARITY_NAME), similarity)
+
+
+def _stage_columnar(inputs: BuildInputs) -> tuple:
+    tables = compute_columnar_tables(inputs.seasons)
+    directory = os.path.join(inputs.data_dir, COLUMNAR_DIR_NAME)
+    return None, stage_columnar(tables, directory) + stage_arrow_tables(tables, directory)
+
+
+def _stage_sqlite(inputs: BuildInputs) -> tuple:
+    return None, stage_sqlite(inputs.seasons, os.path.join(inputs.data_dir, SQLITE_NAME))
+
+
+def _to_plain(value: Any) -> Any:
+    """A value as it reads back from JSON (records become dicts, tuples lists)"""
+    return json.loads(json.dumps(value, ensure_ascii=False, default=to_json))
+
+
+def _shard_patch(state: Optional[dict], published: Optional[dict], rest: dict, seasons: list,
+                 index: list, data_dir: str) -> Optional[list]:
+    """
+    The patch from the last published dataset, built one season at a time:
+    only seasons whose shard hash changed since that dataset was published
+    are loaded (old content from their still-unreplaced shard file) and
+    diffed. Returns None when that cannot be done exactly — no state from
+    the last build, the published file or a shard no longer matches it, or
+    the season list changed — and the caller diffs whole documents instead.
+    """
+    if not state or not published or _file_hash(os.path.join(data_dir, OUTPUT_NAME)) != published["sha256"]:
+        return None
+    if list(state["shards"]) != [entry["id"] for entry in index]:
+        return None
+    ops = json_patch(state["rest"]["metadata"], rest["metadata"], "/metadata")
+    for i, (season, entry) in enumerate(zip(seasons, index)):
+        if state["shards"][season.id] == entry["sha256"]:
+            continue
+        path = shard_path(data_dir, season.id)
+        if _file_hash(path) != state["shards"][season.id]:
+            return None
+        ops += json_patch(load_published(path), _to_plain(season), f"/seasons/{i}")
+    return ops + json_patch(state["rest"]["cross_season"], rest["cross_season"], "/cross_season")
+
+
+def _stage_dataset(inputs: BuildInputs, cross_season: dict, index: list) -> tuple:
+    """
+    The full dataset document, versioned against the published one, plus
+    the patch from that version. The value kept for the next build is the
+    version, the shard hashes it was built from and the small non-season
+    parts of the document, so the next patch can be built shard by shard.
+    """
+    seasons, data_dir = inputs.seasons, inputs.data_dir
     data = {
         "metadata": {
+            "version": None,
             "title": "Barça UCL Winning Campaigns",
             "description": "Analytical dataset covering FC Barcelona's five UEFA Champions League / European Cup winning seasons",
-            "seasons_covered": ["1991-92", "2005-06", "2008-09", "2010-11", "2014-15"],
+            "seasons_covered": [season.id for season in seasons],
             "data_sources": [
                 "UEFA.com official records",
                 "Wikipedia UCL season articles",
@@ -582,20 +1865,415 @@ def main():
             ],
             "data_integrity_note": "All data is from publicly documented sources. Stats unavailable for older seasons are marked null."
         },
-        "seasons": seasons,
+        "seasons": StreamedList(iter(seasons)),
         "cross_season": cross_season
     }
+    rest = _to_plain({"metadata": data["metadata"], "cross_season": cross_season})
+    state = inputs.previous.get("dataset", {}).get("state")
+    published = inputs.previous.get("dataset", {}).get("artifacts", {}).get(OUTPUT_NAME)
+    if state:
+        rest["metadata"]["version"] = state["version"]
+    patch = _shard_patch(state, published, rest, seasons, index, data_dir)
+    shards = {entry["id"]: entry["sha256"] for entry in index}
+    if patch is None:
+        previous = load_published(os.path.join(data_dir, OUTPUT_NAME))
+        if previous is None and state and state["shards"] == shards and same_json(state["rest"], rest):
+            # only the published file went missing: publish the same version again
+            version = state["version"]
+        else:
+            # without the published file, the build state and patches/ still know the last version
+            last_version = max(state["version"] if state else 0, latest_patch_version(data_dir))
+            version, patch = version_dataset(previous, _to_plain(dict(data, seasons=seasons)), last_version)
+    elif not patch:
+        version, patch = state["version"], None
+    else:
+        # "version" is the first key of metadata, so its op leads, as in a whole-document diff
+        version = state["version"] + 1
+        patch.insert(0, {"op": "replace", "path": "/metadata/version", "value": version})
+    data["metadata"]["version"] = rest["metadata"]["version"] = version
+
+    artifacts = stage_document(os.path.join(data_dir, OUTPUT_NAME), data)
+    if patch is not None:
+        artifacts += stage_document(patch_path(data_dir, version), {
+            "from_version": version - 1,
+            "to_version": version,
+            "patch": patch,
+        })
+    return {"version": version, "shards": shards, "rest": rest}, artifacts
+
+
+DOCUMENT_CODE = (iter_json_chunks, stage_document)
+
+STAGES = {stage.name: stage for stage in (
+    Stage("cross_season", (), _stage_cross_season, ()),
+    Stage("shards", (), _stage_shards, (stage_season_shards,) + DOCUMENT_CODE, (INDEX_NAME, SHARD_DIR_NAME)),
+    Stage("indexes", (), _stage_document(MATCH_INDEXES_NAME, compute_match_indexes),
+          (_stage_document, iter_goals, compute_match_indexes) + DOCUMENT_CODE, (MATCH_INDEXES_NAME,)),
+    Stage("players", (), _stage_document(PLAYERS_NAME, compute_player_table),
+          (_stage_document, compute_player_table) + DOCUMENT_CODE, (PLAYERS_NAME,)),
+    Stage("head_to_head", (), _stage_document(HEAD_TO_HEAD_NAME, compute_head_to_head),
+          (_stage_document, tie_outcome, compute_head_to_head) + DOCUMENT_CODE, (HEAD_TO_HEAD_NAME,)),
+    Stage("form", (), _stage_document(FORM_NAME, compute_form_curves),
+          (_stage_document, _prefix_sums, _window_ratio, compute_form_curves) + DOCUMENT_CODE, (FORM_NAME,)),
+    Stage("similarity", (), _stage_similarity,
+          (standardize, feature_distance, NeighbourIndex, nearest_neighbours, compute_similarity) + DOCUMENT_CODE, (SIMILARITY_NAME,)),
+    Stage("columnar", (), _stage_columnar,
+          (_dictionary_encode, compute_columnar_tables, stage_columnar, stage_arrow_tables), (COLUMNAR_DIR_NAME,)),
+    Stage("sqlite", (), _stage_sqlite, (iter_goals, stage_sqlite), (SQLITE_NAME,)),
+    Stage("dataset", ("cross_season", "shards"), _stage_dataset,
+          (_pointer, same_json, json_patch, version_dataset, latest_patch_version, _to_plain, _shard_patch) + DOCUMENT_CODE,
+          (OUTPUT_NAME, PATCH_DIR_NAME), keeps_state=True),
+)}
+
+
+def _output_key(name: str) -> str:
+    """"index.min.json.gz" -> "index", "seasons/2008-09.json" -> "seasons", "barca_ucl.sqlite" -> "barca_ucl" """
+    return name.split("/", 1)[0].split(".", 1)[0]
+
+
+def resolve_target(target: str) -> str:
+    """Name of the stage that publishes `target`, given as a stage name or a published file name"""
+    if target in STAGES:
+        return target
+    for stage in STAGES.values():
+        if any(_output_key(target) == _output_key(output) for output in stage.outputs):
+            return stage.name
+    raise KeyError(f"no stage publishes {target!r}; stages: {', '.join(STAGES)}")
+
+
+def stage_fingerprints(seasons_fingerprint: str) -> dict:
+    """Fingerprint of every stage (and of the seasons input), in declared order"""
+    fingerprints = {SEASONS_INPUT: seasons_fingerprint}
+    for stage in STAGES.values():
+        fingerprints[stage.name] = content_hash(
+            [stage.code_hash, seasons_fingerprint] + [fingerprints[name] for name in stage.inputs]
+        )
+    return fingerprints
+
+
+def plan_stages(targets: list, fingerprints: dict, previous: dict, data_dir: str) -> list:
+    """
+    Stages to run, in declared order: every publishing stage among the
+    targets and their inputs whose fingerprint changed or whose files are
+    no longer intact, plus whatever those read. Value-only stages run only
+    when something downstream needs them.
+    """
+    wanted = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending += STAGES[name].inputs
+
+    run = set()
+    pending = [
+        name for name in wanted
+        if STAGES[name].outputs and (
+            previous.get(name, {}).get("fingerprint") != fingerprints[name]
+            or not outputs_current({n: r["sha256"] for n, r in previous[name]["artifacts"].items()}, data_dir)
+        )
+    ]
+    while pending:
+        name = pending.pop()
+        if name not in run:
+            run.add(name)
+            pending += STAGES[name].inputs
+    return [name for name in STAGES if name in run]
+
+
+def run_stages(names: list, inputs: BuildInputs, workers: int, stats: "BuildStats") -> tuple:
+    """
+    Run the named stages on up to `workers` threads, each as soon as the
+    stages it reads have finished, and each as its own stats stage. Stages
+    only stage files (nothing is published until their artifacts are
+    committed), so completion order does not affect the output. If a stage
+    fails, every file staged so far is discarded before the error
+    propagates. Returns ({name: value}, {name: artifacts}).
+    """
+    if stats.enabled:
+        workers = 1  # CPU time and tracemalloc peaks are process-wide, so profiled stages run one at a time
+    values, artifacts = {}, {}
+
+    def call(stage: Stage) -> tuple:
+        _staging.artifacts = opened = []
+        try:
+            with stats.stage(stage.name) as record:
+                value, staged = stage.run(inputs, *(values[name] for name in stage.inputs))
+                record.update(files=len(staged), output_bytes=sum(a.size for a in staged))
+            return value, staged
+        except BaseException:
+            for artifact in opened:
+                artifact.discard()
+            raise
+        finally:
+            _staging.artifacts = None
+
+    pending = list(names)
+    running = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            while pending or running:
+                for name in [name for name in pending if all(i in values for i in STAGES[name].inputs)]:
+                    pending.remove(name)
+                    running[executor.submit(call, STAGES[name])] = name
+                if not running:
+                    raise ValueError(f"stages {', '.join(pending)} read stages that are not scheduled")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    values[name], artifacts[name] = future.result()
+    except BaseException:
+        # the executor has waited for the stages still running; drop what they and the finished ones staged
+        finished = [future.result()[1] for future in running if not future.cancelled() and future.exception() is None]
+        for batch in list(artifacts.values()) + finished:
+            for artifact in batch:
+                artifact.discard()
+        raise
+    return values, artifacts
+
+
+class BuildStats:
+    """
+    Opt-in per-stage instrumentation (--profile): wall time, CPU time,
+    tracemalloc peak and live object count for each stage, plus any counters
+    the stage records (seasons, matches, files, output bytes).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        record = {"stage": name}
+        if not self.enabled:
+            yield record
+            return
+        tracemalloc.start()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.process_time() - cpu, 6)
+            record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            record["objects"] = len(gc.get_objects())
+            self.stages.append(record)
+
+    def write(self, path: str) -> None:
+        write_if_changed(path, serialize({
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "stages": self.stages,
+            "total": {
+                "wall_s": round(sum(stage["wall_s"] for stage in self.stages), 6),
+                "cpu_s": round(sum(stage["cpu_s"] for stage in self.stages), 6),
+                "peak_bytes": max((stage["peak_bytes"] for stage in self.stages), default=0),
+            },
+        }))
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Generate barca_ucl_data.json")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and rebuild every season")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes used to build stale seasons, and threads used to run independent "
+                             "output stages (0 = one per CPU; default: 1)")
+    parser.add_argument("--seasons-dir", default=SEASONS_DIR, help="directory of season definition files")
+    parser.add_argument("--out-dir", default=DATA_DIR, help="directory the published files are written to")
+    parser.add_argument("--cache-file", default=CACHE_PATH, help="build cache location")
+    parser.add_argument("--profile", action="store_true", help="record per-stage timings and memory to --stats-file")
+    parser.add_argument("--stats-file", default=STATS_PATH, help="where --profile writes build stats")
+    parser.add_argument("--cprofile", metavar="PATH", help="also dump cProfile stats of the build to PATH")
+    parser.add_argument("--target", action="append", metavar="NAME",
+                        help="only build this stage or published file (e.g. index.json, players, barca_ucl.sqlite) "
+                             "and what it depends on; may be repeated")
+    parser.add_argument("--strict", action="store_true",
+                        help="fail instead of warning when a season source breaks a consistency check")
+    parser.add_argument("--watch", action="store_true", help="rebuild whenever a season definition file changes")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="--watch polling interval in seconds")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="--watch waits until files have been quiet this many seconds before rebuilding")
+    args = parser.parse_args(argv)
+    for target in args.target or ():
+        try:
+            resolve_target(target)
+        except KeyError as e:
+            parser.error(e.args[0])
+
+    run_build(args)
+    if args.watch:
+        args.force = False
+        watch(args)
+
+
+def run_build(args: argparse.Namespace) -> None:
+    """One build with the --profile/--cprofile instrumentation requested in args"""
+    stats = BuildStats(args.profile)
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    try:
+        build(args, stats)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+        if stats.enabled:
+            stats.write(args.stats_file)
+
+
+def snapshot_sources(directory: str) -> dict:
+    """{file name: (mtime_ns, size)} for every season definition file"""
+    snapshot = {}
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".json"):
+            stat = entry.stat()
+            snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def watch(args: argparse.Namespace) -> None:
+    """
+    Poll the season directory and rebuild once a burst of edits has been
+    quiet for --debounce seconds. Each rebuild only re-derives the changed
+    seasons (everything else comes from the build cache), and every output
+    file is swapped into place atomically, so readers never see a partial file.
+    A build that fails on a bad edit (e.g. half-saved JSON) is reported and
+    watching goes on.
+    """
+    seen = snapshot_sources(args.seasons_dir)
+    print(f"👀 Watching {args.seasons_dir} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.poll_interval)
+            seen = watch_step(args, seen)
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+
+
+def watch_step(args: argparse.Namespace, seen: dict) -> dict:
+    """One poll of --watch: rebuild if the sources changed since `seen`; returns the new snapshot"""
+    current = snapshot_sources(args.seasons_dir)
+    if current == seen:
+        return seen
+    while True:
+        time.sleep(args.debounce)
+        settled = snapshot_sources(args.seasons_dir)
+        if settled == current:
+            break
+        current = settled
+    changed = sorted(name for name in seen.keys() | current.keys() if seen.get(name) != current.get(name))
+    print(f"🔄 Changed: {', '.join(changed)}")
+    start = time.perf_counter()
+    try:
+        run_build(args)
+    except Exception as e:  # any bad edit: keep the session alive for the next save
+        print(f"❌ Build failed, keeping the previous output: {type(e).__name__}: {e}")
+        return current
+    print(f"   Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return current
+
+
+def build(args: argparse.Namespace, stats: BuildStats) -> None:
+    workers = args.workers or os.cpu_count() or 1
+    data_dir = args.out_dir
+
+    with stats.stage("season_construction") as record:
+        cache = {} if args.force else load_build_cache(args.cache_file)
+        metric_hash = metric_code_hash()
+        registry = SeasonRegistry(args.seasons_dir)
+        seasons, totals, comparison, entries, rebuilt_ids = build_seasons_incremental(
+            list(registry), cache, metric_hash, workers
+        )
+        record.update(seasons=len(seasons), rebuilt=len(rebuilt_ids), matches=sum(totals["matches_played"]))
+
+    with stats.stage("validation") as record:
+        violations = [message for season in seasons for message in entries[season.id]["violations"]]
+        for message in violations:
+            print(f"⚠️  {message}")
+        record.update(violations=len(violations))
+    if violations and args.strict:
+        raise ValueError(f"{len(violations)} consistency violation(s) in {args.seasons_dir}")
+
+    # rebuilt seasons keep their last published shard records (for etags.json)
+    # until the shards stage next runs; without "shard_code" they get re-staged then
+    for season_id in rebuilt_ids:
+        previous_entry = cache.get("seasons", {}).get(season_id, {})
+        if "artifacts" in previous_entry:
+            entries[season_id]["artifacts"] = previous_entry["artifacts"]
+
+    seasons_fingerprint = content_hash([metric_hash, [[season.id, entries[season.id]["source_hash"]] for season in seasons]])
+    fingerprints = stage_fingerprints(seasons_fingerprint)
+    previous = cache.get("stages", {})
+    targets = [resolve_target(target) for target in args.target] if args.target else list(STAGES)
+    planned = plan_stages(targets, fingerprints, previous, data_dir)
+    if not planned and not rebuilt_ids:
+        print(f"✅ {data_dir} is up to date")
+        return
+
+    for output in (SHARD_DIR_NAME, PATCH_DIR_NAME):
+        os.makedirs(os.path.join(data_dir, output), exist_ok=True)
+    inputs = BuildInputs(seasons, totals, comparison, entries, data_dir, previous)
+    values, staged = run_stages(planned, inputs, workers, stats)
+
+    with stats.stage("write") as record:
+        rewritten, stage_records = [], {}
+        for name in planned:
+            records, changed = commit_artifacts(staged[name], data_dir)
+            rewritten += changed
+            stage_records[name] = {
+                "fingerprint": fingerprints[name],
+                # patches are tracked as a directory below, since older ones get pruned
+                "artifacts": {n: r for n, r in records.items() if not n.startswith(f"{PATCH_DIR_NAME}/")},
+            }
+            if STAGES[name].keeps_state:
+                stage_records[name]["state"] = values[name]
+            if name == "shards":
+                for season in seasons:
+                    prefix = f"{SHARD_DIR_NAME}/{season.id}."
+                    entries[season.id]["artifacts"] = {n: r for n, r in records.items() if n.startswith(prefix)}
+        if "shards" in planned:
+            remove_stale_shards(seasons, data_dir)
+        if "dataset" in planned:
+            prune_patches(data_dir, values["dataset"]["version"])
+        stages = {name: stage_records.get(name, previous.get(name)) for name in STAGES}
+        stages = {name: stage for name, stage in stages.items() if stage is not None}
+
+        artifacts = file_records(os.path.join(data_dir, PATCH_DIR_NAME), data_dir)
+        for stage in stages.values():
+            artifacts.update(stage["artifacts"])
+        for entry in entries.values():
+            artifacts.update(entry.get("artifacts", {}))
+
+        outputs = {name: record["sha256"] for name, record in sorted(artifacts.items())}
+        write_if_changed(os.path.join(data_dir, ETAGS_NAME), serialize({name: f'"{digest}"' for name, digest in outputs.items()}))
+        write_if_changed(args.cache_file, json.dumps({
+            "metric_hash": metric_hash,
+            "stages": stages,
+            "seasons": entries,
+        }, ensure_ascii=False, default=to_json).encode("utf-8"))
+        record.update(rewritten=len(rewritten))
+
+    print(f"✅ Generated {data_dir} ({len(rewritten)} files rewritten)")
+    print(f"   Seasons: {len(seasons)} ({len(rebuilt_ids)} rebuilt)")
+    print(f"   Stages: {len(planned)} of {len(STAGES)} run ({', '.join(planned) or 'none'})")
+    print(f"   Total matches: {sum(totals['matches_played'])}")
+    print(f"   Total goals: {sum(totals['goals_scored'])}")
+
 
-    output_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "public", "data", "barca_ucl_data.json")
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+def serialize(value: Any) -> bytes:
+    return json.dumps(value, indent=2, ensure_ascii=False, default=to_json).encode("utf-8")
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
 
-    print(f"✅ Generated {output_path}")
-    print(f"   Seasons: {len(seasons)}")
-    print(f"   Total matches: {sum(s['matches_played'] for s in seasons)}")
-    print(f"   Total goals: {sum(s['goals_scored'] for s in seasons)}")
+def _file_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Raw export ingestion
+====================
+Maps raw match exports (CSV, JSON or JSON Lines dumps from UEFA.com,
+Wikipedia or FBref) into the match schema of data/seasons/<id>.json.
+
+Exports are read concurrently — at most --concurrency files at a time,
+each parsed record by record on a worker thread — and merged in file name
+order, so the result does not depend on which file finished first. CSV,
+JSON Lines and JSON arrays of records are streamed; a JSON export shaped
+like a season file (an object with "matches") is loaded whole.
+Matches are deduplicated by (date, opponent): values already in a season
+file win, and a duplicate only fills in stats that are still null and
+scorer lists that are still empty (e.g. possession from an FBref dump). Conflicting values are reported.
+
+Column names are matched loosely (see FIELD_ALIASES); the season comes
+from a "season" column or, failing that, from the match date (UEFA
+seasons run July to June). Seasons need an existing definition file.
+
+Usage:
+    python3 scripts/ingest_raw.py data/raw/
+    python3 scripts/ingest_raw.py exports/*.csv --concurrency 16 --dry-run
+"""
+
+import argparse
+import asyncio
+import csv
+import datetime
+import glob
+import json
+import os
+import sys
+from typing import Any, Iterator, Optional
+
+import generate_data as gd
+
+EXPORT_EXTENSIONS = (".csv", ".json", ".jsonl")
+
+# schema field -> column names accepted in raw exports (compared case-insensitively)
+FIELD_ALIASES = {
+    "season": ("season", "season_id"),
+    "date": ("date", "match_date", "kickoff"),
+    "opponent": ("opponent", "opponent_name", "against"),
+    "home_away": ("home_away", "venue", "ground"),
+    "score": ("score", "result"),
+    "goals_scored": ("goals_scored", "goals_for", "gf"),
+    "goals_conceded": ("goals_conceded", "goals_against", "ga"),
+    "stage": ("stage", "round"),
+    "scorers": ("scorers", "goalscorers"),
+    "possession": ("possession", "poss"),
+    "shots": ("shots", "sh"),
+    "shots_on_target": ("shots_on_target", "sot"),
+    "extra_time": ("extra_time", "aet"),
+}
+MISSING = (None, [])  # field values an export may fill in
+VENUES = {"h": "H", "home": "H", "a": "A", "away": "A", "n": "N", "neutral": "N"}
+
+
+class RecordError(ValueError):
+    pass
+
+
+def iter_export(path: str) -> Iterator[tuple]:
+    """(line, raw record) pairs from one export, read incrementally where the format allows"""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line_num, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_num, json.loads(line)
+    else:
+        with open(path, encoding="utf-8") as f:
+            head = f.read(1)
+            while head.isspace():
+                head = f.read(1)
+            if head == "[":
+                yield from enumerate(iter_json_array(f), 1)
+                return
+            # a season-shaped object: one season file, small enough to load whole
+            data = json.loads(head + f.read())
+        records = data.get("matches", []) if isinstance(data, dict) else data
+        season = data.get("id") if isinstance(data, dict) else None
+        for n, record in enumerate(records, 1):
+            yield n, dict(record, season=record.get("season", season)) if season else record
+
+
+def iter_json_array(f: Any, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Items of a JSON array whose opening "[" has been read from f, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    buffer, eof = "", False
+    expect_item = True
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer and not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = chunk
+            continue
+        if not buffer:
+            raise ValueError("unterminated JSON array")
+        if buffer[0] == "]":
+            return
+        if not expect_item:
+            if buffer[0] != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, found {buffer[0]!r}")
+            buffer, expect_item = buffer[1:], True
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        if end is None or (not eof and buffer[end:].lstrip()[:1] not in (",", "]")):
+            # incomplete, or possibly cut short (e.g. "-1." of "-1.5e3" split across chunks): read more first
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield item
+        buffer, expect_item = buffer[end:], False
+
+
+def _pick(record: dict, field: str) -> Any:
+    keys = {key.strip().lower(): value for key, value in record.items() if key}
+    for alias in FIELD_ALIASES[field]:
+        value = keys.get(alias)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _int(value: Any, field: str) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        number = float(str(value).strip().rstrip("%"))
+    except ValueError:
+        raise RecordError(f"{field} {value!r} is not a number") from None
+    if not number.is_integer():
+        raise RecordError(f"{field} {value!r} is not a whole number")
+    return int(number)
+
+
+def season_for(date: str) -> str:
+    """UEFA season id ("2008-09") for an ISO date"""
+    year, month = int(date[:4]), int(date[5:7])
+    start = year if month >= 7 else year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def normalize(record: dict) -> tuple:
+    """(season id, Match) for one raw record; raises RecordError if it cannot be mapped"""
+    if not isinstance(record, dict):
+        raise RecordError(f"expected an object, found {type(record).__name__} {record!r}")
+    date = str(_pick(record, "date") or "")[:10]
+    try:
+        datetime.date.fromisoformat(date)
+    except ValueError:
+        raise RecordError(f"missing or non-ISO date {date!r}") from None
+    opponent = _pick(record, "opponent")
+    if not opponent:
+        raise RecordError("missing opponent")
+    venue = VENUES.get(str(_pick(record, "home_away") or "").strip().lower())
+    if venue is None:
+        raise RecordError(f"unknown venue {_pick(record, 'home_away')!r}")
+    stage = _pick(record, "stage")
+    if not stage:
+        raise RecordError("missing stage")
+
+    scored, conceded = _int(_pick(record, "goals_scored"), "goals_scored"), _int(_pick(record, "goals_conceded"), "goals_conceded")
+    score = _pick(record, "score")
+    if scored is None or conceded is None:
+        if score is None:
+            raise RecordError("needs goals_scored/goals_conceded or a score")
+        left, _, right = str(score).partition("-")
+        scored, conceded = _int(left.split()[-1] if left.split() else "", "score"), _int(right.split()[0] if right.split() else "", "score")
+    scorers = _pick(record, "scorers") or []
+    if isinstance(scorers, str):
+        scorers = [name.strip() for name in scorers.split(";") if name.strip()]
+    extra_time = _pick(record, "extra_time")
+    if isinstance(extra_time, str):
+        extra_time = extra_time.strip().lower() in ("1", "true", "yes", "y", "aet")
+
+    match = gd.Match(
+        date=date,
+        opponent=str(opponent).strip(),
+        home_away=venue,
+        score=f"{scored}-{conceded}",
+        goals_scored=scored,
+        goals_conceded=conceded,
+        stage=str(stage).strip(),
+        scorers=list(scorers),
+        possession=_int(_pick(record, "possession"), "possession"),
+        shots=_int(_pick(record, "shots"), "shots"),
+        shots_on_target=_int(_pick(record, "shots_on_target"), "shots_on_target"),
+        extra_time=True if extra_time else None,
+    )
+    return str(_pick(record, "season") or season_for(date)), match
+
+
+def parse_export(path: str) -> tuple:
+    """Worker-thread body: ([(season id, Match)], [error messages]) for one export"""
+    matches, errors = [], []
+    try:
+        for line, record in iter_export(path):
+            try:
+                matches.append(normalize(record))
+            except RecordError as e:
+                errors.append(f"{path}:{line}: {e}")
+    except (OSError, ValueError) as e:
+        errors.append(f"{path}: {e}")
+    return matches, errors
+
+
+async def read_exports(paths: list, concurrency: int) -> list:
+    """Parse every export with at most `concurrency` in flight; results come back in path order"""
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(concurrency)
+
+    async def read(path: str) -> tuple:
+        async with limit:
+            return await loop.run_in_executor(None, parse_export, path)
+
+    return await asyncio.gather(*(read(path) for path in paths))
+
+
+def merge_matches(existing: list, incoming: list) -> tuple:
+    """
+    Merge incoming Match records into a season's match dicts, keyed by
+    (date, opponent). Null stats and empty scorer lists are filled in;
+    values present on both sides that differ are conflicts. Returns
+    (matches sorted by date, added, filled, conflicts).
+    """
+    merged = {(m["date"], m["opponent"]): dict(m) for m in existing}
+    added = filled = 0
+    conflicts = []
+    for match in incoming:
+        key = (match.date, match.opponent)
+        current = merged.get(key)
+        if current is None:
+            merged[key] = match.to_dict()
+            added += 1
+            continue
+        for field, value in match.to_dict().items():
+            if value in MISSING or current.get(field) == value:
+                continue
+            if current.get(field) in MISSING:
+                current[field] = value
+                filled += 1
+            else:
+                conflicts.append(f"{key[0]} {key[1]}: {field} {current.get(field)!r} kept, export has {value!r}")
+    return sorted(merged.values(), key=lambda m: m["date"]), added, filled, conflicts
+
+
+def expand(paths: list) -> list:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += [os.path.join(path, name) for name in os.listdir(path) if name.endswith(EXPORT_EXTENSIONS)]
+        else:
+            files += glob.glob(path) or [path]
+    return sorted(set(files))
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest raw match exports into data/seasons/")
+    parser.add_argument("exports", nargs="+", help="export files, globs or directories (.csv, .jsonl and .json arrays are streamed; "
+                             "season-shaped .json objects are loaded whole)")
+    parser.add_argument("--concurrency", type=int, default=8, help="exports read at once (default: 8)")
+    parser.add_argument("--seasons-dir", default=gd.SEASONS_DIR, help="directory of season definition files")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    paths = expand(args.exports)
+    results = asyncio.run(read_exports(paths, args.concurrency))
+
+    by_season, errors = {}, []
+    for matches, file_errors in results:
+        errors += file_errors
+        for season_id, match in matches:
+            by_season.setdefault(season_id, []).append(match)
+    registry = gd.SeasonRegistry(args.seasons_dir)
+    known = set(registry.ids())
+    for season_id in sorted(set(by_season) - known):
+        errors.append(f"{len(by_season.pop(season_id))} match(es) for {season_id}, which has no definition in {args.seasons_dir}")
+
+    total = sum(len(matches) for matches, _ in results)
+    print(f"📥 Read {total} records from {len(paths)} exports")
+    for season_id, incoming in sorted(by_season.items()):
+        source = registry.get(season_id)
+        data = json.loads(source.raw)
+        data["matches"], added, filled, conflicts = merge_matches(data["matches"], incoming)
+        for conflict in conflicts:
+            print(f"   ⚠️  {season_id} {conflict}")
+        changed = bool(added or filled)
+        if changed and not args.dry_run:
+            gd.write_if_changed(source.path, (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+        print(f"   {season_id}: {len(incoming)} records, {added} new matches, {filled} values filled"
+              f"{' (dry run)' if changed and args.dry_run else ''}")
+    for error in errors:
+        print(f"❌ {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
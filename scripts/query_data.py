@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Query the published dataset
+===========================
+Runs a small pipeline language over the per-season shards in public/data/,
+streaming seasons → matches → scorers one season at a time and stopping as
+soon as a limit is reached. Equality filters on stage, opponent or
+player_id and comparisons on date are answered from indexes.json when it
+is present, so only the seasons holding matching rows are read.
+
+A query is a row source followed by "|"-separated stages:
+
+    seasons | matches | scorers         row source
+    where FIELD OP VALUE [and ...]       OP: = != < <= > >= ~ (~ = contains, any case)
+    select FIELD[, FIELD ...]            keep only these fields
+    limit N                              stop after N rows
+    count | sum F | avg F | min F | max F
+    group FIELD [count | sum F | avg F | min F | max F]
+
+Aggregates end the pipeline. VALUE is a number, null, or a (quoted) string.
+Rows are printed as JSON lines, aggregates as JSON.
+
+Usage:
+    python3 scripts/query_data.py "scorers | where stage = Semi-final and home_away = A | group player"
+    python3 scripts/query_data.py "matches | where opponent = Chelsea | select season, date, score"
+    python3 scripts/query_data.py "matches | where date >= 2009-01-01 and date < 2010-01-01 | count"
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import operator
+import os
+import shlex
+import sys
+from typing import Any, Callable, Iterator, Optional
+
+import generate_data as gd
+
+SOURCES = ("seasons", "matches", "scorers")
+AGGREGATES = ("count", "sum", "avg", "min", "max")
+MATCH_FIELDS = (
+    "date", "opponent", "home_away", "score", "goals_scored", "goals_conceded",
+    "stage", "possession", "shots", "shots_on_target",
+)
+OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "~": lambda value, needle: needle.casefold() in str(value).casefold(),
+}
+
+
+class QueryError(ValueError):
+    pass
+
+
+class Query:
+    """A parsed query: source, where conditions, projection, limit and optional aggregate"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.conditions = []  # (field, op, value)
+        self.fields = None
+        self.limit = None
+        self.aggregate = None  # (function, field or None, group field or None)
+
+    @classmethod
+    def parse(cls, text: str) -> "Query":
+        stages = [shlex.split(stage) for stage in text.split("|")]
+        if not stages[0] or stages[0][0] not in SOURCES or len(stages[0]) > 1:
+            raise QueryError(f"a query starts with one of: {', '.join(SOURCES)}")
+        query = cls(stages[0][0])
+        for tokens in stages[1:]:
+            if not tokens:
+                raise QueryError("empty stage")
+            if query.aggregate:
+                raise QueryError(f"nothing can follow an aggregate ({' '.join(tokens)})")
+            query._parse_stage(tokens[0], tokens[1:])
+        return query
+
+    def _parse_stage(self, keyword: str, args: list) -> None:
+        if keyword == "where":
+            self.conditions += _parse_conditions(args)
+        elif keyword == "select":
+            fields = [field for arg in args for field in arg.split(",") if field]
+            if not fields:
+                raise QueryError("select needs at least one field")
+            self.fields = fields
+        elif keyword == "limit":
+            if len(args) != 1 or not args[0].isdigit():
+                raise QueryError("limit takes one non-negative integer")
+            self.limit = int(args[0]) if self.limit is None else min(self.limit, int(args[0]))
+        elif keyword in AGGREGATES:
+            self.aggregate = (keyword,) + _aggregate_field(keyword, args) + (None,)
+        elif keyword == "group":
+            if not args:
+                raise QueryError("group needs a field")
+            function, field = (args[1], args[2:]) if len(args) > 1 else ("count", [])
+            if function not in AGGREGATES:
+                raise QueryError(f"unknown aggregate {function!r}")
+            self.aggregate = (function,) + _aggregate_field(function, field) + (args[0],)
+        else:
+            raise QueryError(f"unknown stage {keyword!r}")
+
+
+def _parse_conditions(tokens: list) -> list:
+    conditions = []
+    for chunk in _split_on_and(tokens):
+        if len(chunk) != 3 or chunk[1] not in OPERATORS:
+            raise QueryError(f"bad condition {' '.join(chunk)!r}; expected FIELD OP VALUE")
+        conditions.append((chunk[0], chunk[1], _literal(chunk[2])))
+    return conditions
+
+
+def _split_on_and(tokens: list) -> list:
+    chunks = [[]]
+    for token in tokens:
+        if token.lower() == "and":
+            chunks.append([])
+        else:
+            chunks[-1].append(token)
+    return chunks
+
+
+def _aggregate_field(function: str, args: list) -> tuple:
+    if function == "count":
+        if args:
+            raise QueryError("count takes no field")
+        return (None,)
+    if len(args) != 1:
+        raise QueryError(f"{function} takes one field")
+    return (args[0],)
+
+
+def _literal(text: str) -> Any:
+    if text == "null":
+        return None
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def predicate(field: str, op: str, value: Any) -> Callable[[dict], bool]:
+    compare = OPERATORS[op]
+
+    def test(row: dict) -> bool:
+        actual = row.get(field)
+        if value is None or actual is None:
+            return compare(actual, value) if op in ("=", "!=") else False
+        if op != "~" and isinstance(actual, str) != isinstance(value, str):
+            return False
+        return compare(actual, value)
+
+    return test
+
+
+class Dataset:
+    """Lazily loaded shards plus, when present, the precomputed match indexes"""
+
+    def __init__(self, data_dir: str, use_indexes: bool = True):
+        self.data_dir = data_dir
+        with open(os.path.join(data_dir, gd.INDEX_NAME), encoding="utf-8") as f:
+            self.index = json.load(f)["seasons"]
+        indexes_path = os.path.join(data_dir, gd.MATCH_INDEXES_NAME)
+        self.indexes = None
+        if use_indexes and os.path.exists(indexes_path):
+            with open(indexes_path, encoding="utf-8") as f:
+                self.indexes = json.load(f)
+        self._players = None
+        self._loaded = (None, None)
+
+    def season(self, position: int) -> gd.Season:
+        """Season record for an index position; only the most recent one is kept in memory"""
+        if self._loaded[0] != position:
+            with open(os.path.join(self.data_dir, self.index[position]["shard"]), encoding="utf-8") as f:
+                self._loaded = (position, gd.Season.from_dict(json.load(f)))
+        return self._loaded[1]
+
+    def everyone(self) -> gd.PlayerRegistry:
+        """Registry of every player's full name, for resolving scorer surnames across seasons"""
+        if self._players is None:
+            self._players = gd.PlayerRegistry()
+            with open(os.path.join(self.data_dir, gd.PLAYERS_NAME), encoding="utf-8") as f:
+                for player in json.load(f)["players"]:
+                    self._players.register(player["name"])
+        return self._players
+
+    def candidate_refs(self, source: str, conditions: list) -> Optional[list]:
+        """
+        (season, match) refs that can satisfy the indexable conditions, in
+        dataset order, or None when nothing can be looked up.
+        """
+        if self.indexes is None or source == "seasons":
+            return None
+        candidates = None
+        for field, op, value in conditions:
+            refs = self._lookup(source, field, op, value)
+            if refs is not None:
+                refs = {tuple(ref) for ref in refs}
+                candidates = refs if candidates is None else candidates & refs
+        return None if candidates is None else sorted(candidates)
+
+    def _lookup(self, source: str, field: str, op: str, value: Any) -> Optional[list]:
+        if op == "=" and field in ("stage", "opponent"):
+            return self.indexes[f"by_{field}"].get(value, [])
+        if op == "=" and field == "player_id" and source == "scorers":
+            return self.indexes["by_scorer"].get(value, [])
+        if field == "date" and op in ("=", "<", "<=", ">", ">=") and isinstance(value, str):
+            dates, refs = self.indexes["by_date"]["dates"], self.indexes["by_date"]["refs"]
+            lo = bisect.bisect_left(dates, value) if op in ("=", ">=") else bisect.bisect_right(dates, value) if op == ">" else 0
+            hi = bisect.bisect_right(dates, value) if op in ("=", "<=") else bisect.bisect_left(dates, value) if op == "<" else len(dates)
+            return refs[lo:hi]
+        return None
+
+
+def season_row(season: gd.Season) -> dict:
+    row = {"season": season.id}
+    row.update((field, getattr(season, field)) for field in gd.SEASON_HEADER_FIELDS[1:] + gd.SEASON_TOTAL_FIELDS)
+    return row
+
+
+def match_row(season: gd.Season, m: int) -> dict:
+    match = season.matches[m]
+    row = {"season": season.id, "match": m}
+    row.update((field, getattr(match, field)) for field in MATCH_FIELDS)
+    row["extra_time"] = bool(match.extra_time)
+    row["result"] = "W" if match.goals_scored > match.goals_conceded else "D" if match.goals_scored == match.goals_conceded else "L"
+    return row
+
+
+def scorer_rows(dataset: Dataset, season: gd.Season, m: int, local: gd.PlayerRegistry) -> Iterator[dict]:
+    base = match_row(season, m)
+    for entry in season.matches[m].scorers:
+        name, own_goal = gd.parse_scorer(entry)
+        pid = None if own_goal else local.resolve(name) or dataset.everyone().resolve(name) or gd.player_id(name)
+        yield dict(base, player=name, player_id=pid, own_goal=own_goal)
+
+
+def iter_rows(dataset: Dataset, query: Query) -> Iterator[dict]:
+    """Rows of the query's source, narrowed through the indexes where possible"""
+    if query.source == "seasons":
+        for position in range(len(dataset.index)):
+            yield season_row(dataset.season(position))
+        return
+    refs = dataset.candidate_refs(query.source, query.conditions)
+    if refs is None:
+        refs = ((s, m) for s in range(len(dataset.index)) for m in range(len(dataset.season(s).matches)))
+    local_for = None
+    for s, m in refs:
+        season = dataset.season(s)
+        if query.source == "matches":
+            yield match_row(season, m)
+            continue
+        if local_for is None or local_for[0] != s:
+            local_for = (s, gd.PlayerRegistry.from_sources([season]))
+        yield from scorer_rows(dataset, season, m, local_for[1])
+
+
+def run(dataset: Dataset, query: Query) -> Any:
+    """Rows (an iterator) or an aggregate value"""
+    tests = [predicate(*condition) for condition in query.conditions]
+    rows = (row for row in iter_rows(dataset, query) if all(test(row) for test in tests))
+    if query.limit is not None:
+        rows = itertools.islice(rows, query.limit)
+    if query.fields:
+        rows = ({field: row.get(field) for field in query.fields} for row in rows)
+    if not query.aggregate:
+        return rows
+    function, field, group = query.aggregate
+    if group is None:
+        return _finish(function, _fold(function, field, rows, _start(function)))
+    groups = {}
+    for row in rows:
+        key = row.get(group)
+        groups[key] = _fold(function, field, (row,), groups.get(key, _start(function)))
+    name = function if field is None else f"{function}_{field}"
+    results = [{group: key, name: _finish(function, state)} for key, state in groups.items()]
+    results.sort(key=lambda r: (r[name] is not None, r[name] or 0), reverse=True)
+    return results
+
+
+def _start(function: str) -> list:
+    return [0, 0] if function in ("count", "sum", "avg") else [None]
+
+
+def _fold(function: str, field: Optional[str], rows: Iterator, state: list) -> list:
+    """Streaming aggregate update; nulls are skipped"""
+    for row in rows:
+        if function == "count":
+            state[0] += 1
+            continue
+        value = row.get(field)
+        if value is None:
+            continue
+        if function in ("sum", "avg"):
+            state[0] += value
+            state[1] += 1
+        elif state[0] is None or (value < state[0] if function == "min" else value > state[0]):
+            state[0] = value
+    return state
+
+
+def _finish(function: str, state: list) -> Any:
+    if function == "avg":
+        return round(state[0] / state[1], 3) if state[1] else None
+    return state[0]
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the published Barça UCL dataset")
+    parser.add_argument("query", help="e.g. \"matches | where stage = Final | select season, score\"")
+    parser.add_argument("--data-dir", default=gd.DATA_DIR, help="published data directory (default: public/data)")
+    parser.add_argument("--no-indexes", action="store_true", help="scan every season instead of using indexes.json")
+    parser.add_argument("--explain", action="store_true", help="print which rows are read to stderr")
+    args = parser.parse_args(argv)
+
+    try:
+        query = Query.parse(args.query)
+    except (QueryError, ValueError) as e:
+        parser.error(str(e))
+    dataset = Dataset(args.data_dir, use_indexes=not args.no_indexes)
+    if args.explain:
+        refs = dataset.candidate_refs(query.source, query.conditions)
+        plan = "full scan" if refs is None else f"{len(refs)} indexed matches in {len({s for s, _ in refs})} seasons"
+        print(f"plan: {query.source} from {plan}", file=sys.stderr)
+
+    result = run(dataset, query)
+    if query.aggregate:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        for row in result:
+            print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
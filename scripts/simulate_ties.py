@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Knockout tie simulator
+======================
+Monte Carlo estimate of how likely each knockout tie, and each whole
+knockout campaign, was to be won given the matches actually played.
+
+Scoring model: goals in a match are Poisson. Barça's expected goals for
+(against) are the season's goals-per-match scored (conceded), times a
+venue factor fitted over every match, times a factor for the opponent.
+Both factors are shrunk towards 1 by PRIOR_GOALS pseudo-goals, because
+most opponents were met only once or twice.
+
+A tie is decided on aggregate, then away goals (two-legged ties), then
+extra time at the last leg's venue (a third of a match), then a coin-flip
+shoot-out. Draws come in fixed-size chunks, each with its own seed derived
+from --seed, so results are reproducible for any --workers. With NumPy
+installed each chunk is simulated as arrays of draws; without it, draw by
+draw with the stdlib random module. The two use different generators, so
+their estimates agree only to Monte Carlo error; the output records which
+engine ran.
+
+Usage:
+    python3 scripts/simulate_ties.py
+    python3 scripts/simulate_ties.py --draws 1000000 --workers 0 --seed 7
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import generate_data as gd
+
+try:
+    import numpy as np
+except ImportError:  # optional: chunks are simulated draw by draw instead
+    np = None
+
+OUT_PATH = os.path.join(gd.ROOT_DIR, ".cache", "simulate", "ties.json")
+PRIOR_GOALS = 2.0  # pseudo-goals at the average rate added to every fitted factor
+CHUNK_DRAWS = 50_000
+EXTRA_TIME = 1 / 3  # extra time as a fraction of a match
+POISSON_TAIL = 1e-12
+
+
+def _factor(actual: float, expected: float) -> float:
+    return (actual + PRIOR_GOALS) / (expected + PRIOR_GOALS)
+
+
+def fit_model(seasons: list) -> dict:
+    """
+    Fit the scoring model. Returns per-season base rates, venue factors
+    keyed by home_away code and opponent factors, each as a
+    [for, against] pair.
+    """
+    base = {
+        season.id: [season.goals_scored / season.matches_played, season.goals_conceded / season.matches_played]
+        for season in seasons
+    }
+    venue_sums, opponent_sums = {}, {}
+    for season in seasons:
+        expected_for, expected_against = base[season.id]
+        for match in season.matches:
+            for sums, key in ((venue_sums, match.home_away), (opponent_sums, match.opponent)):
+                totals = sums.setdefault(key, [0, 0.0, 0, 0.0])
+                totals[0] += match.goals_scored
+                totals[1] += expected_for
+                totals[2] += match.goals_conceded
+                totals[3] += expected_against
+
+    def factors(sums: dict) -> dict:
+        return {
+            key: [_factor(scored, exp_for), _factor(conceded, exp_against)]
+            for key, (scored, exp_for, conceded, exp_against) in sorted(sums.items())
+        }
+
+    return {"base": base, "venue": factors(venue_sums), "opponent": factors(opponent_sums)}
+
+
+def expected_goals(model: dict, season_id: str, match: gd.Match) -> tuple:
+    """(Barça, opponent) expected goals for one match under the model"""
+    base = model["base"][season_id]
+    venue = model["venue"][match.home_away]
+    opponent = model["opponent"][match.opponent]
+    return base[0] * venue[0] * opponent[0], base[1] * venue[1] * opponent[1]
+
+
+def poisson_cdf(rate: float) -> list:
+    """Cumulative Poisson probabilities up to 1 - POISSON_TAIL, for inverse-transform sampling"""
+    term = total = math.exp(-rate)
+    cdf = [total]
+    k = 0
+    while total < 1 - POISSON_TAIL and k < 100:
+        k += 1
+        term *= rate / k
+        total += term
+        cdf.append(total)
+    return cdf
+
+
+def campaign_ties(season: gd.Season) -> list:
+    """(knockout_path entry, legs) for each tie whose matches are in the season's records"""
+    legs = {}
+    for match in season.matches:
+        legs.setdefault((match.opponent, match.stage), []).append(match)
+    return [(tie, legs[tie.opponent, tie.round]) for tie in season.knockout_path if (tie.opponent, tie.round) in legs]
+
+
+def tie_spec(model: dict, season_id: str, legs: list) -> list:
+    """Per-leg (goals-for CDF, goals-against CDF, away) plus the extra-time CDFs of the last leg"""
+    spec = []
+    for leg in legs:
+        rate_for, rate_against = expected_goals(model, season_id, leg)
+        spec.append((poisson_cdf(rate_for), poisson_cdf(rate_against), leg.home_away == "A"))
+    rate_for, rate_against = expected_goals(model, season_id, legs[-1])
+    return [spec, poisson_cdf(rate_for * EXTRA_TIME), poisson_cdf(rate_against * EXTRA_TIME)]
+
+
+def simulate_chunk(task: tuple) -> tuple:
+    """
+    Process-pool worker: simulate `draws` runs of one campaign with its own
+    seed. Returns (wins per tie, campaigns won).
+    """
+    ties, draws, seed = task
+    if np is not None:
+        return _simulate_chunk_numpy(ties, draws, seed)
+    rng = random.Random(seed)
+    draw = rng.random
+    sample = bisect.bisect_left
+    wins = [0] * len(ties)
+    campaigns = 0
+    for _ in range(draws):
+        all_won = True
+        for t, (legs, et_for, et_against) in enumerate(ties):
+            scored = conceded = away_scored = away_conceded = 0
+            for cdf_for, cdf_against, away in legs:
+                f = sample(cdf_for, draw())
+                a = sample(cdf_against, draw())
+                scored += f
+                conceded += a
+                if away:
+                    away_scored += f
+                else:
+                    away_conceded += a
+            if scored == conceded and len(legs) > 1:
+                scored, conceded = away_scored, away_conceded
+            if scored == conceded:
+                scored, conceded = sample(et_for, draw()), sample(et_against, draw())
+            won = scored > conceded if scored != conceded else draw() < 0.5
+            if won:
+                wins[t] += 1
+            else:
+                all_won = False
+        campaigns += all_won
+    return wins, campaigns
+
+
+def _simulate_chunk_numpy(ties: list, draws: int, seed: str) -> tuple:
+    """simulate_chunk over arrays of `draws` runs; the same rules, one NumPy pass per leg"""
+    rng = np.random.default_rng(int.from_bytes(hashlib.sha256(seed.encode()).digest(), "big"))
+
+    def sample(cdf: list):
+        return np.searchsorted(cdf, rng.random(draws))
+
+    wins = []
+    all_won = np.ones(draws, dtype=bool)
+    for legs, et_for, et_against in ties:
+        scored = conceded = away_scored = away_conceded = 0
+        for cdf_for, cdf_against, away in legs:
+            f = sample(cdf_for)
+            a = sample(cdf_against)
+            scored = scored + f
+            conceded = conceded + a
+            if away:
+                away_scored = away_scored + f
+            else:
+                away_conceded = away_conceded + a
+        if len(legs) > 1:
+            level = scored == conceded
+            scored, conceded = np.where(level, away_scored, scored), np.where(level, away_conceded, conceded)
+        level = scored == conceded
+        scored, conceded = np.where(level, sample(et_for), scored), np.where(level, sample(et_against), conceded)
+        won = np.where(scored != conceded, scored > conceded, rng.random(draws) < 0.5)
+        wins.append(int(won.sum()))
+        all_won &= won
+    return wins, int(all_won.sum())
+
+
+def simulate(seasons: list, draws: int, seed: int, workers: int) -> dict:
+    """Win probabilities per tie and per campaign over `draws` simulated runs of each season"""
+    model = fit_model(seasons)
+    campaigns = [(season, campaign_ties(season)) for season in seasons]
+    tasks, owners = [], []
+    for season, ties in campaigns:
+        specs = [tie_spec(model, season.id, legs) for _, legs in ties]
+        for chunk, start in enumerate(range(0, draws, CHUNK_DRAWS)):
+            tasks.append((specs, min(CHUNK_DRAWS, draws - start), f"{seed}:{season.id}:{chunk}"))
+            owners.append(season.id)
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results = list(executor.map(simulate_chunk, tasks))
+    else:
+        results = [simulate_chunk(task) for task in tasks]
+
+    totals = {season.id: [[0] * len(ties), 0] for season, ties in campaigns}
+    for season_id, (wins, won) in zip(owners, results):
+        total = totals[season_id]
+        total[0] = [a + b for a, b in zip(total[0], wins)]
+        total[1] += won
+
+    return {
+        "draws": draws,
+        "seed": seed,
+        "engine": "python" if np is None else "numpy",
+        "model": {"prior_goals": PRIOR_GOALS, "venue_factors": model["venue"]},
+        "seasons": {
+            season.id: {
+                "campaign_win_probability": round(totals[season.id][1] / draws, 4),
+                "ties": [
+                    {
+                        "round": tie.round,
+                        "opponent": tie.opponent,
+                        "legs": [
+                            dict(zip(("home_away", "expected_for", "expected_against"),
+                                     (leg.home_away,) + tuple(round(x, 3) for x in expected_goals(model, season.id, leg))))
+                            for leg in legs
+                        ],
+                        "win_probability": round(wins / draws, 4),
+                        "actual": gd.tie_outcome(legs),
+                    }
+                    for (tie, legs), wins in zip(ties, totals[season.id][0])
+                ],
+            }
+            for season, ties in campaigns
+        },
+    }
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Monte Carlo knockout tie simulator")
+    parser.add_argument("--draws", type=int, default=100_000, help="simulated runs per campaign (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=1, help="simulation processes; 0 = one per CPU (default: 1)")
+    parser.add_argument("--seasons-dir", default=gd.SEASONS_DIR, help="directory of season definition files")
+    parser.add_argument("--out", default=OUT_PATH, help="where to write the results as JSON")
+    args = parser.parse_args(argv)
+    if args.draws < 1:
+        parser.error("--draws must be positive")
+
+    registry = gd.SeasonRegistry(args.seasons_dir)
+    seasons, _ = gd.build_seasons([source.load() for source in registry])
+    start = time.perf_counter()
+    result = simulate(seasons, args.draws, args.seed, args.workers or os.cpu_count() or 1)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ Simulated {args.draws} runs of {len(seasons)} campaigns in {elapsed:.2f} s with {result['engine']} "
+          f"({args.draws * len(seasons) / elapsed:,.0f} campaigns/s)")
+    for season_id, season in result["seasons"].items():
+        ties = ", ".join(f"{tie['opponent']} {tie['win_probability'] * 100:.0f}%" for tie in season["ties"])
+        print(f"   {season_id}: campaign {season['campaign_win_probability'] * 100:.1f}% ({ties})")
+    print(f"   Full results: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
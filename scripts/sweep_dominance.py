@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Dominance Index sensitivity sweep
+=================================
+Scores every season under a grid of Dominance Index weightings (goal
+difference / win % / clean sheet %, summing to 100) and goal-difference
+caps, then reports the ranking under each combination and how stable each
+season's rank is across the grid.
+
+The three components are computed once per season as columns; each cap
+yields one capped goal-difference column, and every weighting is a single
+weighted sum over the columns, so the sweep never touches season records.
+With NumPy installed the whole cap x weighting grid is one broadcast;
+without it the same sums run as plain Python loops.
+
+Usage:
+    python3 scripts/sweep_dominance.py
+    python3 scripts/sweep_dominance.py --step 5 --caps 1.5 2 2.5 3 --out sweep.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import generate_data as gd
+
+try:
+    import numpy as np
+except ImportError:  # optional: score_grid falls back to pure Python
+    np = None
+
+OUT_PATH = os.path.join(gd.ROOT_DIR, ".cache", "sweep", "dominance.json")
+DEFAULT_CAPS = (1.5, 2.0, 2.5, 3.0, 3.5)
+
+
+def weight_grid(step: int) -> list:
+    """Every (goal difference, win %, clean sheet %) weighting in `step` increments summing to 100"""
+    return [
+        (w_gd, w_win, 100 - w_gd - w_win)
+        for w_gd in range(0, 101, step)
+        for w_win in range(0, 101 - w_gd, step)
+        if (100 - w_gd - w_win) % step == 0
+    ]
+
+
+def dominance_components(totals: dict) -> tuple:
+    """Columns of goal difference per match, win fraction and clean sheet fraction, one entry per season"""
+    played = totals["matches_played"]
+    return (
+        [g / n for g, n in zip(totals["goal_difference"], played)],
+        [w / 100 for w in totals["win_percentage"]],
+        [c / n for c, n in zip(totals["clean_sheets"], played)],
+    )
+
+
+def score_grid(components: tuple, weights: list, caps: list) -> list:
+    """(weights, cap, scores) for every combination; scores are unrounded, one per season"""
+    if np is not None:
+        return _score_grid_numpy(components, weights, caps)
+    gd_per_match, win_fraction, cs_fraction = components
+    results = []
+    for cap in caps:
+        capped = [min(g / cap, 1.0) for g in gd_per_match]
+        for w_gd, w_win, w_cs in weights:
+            scores = [c * w_gd + w * w_win + s * w_cs for c, w, s in zip(capped, win_fraction, cs_fraction)]
+            results.append(((w_gd, w_win, w_cs), cap, scores))
+    return results
+
+
+def _score_grid_numpy(components: tuple, weights: list, caps: list) -> list:
+    """score_grid as one (caps, weightings, seasons) broadcast; same operation order, so the same floats"""
+    gd_per_match, win_fraction, cs_fraction = (np.asarray(column, dtype=float) for column in components)
+    w = np.asarray(weights, dtype=float).reshape(-1, 3)[:, :, np.newaxis]
+    capped = np.minimum(gd_per_match / np.asarray(caps, dtype=float)[:, np.newaxis], 1.0)[:, np.newaxis, :]
+    grid = capped * w[:, 0] + win_fraction * w[:, 1] + cs_fraction * w[:, 2]
+    return [
+        (tuple(combo_weights), cap, scores)
+        for cap, rows in zip(caps, grid.tolist())
+        for combo_weights, scores in zip(weights, rows)
+    ]
+
+
+def ranks(scores: list) -> list:
+    """1-based rank of each season, highest score first; ties keep season order"""
+    order = sorted(range(len(scores)), key=lambda i: -scores[i])
+    ranked = [0] * len(scores)
+    for position, i in enumerate(order, 1):
+        ranked[i] = position
+    return ranked
+
+
+def spearman(a: list, b: list) -> float:
+    n = len(a)
+    if n < 2:
+        return 1.0
+    return 1 - 6 * sum((x - y) ** 2 for x, y in zip(a, b)) / (n * (n * n - 1))
+
+
+def sweep(season_ids: list, totals: dict, weights: list, caps: list) -> dict:
+    components = dominance_components(totals)
+    (_, _, baseline_scores), = score_grid(components, [gd.DOMINANCE_WEIGHTS], [gd.DOMINANCE_GD_CAP])
+    baseline = ranks(baseline_scores)
+
+    combinations, rank_columns, correlations = [], [[] for _ in season_ids], []
+    for combo_weights, cap, scores in score_grid(components, weights, caps):
+        ranked = ranks(scores)
+        for column, rank in zip(rank_columns, ranked):
+            column.append(rank)
+        correlations.append(spearman(ranked, baseline))
+        combinations.append({
+            "weights": list(combo_weights),
+            "gd_cap": cap,
+            "ranking": sorted(range(len(ranked)), key=ranked.__getitem__),
+        })
+
+    n = len(combinations)
+    return {
+        "seasons": season_ids,
+        "baseline": {
+            "weights": list(gd.DOMINANCE_WEIGHTS),
+            "gd_cap": gd.DOMINANCE_GD_CAP,
+            "ranking": sorted(range(len(baseline)), key=baseline.__getitem__),
+        },
+        "combinations": combinations,
+        "stability": {
+            "spearman_vs_baseline": {
+                "mean": round(statistics.fmean(correlations), 4),
+                "min": round(min(correlations), 4),
+            },
+            "identical_to_baseline": round(sum(c == 1.0 for c in correlations) / n, 4),
+            "seasons": {
+                season_id: {
+                    "baseline_rank": baseline[i],
+                    "mean_rank": round(statistics.fmean(column), 3),
+                    "rank_stdev": round(statistics.pstdev(column), 3),
+                    "best_rank": min(column),
+                    "worst_rank": max(column),
+                    "first_share": round(column.count(1) / n, 4),
+                }
+                for i, (season_id, column) in enumerate(zip(season_ids, rank_columns))
+            },
+        },
+    }
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Dominance Index sensitivity sweep")
+    parser.add_argument("--step", type=int, default=10, help="weight grid increment, in points out of 100 (default: 10)")
+    parser.add_argument("--caps", type=float, nargs="+", default=list(DEFAULT_CAPS),
+                        help="goal difference per match caps (default: 1.5 2 2.5 3 3.5)")
+    parser.add_argument("--seasons-dir", default=gd.SEASONS_DIR, help="directory of season definition files")
+    parser.add_argument("--out", default=OUT_PATH, help="where to write the full sweep as JSON")
+    args = parser.parse_args(argv)
+    if not 0 < args.step <= 100 or any(cap <= 0 for cap in args.caps):
+        parser.error("--step must be in 1..100 and --caps must be positive")
+
+    registry = gd.SeasonRegistry(args.seasons_dir)
+    seasons, totals = gd.build_seasons([source.load() for source in registry])
+    weights = weight_grid(args.step)
+
+    start = time.perf_counter()
+    result = sweep([season.id for season in seasons], totals, weights, args.caps)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+
+    stability = result["stability"]
+    print(f"✅ Scored {len(seasons)} seasons under {len(result['combinations'])} combinations in {elapsed * 1000:.1f} ms")
+    print(f"   Spearman vs baseline: mean {stability['spearman_vs_baseline']['mean']}, "
+          f"min {stability['spearman_vs_baseline']['min']}")
+    for season_id, stats in stability["seasons"].items():
+        print(f"   {season_id:<10} baseline #{stats['baseline_rank']}  mean {stats['mean_rank']:.2f} "
+              f"± {stats['rank_stdev']:.2f}  range {stats['best_rank']}-{stats['worst_rank']}  "
+              f"#1 in {stats['first_share'] * 100:.1f}%")
+    print(f"   Full results: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import os
+
+import generate_data as gd
+
+
+def match(date: str, scored: int, conceded: int, possession=None) -> gd.Match:
+    return gd.Match(
+        date=date, opponent="Chelsea", home_away="H", score=f"{scored}-{conceded}", goals_scored=scored,
+        goals_conceded=conceded, stage="Group A", scorers=[], possession=possession,
+    )
+
+
+def test_form_curves_follow_date_order():
+    season = gd.Season(id="2008-09", matches=[
+        match("2008-10-01", 2, 0), match("2008-09-16", 1, 1, possession=60), match("2008-10-01", 0, 3),
+    ])
+    form = gd.compute_form_curves([season], window=2)["seasons"]["2008-09"]
+    assert form["order"] == [1, 0, 2]
+    assert form["cumulative_goals_for"] == [1, 3, 3]
+    assert form["clean_sheet_rate"] == [0.0, 50.0, 33.3]
+    assert form["rolling"]["goals_against"] == [1.0, 0.5, 1.5]
+    assert form["rolling"]["possession"] == [60.0, 60.0, None]
+
+
+def test_prefix_sums_are_ints():
+    # flags summed from a season opening with a clean sheet must not publish as true/false
+    season = gd.Season(id="2008-09", matches=[match("2008-09-16", 1, 0, possession=60), match("2008-10-01", 0, 1)])
+    prefix = gd.compute_form_curves([season])["seasons"]["2008-09"]["prefix"]
+    assert prefix["clean_sheets"] == [0, 1, 1] and prefix["possession_tracked"] == [0, 1, 1]
+    assert all(type(value) is int for values in prefix.values() for value in values)
+
+    sources = [gd.SeasonSource(os.path.join(gd.SEASONS_DIR, name)).load() for name in sorted(os.listdir(gd.SEASONS_DIR))]
+    for form in gd.compute_form_curves(sources)["seasons"].values():
+        assert all(type(value) is int for values in form["prefix"].values() for value in values)
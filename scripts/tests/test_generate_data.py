@@ -0,0 +1,213 @@
+import argparse
+import copy
+import json
+import os
+import shutil
+
+import pytest
+
+import generate_data as gd
+
+
+def leg(home_away: str, scored: int, conceded: int) -> gd.Match:
+    return gd.Match(
+        date="2009-01-01", opponent="Chelsea", home_away=home_away, score=f"{scored}-{conceded}",
+        goals_scored=scored, goals_conceded=conceded, stage="Semi-final", scorers=[],
+    )
+
+
+def test_tie_outcome_away_goals():
+    # 2008-09 semi-final: 0-0 at home, 1-1 at Stamford Bridge
+    assert gd.tie_outcome([leg("H", 0, 0), leg("A", 1, 1)]) == "won"
+    assert gd.tie_outcome([leg("H", 1, 1), leg("A", 2, 2)]) == "won"
+    assert gd.tie_outcome([leg("A", 1, 1), leg("H", 2, 2)]) == "lost"
+
+
+def test_tie_outcome_aggregate_and_level():
+    assert gd.tie_outcome([leg("A", 1, 2), leg("H", 3, 1)]) == "won"
+    assert gd.tie_outcome([leg("H", 1, 1), leg("A", 1, 1)]) is None
+    assert gd.tie_outcome([leg("N", 1, 1)]) is None
+
+
+def season(season_id: str) -> gd.Season:
+    return gd.SeasonSource(os.path.join(gd.SEASONS_DIR, f"{season_id}.json")).load()
+
+
+def test_shared_surname_is_reported_not_dropped():
+    source = season("2008-09")
+    assert list(gd.validate_season(source)) == []
+
+    # a second Messi in the squad makes every "Messi" in the match records ambiguous
+    crowded = source.replace(squad_core=source.squad_core + ["Thiago Messi"])
+    assert any("scorer 'Messi' is shared" in message for message in gd.validate_season(crowded))
+
+    # a curated scorer spelled by surname alone cannot be told apart from Lionel Messi
+    renamed = source.replace(top_scorers=[source.top_scorers[0].replace(name="Messi")] + source.top_scorers[1:])
+    assert "2008-09 top_scorers[0]: 'Messi' is shared by several players" in list(gd.validate_season(renamed))
+    with pytest.raises(ValueError, match="'Messi' is shared"):
+        gd.derive_top_scorers(renamed, 100)
+
+
+
+def test_season_without_final_builds():
+    # an early exit: no final to read scorers from
+    source = season("2010-11").replace(final=None)
+    assert "Lionel Messi" in gd.known_player_names(source)
+    assert list(gd.validate_season(source)) == list(gd.validate_season(season("2010-11")))
+    [entry] = gd.build_entries([source])
+    assert entry["season"].final is None and entry["season"].to_dict()["final"] is None
+
+def apply_patch(document, patch):
+    """Minimal RFC 6902 add/remove/replace, enough to replay json_patch output"""
+    document = copy.deepcopy(document)
+    for op in patch:
+        if op["path"] == "":
+            document = op["value"]
+            continue
+        *parents, last = [t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token) if isinstance(target, list) else token]
+        key = int(last) if isinstance(target, list) else last
+        if op["op"] == "remove":
+            del target[key]
+        elif op["op"] == "add" and isinstance(target, list):
+            target.insert(key, op["value"])
+        else:
+            target[key] = op["value"]
+    return document
+
+
+PATCH_CASES = [
+    ({"a": 1, "b": [1, 2, 3]}, {"a": 1, "b": [1, 2, 3]}),
+    ({"a": 1, "b": [1, 2, 3]}, {"a": 2, "c": None, "b": [1, 2, 3]}),
+    ([1, 2, 3, 4], [1, 2, 9, 3, 4]),
+    ([1, 2, 3, 4], [1, 4]),
+    ([{"x": [1, 2]}, {"x": [3]}], [{"x": [1, 2, 5]}, {"y": "z"}]),
+    ({"a/b": {"~": 1}}, {"a/b": {"~": 2}}),
+    ([True, 1, 1.0], [1, 1.0, True]),
+    ({"flags": [1, {"on": 1}]}, {"flags": [True, {"on": True}]}),
+    ({"a": 1}, [1]),
+]
+
+
+@pytest.mark.parametrize("old, new", PATCH_CASES)
+def test_json_patch_round_trip(old, new):
+    assert gd.same_json(apply_patch(old, gd.json_patch(old, new)), new)
+
+
+def test_json_patch_trims_lists():
+    old = [{"id": i} for i in range(10)]
+    new = old[:4] + [{"id": "new"}] + old[4:]
+    assert gd.json_patch(old, new) == [{"op": "add", "path": "/4", "value": {"id": "new"}}]
+    assert gd.json_patch(old, old[:3] + old[4:]) == [{"op": "remove", "path": "/3"}]
+
+
+def test_same_json_is_type_strict():
+    assert gd.same_json({"a": [1, {"b": None}]}, {"a": [1, {"b": None}]})
+    assert not gd.same_json(True, 1)
+    assert not gd.same_json(1, 1.0)
+    assert not gd.same_json([{"a": 1}], [{"a": True}])
+    assert not gd.same_json({"a": 1}, {"a": 1, "b": 1})
+
+
+def test_version_dataset():
+    previous = {"metadata": {"version": 3}, "seasons": [1, 2]}
+    assert gd.version_dataset(previous, {"metadata": {}, "seasons": [1, 2]}) == (3, None)
+    assert gd.version_dataset(None, {"metadata": {}, "seasons": [1]}) == (1, None)
+    assert gd.version_dataset(None, {"metadata": {}, "seasons": [1]}, last_version=7) == (8, None)
+
+    current = {"metadata": {}, "seasons": [1, 2, 3]}
+    version, patch = gd.version_dataset(previous, current)
+    assert version == 4 and current["metadata"]["version"] == 4
+    assert apply_patch(previous, patch) == current
+
+
+def test_prune_patches_keeps_history_and_foreign_files(tmp_path):
+    patch_dir = tmp_path / gd.PATCH_DIR_NAME
+    patch_dir.mkdir()
+    latest = gd.PATCH_HISTORY + 2
+    for version in range(1, latest + 1):
+        (patch_dir / f"{version}.json").write_text("{}")
+        (patch_dir / f"{version}.min.json.gz").write_text("")
+    (patch_dir / ".DS_Store").write_text("")
+    (patch_dir / "notes.tmp").write_text("")
+    gd.prune_patches(str(tmp_path), latest)
+    left = set(os.listdir(patch_dir))
+    assert {"1.json", "2.min.json.gz"}.isdisjoint(left)
+    assert {"3.json", f"{latest}.min.json.gz", ".DS_Store", "notes.tmp"} <= left
+
+
+def watch_args(tmp_path):
+    seasons_dir = tmp_path / "seasons"
+    shutil.copytree(gd.SEASONS_DIR, seasons_dir)
+    (tmp_path / "out").mkdir()
+    return argparse.Namespace(
+        force=False, workers=1, seasons_dir=str(seasons_dir), out_dir=str(tmp_path / "out"),
+        cache_file=str(tmp_path / "cache.json"), profile=False, stats_file=None, cprofile=None,
+        target=None, strict=False, poll_interval=0, debounce=0,
+    )
+
+
+def edit_season(args, season_id, **changes):
+    path = os.path.join(args.seasons_dir, f"{season_id}.json")
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data.update(changes)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_watch_survives_bad_edits(tmp_path, capsys):
+    args = watch_args(tmp_path)
+    gd.run_build(args)
+    seen = gd.snapshot_sources(args.seasons_dir)
+
+    # an emptied season and one that ended before the final both still build
+    edit_season(args, "2010-11", matches=[])
+    edit_season(args, "2008-09", final=None)
+    seen = gd.watch_step(args, seen)
+    assert "Rebuilt in" in capsys.readouterr().out
+    with open(os.path.join(args.out_dir, "seasons", "2010-11.json"), encoding="utf-8") as f:
+        assert json.load(f)["matches_played"] == 0
+
+    # anything else a save can break is reported, and the next poll carries on
+    with open(os.path.join(args.seasons_dir, "2014-15.json"), "w", encoding="utf-8") as f:
+        f.write('{"id": "2014-15", "matches": [')
+    seen = gd.watch_step(args, seen)
+    assert "Build failed" in capsys.readouterr().out
+    shutil.copy(os.path.join(gd.SEASONS_DIR, "2014-15.json"), args.seasons_dir)
+    edit_season(args, "2005-06", top_scorers=[])
+    seen = gd.watch_step(args, seen)
+    assert "Build failed, keeping the previous output: IndexError" in capsys.readouterr().out
+    assert gd.watch_step(args, seen) == seen
+
+
+def published_version(args):
+    with open(os.path.join(args.out_dir, gd.OUTPUT_NAME), encoding="utf-8") as f:
+        return json.load(f)["metadata"]["version"]
+
+
+def test_dataset_version_survives_missing_document(tmp_path):
+    args = watch_args(tmp_path)
+    gd.run_build(args)
+    edit_season(args, "2010-11", manager="Pep Guardiola (test)")
+    gd.run_build(args)
+    assert published_version(args) == 2 and os.path.exists(gd.patch_path(args.out_dir, 2))
+
+    # same content: the build state still knows version 2
+    os.remove(os.path.join(args.out_dir, gd.OUTPUT_NAME))
+    gd.run_build(args)
+    assert published_version(args) == 2
+
+    # changed content: a new version, with no patch since there is no base document to diff
+    os.remove(os.path.join(args.out_dir, gd.OUTPUT_NAME))
+    edit_season(args, "2010-11", manager="Pep Guardiola")
+    gd.run_build(args)
+    assert published_version(args) == 3 and not os.path.exists(gd.patch_path(args.out_dir, 3))
+
+    # no build state either: patches/ still holds version 2
+    os.remove(os.path.join(args.out_dir, gd.OUTPUT_NAME))
+    os.remove(args.cache_file)
+    gd.run_build(args)
+    assert published_version(args) == 3
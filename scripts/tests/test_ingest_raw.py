@@ -0,0 +1,54 @@
+import io
+import json
+
+import pytest
+
+import ingest_raw
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 16])
+def test_iter_json_array_across_chunks(chunk_size):
+    items = [{"date": "2009-05-27", "score": "2-0", "scorers": ["Eto'o", "Messi"]}, 12345, -1.5e3, "a]b,c", [], None]
+    f = io.StringIO(json.dumps(items, indent=2)[1:])  # iter_export has already read the "["
+    assert list(ingest_raw.iter_json_array(f, chunk_size)) == items
+
+
+@pytest.mark.parametrize("text", ["[", "[1, 2", "[1 2]", "[1,, 2]"])
+def test_iter_json_array_rejects_malformed(text):
+    with pytest.raises(ValueError):
+        list(ingest_raw.iter_json_array(io.StringIO(text[1:]), 2))
+
+
+def test_normalize_maps_loose_columns():
+    season, match = ingest_raw.normalize({"Match_Date": "2009-05-27", "Against": "Manchester United", "Venue": "neutral",
+                                          "Result": "2-0", "Round": "Final", "Goalscorers": "Eto'o; Messi"})
+    assert season == "2008-09"
+    assert (match.home_away, match.goals_scored, match.goals_conceded, match.scorers) == ("N", 2, 0, ["Eto'o", "Messi"])
+
+
+def test_normalize_rejects_non_objects():
+    with pytest.raises(ingest_raw.RecordError, match="expected an object, found int"):
+        ingest_raw.normalize(1)
+
+
+def test_parse_export_reports_non_object_items(tmp_path):
+    path = tmp_path / "export.json"
+    record = {"date": "2009-05-27", "opponent": "Manchester United", "home_away": "N", "score": "2-0", "stage": "Final"}
+    path.write_text(json.dumps([1, record]))
+    matches, errors = ingest_raw.parse_export(str(path))
+    assert [match.opponent for _, match in matches] == ["Manchester United"]
+    assert errors == [f"{path}:1: expected an object, found int 1"]
+
+
+def test_merge_fills_empty_scorers():
+    _, match = ingest_raw.normalize({"date": "2009-05-27", "opponent": "Manchester United", "venue": "N", "score": "2-0",
+                                     "stage": "Final", "scorers": "Eto'o; Messi", "possession": 53, "shots": 11})
+    existing = [match.replace(scorers=[], possession=None, shots=12).to_dict()]
+    merged, added, filled, conflicts = ingest_raw.merge_matches(existing, [match])
+    assert (added, filled) == (0, 2)
+    assert merged[0]["scorers"] == ["Eto'o", "Messi"] and merged[0]["possession"] == 53
+    assert conflicts == ["2009-05-27 Manchester United: shots 12 kept, export has 11"]
+
+    # scorers already listed are kept, and a different list is a conflict
+    _, conflicts = ingest_raw.merge_matches(merged, [match.replace(scorers=["Messi", "Eto'o"])])[2:]
+    assert conflicts[0] == "2009-05-27 Manchester United: scorers [\"Eto'o\", 'Messi'] kept, export has ['Messi', \"Eto'o\"]"
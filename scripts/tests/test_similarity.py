@@ -0,0 +1,42 @@
+import math
+import os
+import random
+
+import generate_data as gd
+
+
+def brute_force(vectors, k):
+    found = []
+    for i, query in enumerate(vectors):
+        distances = [(gd.feature_distance(query, other), j) for j, other in enumerate(vectors) if j != i]
+        found.append([(j, d) for d, j in sorted(x for x in distances if x[0] is not None)[:k]])
+    return found
+
+
+def test_neighbour_index_matches_brute_force():
+    rng = random.Random(7)
+    vectors = [
+        [None if rng.random() < 0.2 else round(rng.gauss(0, 1), 1) for _ in range(4)]
+        for _ in range(300)
+    ]
+    vectors += [[0.5, None, None, None], [None, None, None, None], [0.5, None, None, None]]
+    assert gd.nearest_neighbours(vectors, 5) == brute_force(vectors, 5)
+
+
+def test_feature_distance_scales_to_shared_features():
+    assert gd.feature_distance([0, 0], [3, 4]) == 5
+    assert gd.feature_distance([0, None], [3, 4]) == math.sqrt(9 * 2)
+    assert gd.feature_distance([None, 1], [2, None]) is None
+
+
+def test_similarity_nests_match_neighbours_by_season():
+    sources = [gd.SeasonSource(os.path.join(gd.SEASONS_DIR, name)).load() for name in sorted(os.listdir(gd.SEASONS_DIR))]
+    seasons, totals = gd.build_seasons(sources)
+    comparison = [gd.compute_comparison_row(season, totals, i) for i, season in enumerate(seasons)]
+    similarity = gd.compute_similarity(seasons, comparison)
+    assert [len(matches) for matches in similarity["matches"]] == [len(season.matches) for season in seasons]
+    for s, matches in enumerate(similarity["matches"]):
+        for m, found in enumerate(matches):
+            assert len(found) == gd.SIMILARITY_K and [s, m] not in [ref[:2] for ref in found]
+            assert [ref[2] for ref in found] == sorted(ref[2] for ref in found)
+    assert all(neighbour["season"] != season_id for season_id, found in similarity["seasons"].items() for neighbour in found)
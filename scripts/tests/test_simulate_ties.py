@@ -0,0 +1,28 @@
+import pytest
+
+import generate_data as gd
+import simulate_ties as st
+
+
+@pytest.fixture(scope="module")
+def seasons():
+    return gd.build_seasons([source.load() for source in gd.SeasonRegistry()])[0]
+
+
+def test_results_do_not_depend_on_workers(seasons, monkeypatch):
+    monkeypatch.setattr(st, "CHUNK_DRAWS", 500)
+    assert st.simulate(seasons, 1500, 3, 1) == st.simulate(seasons, 1500, 3, 2)
+
+
+def test_numpy_engine_agrees_with_pure_python(seasons, monkeypatch):
+    pytest.importorskip("numpy")
+    vectorised = st.simulate(seasons, 20_000, 0, 1)
+    monkeypatch.setattr(st, "np", None)
+    looped = st.simulate(seasons, 20_000, 0, 1)
+    assert (vectorised["engine"], looped["engine"]) == ("numpy", "python")
+    for season_id, season in looped["seasons"].items():
+        other = vectorised["seasons"][season_id]
+        # independent generators: compare within ~5 standard errors of a 20k-draw estimate
+        assert season["campaign_win_probability"] == pytest.approx(other["campaign_win_probability"], abs=0.02)
+        for tie, other_tie in zip(season["ties"], other["ties"]):
+            assert tie["win_probability"] == pytest.approx(other_tie["win_probability"], abs=0.02)
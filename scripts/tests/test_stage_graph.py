@@ -0,0 +1,106 @@
+import inspect
+import os
+import types
+
+import pytest
+
+import generate_data as gd
+
+
+def published(data_dir, fingerprints):
+    """A previous-build record with every stage's files written and current"""
+    previous = {}
+    for name, stage in gd.STAGES.items():
+        artifacts = {}
+        for output in stage.outputs:
+            path = data_dir / output.replace("/", "_")
+            path.write_text(name)
+            artifacts[path.name] = {"sha256": gd._file_hash(str(path))}
+        previous[name] = {"fingerprint": fingerprints[name], "artifacts": artifacts}
+    return previous
+
+
+def test_plan_stages(tmp_path):
+    fingerprints = gd.stage_fingerprints("seasons")
+    previous = published(tmp_path, fingerprints)
+    every = list(gd.STAGES)
+    assert gd.plan_stages(every, fingerprints, previous, str(tmp_path)) == []
+
+    # a changed fingerprint reruns that stage and the value-only stages it reads
+    changed = dict(fingerprints, players="edited", dataset="edited")
+    assert gd.plan_stages(every, changed, previous, str(tmp_path)) == ["cross_season", "shards", "players", "dataset"]
+    # ... but only when it is among the targets or their inputs
+    assert gd.plan_stages(["indexes"], changed, previous, str(tmp_path)) == []
+
+    # a published file edited or deleted since the last build reruns its stage
+    (tmp_path / gd.HEAD_TO_HEAD_NAME).write_text("stale")
+    os.remove(tmp_path / gd.SQLITE_NAME)
+    assert gd.plan_stages(every, fingerprints, previous, str(tmp_path)) == ["head_to_head", "sqlite"]
+
+    # no previous record at all: everything the target needs
+    assert gd.plan_stages(["dataset"], fingerprints, {}, str(tmp_path)) == ["cross_season", "shards", "dataset"]
+
+
+def test_stage_fingerprints_follow_inputs():
+    before, after = gd.stage_fingerprints("a"), gd.stage_fingerprints("b")
+    assert all(before[name] != after[name] for name in gd.STAGES)
+    assert gd.resolve_target("index.min.json.gz") == "shards"
+    assert gd.resolve_target("patches/7.json") == "dataset"
+    with pytest.raises(KeyError):
+        gd.resolve_target("nothing.json")
+
+
+def stage_inputs(data_dir):
+    sources = [gd.SeasonSource(os.path.join(gd.SEASONS_DIR, name)).load() for name in sorted(os.listdir(gd.SEASONS_DIR))]
+    seasons, totals = gd.build_seasons(sources)
+    comparison = [gd.compute_comparison_row(season, totals, i) for i, season in enumerate(seasons)]
+    return gd.BuildInputs(seasons, totals, comparison, {season.id: {} for season in seasons}, str(data_dir))
+
+
+def referenced(root) -> set:
+    """generate_data functions and classes reachable from root's code by name"""
+    found, pending = set(), [root]
+    while pending:
+        obj = pending.pop()
+        members = vars(obj).values() if inspect.isclass(obj) else [obj]
+        codes = [getattr(member, "__func__", member).__code__ for member in members
+                 if inspect.isfunction(getattr(member, "__func__", member))]
+        while codes:
+            code = codes.pop()
+            codes.extend(const for const in code.co_consts if isinstance(const, types.CodeType))
+            for name in code.co_names:
+                dep = getattr(gd, name, None)
+                if (inspect.isfunction(dep) or inspect.isclass(dep)) and dep.__module__ == gd.__name__ and dep not in found:
+                    found.add(dep)
+                    pending.append(dep)
+    return found
+
+
+def test_metric_hash_covers_cached_entries():
+    # cached season entries are reused while the metric hash matches, so it
+    # must cover every function that shapes them
+    missing = ({gd.build_entries} | referenced(gd.build_entries)) - set(gd.METRIC_FUNCTIONS)
+    assert sorted(dep.__name__ for dep in missing) == []
+
+
+def test_run_stages_profiles_each_stage(tmp_path):
+    stats = gd.BuildStats(enabled=True)
+    values, artifacts = gd.run_stages(["cross_season", "players", "form"], stage_inputs(tmp_path), 4, stats)
+    assert [record["stage"] for record in stats.stages] == ["cross_season", "players", "form"]
+    assert stats.stages[1]["files"] == len(artifacts["players"]) and stats.stages[1]["output_bytes"] > 0
+    for batch in artifacts.values():
+        for artifact in batch:
+            artifact.discard()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_failed_stage_leaves_no_staged_files(tmp_path, monkeypatch, workers):
+    def broken(inputs):
+        gd.stage_document(os.path.join(inputs.data_dir, "broken.json"), {"half": "written"})
+        raise RuntimeError("stage failed")
+
+    monkeypatch.setitem(gd.STAGES, "form", gd.Stage("form", (), broken, ()))
+    with pytest.raises(RuntimeError, match="stage failed"):
+        gd.run_stages(["players", "head_to_head", "form", "indexes"], stage_inputs(tmp_path), workers, gd.BuildStats())
+    assert os.listdir(tmp_path) == []
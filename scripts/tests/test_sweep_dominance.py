@@ -0,0 +1,23 @@
+import pytest
+
+import sweep_dominance as sd
+
+COMPONENTS = ([3.0, 1.25, -0.5, 0.0], [0.75, 0.5, 0.1, 0.0], [0.5, 0.25, 0.0, 1.0])
+CAPS = [1.5, 2.5, 3]
+
+
+def test_score_grid_pure_python(monkeypatch):
+    monkeypatch.setattr(sd, "np", None)
+    results = sd.score_grid(COMPONENTS, sd.weight_grid(50), CAPS)
+    assert [(weights, cap) for weights, cap, _ in results[:3]] == [((0, 0, 100), 1.5), ((0, 50, 50), 1.5), ((0, 100, 0), 1.5)]
+    assert len(results) == 6 * len(CAPS)
+    assert results[0][2] == [50.0, 25.0, 0.0, 100.0]
+    assert sd.score_grid(COMPONENTS, [], CAPS) == []
+
+
+def test_score_grid_numpy_matches_pure_python(monkeypatch):
+    pytest.importorskip("numpy")
+    weights = sd.weight_grid(5)
+    vectorised = sd.score_grid(COMPONENTS, weights, CAPS)
+    monkeypatch.setattr(sd, "np", None)
+    assert vectorised == sd.score_grid(COMPONENTS, weights, CAPS)
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+import generate_data as gd
+
+
+def season(season_id: str) -> gd.Season:
+    return gd.SeasonSource(os.path.join(gd.SEASONS_DIR, f"{season_id}.json")).load()
+
+
+def with_match(source: gd.Season, i: int, **changes) -> gd.Season:
+    matches = list(source.matches)
+    matches[i] = matches[i].replace(**changes)
+    return source.replace(matches=matches)
+
+
+
+@pytest.mark.parametrize("score, expected", [
+    ("2-0", (2, 0)),
+    ("1-1 (a.e.t.)", (1, 1)),
+    (" 4-3 ", (4, 3)),
+    ("2–0", None),
+    ("-1", None),
+    (None, None),
+])
+def test_parse_score(score, expected):
+    assert gd.parse_score(score) == expected
+
+
+def test_leg_totals_read_both_notations():
+    legs = [{"score": "4-0", "venue": "H"}, {"score": "1-1", "venue": "A"}]
+    assert gd._leg_totals(legs) == [(5, 1), (5, 1)]
+    assert gd._leg_totals([{"score": "0-1", "venue": "A"}, {"score": "1-0", "venue": "H"}]) == [(1, 1), (2, 0)]
+    assert gd._leg_totals([{"score": None, "venue": "H"}]) == []
+
+
+def test_real_seasons_report_only_known_issues():
+    messages = [message for name in sorted(os.listdir(gd.SEASONS_DIR)) for message in gd.validate_season(season(name[:-5]))]
+    assert [message.split(":")[0] for message in messages] == [
+        "2005-06 knockout_path[2] (Semi-final AC Milan)",
+        "2010-11 knockout_path[0] (Round of 16 Arsenal)",
+        "2014-15 knockout_path[2] (Semi-final Bayern Munich)",
+    ]
+
+
+def test_match_problems_are_located():
+    source = season("2008-09")
+    where = "2008-09 matches[0] (2008-09-16 Sporting CP)"
+    assert list(gd.validate_season(with_match(source, 0, score="3-1"))) == [
+        f"{where}: score '3-1' does not match goals 2-1",
+    ]
+    assert list(gd.validate_season(with_match(source, 0, scorers=["Messi"]))) == [
+        f"{where}: 1 scorers listed for 2 goals",
+    ]
+    assert list(gd.validate_season(with_match(source, 0, scorers=[]))) == [
+        f"{where}: 2 goals but no scorers listed",
+    ]
+
+
+def test_incomplete_scorer_seasons_are_not_checked(monkeypatch):
+    source = with_match(season("2008-09"), 0, scorers=[])
+    monkeypatch.setattr(gd, "INCOMPLETE_SCORERS", frozenset({"2008-09"}))
+    assert list(gd.validate_season(source)) == []
+
+
+def test_declared_totals_and_aggregates_are_checked():
+    source = season("2008-09").replace(wins=1, draws=1, losses=1, matches_played=13)
+    messages = list(gd.validate_season(source))
+    assert messages[0] == "2008-09: wins + draws + losses = 3, matches_played = 13"
+    assert "2008-09: wins is 1, match records give 7" in messages
+
+    ties = list(source.knockout_path)
+    ties[1] = ties[1].replace(aggregate="6-1")
+    messages = list(gd.validate_season(season("2008-09").replace(knockout_path=ties)))
+    assert messages == [
+        "2008-09 knockout_path[1] (Quarter-final Bayern Munich): aggregate '6-1' does not match legs 4-0 + 1-1",
+        "2008-09 knockout_path[1] (Quarter-final Bayern Munich): aggregate '6-1' does not match match records 5-1",
+    ]
@@ -1,14 +1,22 @@
 import { NextResponse } from 'next/server';
-import { getSeasonById } from '@/lib/data';
+import { loadSeason, notModified, seasonEtag } from '@/lib/shards';
 
 export async function GET(
   request: Request,
   { params }: { params: Promise<{ season: string }> }
 ) {
   const { season: seasonId } = await params;
-  const season = getSeasonById(seasonId);
+  const etag = seasonEtag(seasonId);
+  if (!etag) {
+    return NextResponse.json({ error: 'Season not found' }, { status: 404 });
+  }
+  const cached = notModified(request, etag);
+  if (cached) {
+    return cached;
+  }
+  const season = await loadSeason(seasonId);
   if (!season) {
     return NextResponse.json({ error: 'Season not found' }, { status: 404 });
   }
-  return NextResponse.json(season.matches);
+  return NextResponse.json(season.matches, { headers: { ETag: etag } });
 }
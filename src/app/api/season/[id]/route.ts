@@ -1,14 +1,22 @@
 import { NextResponse } from 'next/server';
-import { getSeasonById } from '@/lib/data';
+import { loadSeason, notModified, seasonEtag } from '@/lib/shards';
 
 export async function GET(
   request: Request,
   { params }: { params: Promise<{ id: string }> }
 ) {
   const { id } = await params;
-  const season = getSeasonById(id);
+  const etag = seasonEtag(id);
+  if (!etag) {
+    return NextResponse.json({ error: 'Season not found' }, { status: 404 });
+  }
+  const cached = notModified(request, etag);
+  if (cached) {
+    return cached;
+  }
+  const season = await loadSeason(id);
   if (!season) {
     return NextResponse.json({ error: 'Season not found' }, { status: 404 });
   }
-  return NextResponse.json(season);
+  return NextResponse.json(season, { headers: { ETag: etag } });
 }
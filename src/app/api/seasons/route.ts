@@ -1,8 +1,8 @@
 import { NextResponse } from 'next/server';
-import { getAllSeasons } from '@/lib/data';
+import { getSeasonIndex } from '@/lib/shards';
 
 export async function GET() {
-  const seasons = getAllSeasons();
+  const seasons = getSeasonIndex();
   const summaries = seasons.map(s => ({
     id: s.id,
     display_name: s.display_name,
@@ -1,7 +1,7 @@
 'use client';
 
 import { useState } from 'react';
-import { getAllSeasons } from '@/lib/data';
+import { getAllSeasons, getPlayerTotals } from '@/lib/data';
 import { ComparisonBar } from '@/components/Charts';
 import { Season } from '@/lib/types';
 
@@ -29,34 +29,14 @@ export default function PlayersPage() {
   }));
 
   // Aggregate player data across all seasons
-  const playerMap: Record<string, {
-    goals: number;
-    assists: number;
-    minutes: number;
-    seasons: string[];
-  }> = {};
-
-  seasons.forEach(s => {
-    s.top_scorers.forEach(p => {
-      if (!playerMap[p.name]) {
-        playerMap[p.name] = { goals: 0, assists: 0, minutes: 0, seasons: [] };
-      }
-      playerMap[p.name].goals += p.goals;
-      playerMap[p.name].assists += p.assists;
-      playerMap[p.name].minutes += p.minutes;
-      playerMap[p.name].seasons.push(s.display_name);
-    });
-  });
-
-  const allTimePlayers = Object.entries(playerMap)
-    .map(([name, stats]) => ({
-      name,
-      ...stats,
-      per90Goals: stats.minutes > 0 ? ((stats.goals / stats.minutes) * 90).toFixed(2) : '0.00',
-      per90Assists: stats.minutes > 0 ? ((stats.assists / stats.minutes) * 90).toFixed(2) : '0.00',
-      contributions: stats.goals + stats.assists,
-    }))
-    .sort((a, b) => b.contributions - a.contributions);
+  const displayNames = Object.fromEntries(seasons.map(s => [s.id, s.display_name]));
+  const allTimePlayers = getPlayerTotals().map(p => ({
+    ...p,
+    seasons: p.seasons.map(id => displayNames[id]),
+    per90Goals: p.minutes > 0 ? ((p.goals / p.minutes) * 90).toFixed(2) : '0.00',
+    per90Assists: p.minutes > 0 ? ((p.assists / p.minutes) * 90).toFixed(2) : '0.00',
+    contributions: p.goals + p.assists,
+  }));
 
   return (
     <>
@@ -2,7 +2,8 @@
 
 import Link from 'next/link';
 import { Season } from '@/lib/types';
-import { MatchGoalsLine, ComparisonBar } from '@/components/Charts';
+import { MatchGoalsLine, MatchGoalsPoint, ComparisonBar } from '@/components/Charts';
+import type { HeadToHeadSummary } from '@/lib/headToHead';
 
 function getResult(gs: number, gc: number): string {
   if (gs > gc) return 'W';
@@ -10,13 +11,44 @@ function getResult(gs: number, gc: number): string {
   return 'L';
 }
 
-export default function SeasonDetailClient({ season }: { season: Season }) {
-  const matchChartData = season.matches.map((m, i) => ({
-    match: `${m.opponent} (${m.home_away})`,
-    goals_scored: m.goals_scored,
-    goals_conceded: m.goals_conceded,
-  }));
+// Record against an opponent over every winning campaign it was met in
+function RivalryNote({ summary }: { summary: HeadToHeadSummary }) {
+  const t = summary.total;
+  return (
+    <div style={{
+      fontSize: '0.75rem',
+      color: 'var(--color-text-muted)',
+      marginTop: '0.25rem',
+    }}>
+      Met in {Object.keys(summary.bySeason).length} winning campaigns: {t.wins}W {t.draws}D {t.losses}L,
+      goals {t.goals_for}–{t.goals_against}, ties won {t.ties_won}/{t.ties_won + t.ties_lost}
+    </div>
+  );
+}
+
+export interface SimilarCampaign {
+  id: string;
+  display_name: string;
+  distance: number;
+}
+
+interface SeasonDetailProps {
+  season: Season;
+  formData: MatchGoalsPoint[];
+  formWindow: number;
+  rivalries: Record<string, HeadToHeadSummary>;
+  similarCampaigns: SimilarCampaign[];
+  closestMatches: (string | null)[];
+}
 
+export default function SeasonDetailClient({
+  season,
+  formData,
+  formWindow,
+  rivalries,
+  similarCampaigns,
+  closestMatches,
+}: SeasonDetailProps) {
   const homeMatches = season.matches.filter(m => m.home_away === 'H');
   const awayMatches = season.matches.filter(m => m.home_away === 'A');
   const homeWins = homeMatches.filter(m => m.goals_scored > m.goals_conceded).length;
@@ -117,7 +149,7 @@ export default function SeasonDetailClient({ season }: { season: Season }) {
           <h3 style={{ fontSize: '0.8125rem', fontWeight: 600, marginBottom: '1rem', color: 'var(--color-text-secondary)' }}>
             Goals Per Match
           </h3>
-          <MatchGoalsLine data={matchChartData} height={260} />
+          <MatchGoalsLine data={formData} rollingWindow={formWindow} height={260} />
         </div>
         <div className="chart-container">
           <h3 style={{ fontSize: '0.8125rem', fontWeight: 600, marginBottom: '1rem', color: 'var(--color-text-secondary)' }}>
@@ -228,6 +260,7 @@ export default function SeasonDetailClient({ season }: { season: Season }) {
                 📍 {round.venue}
               </div>
             )}
+            {rivalries[round.opponent] && <RivalryNote summary={rivalries[round.opponent]} />}
             <div style={{
               display: 'flex',
               gap: '0.375rem',
@@ -366,6 +399,7 @@ export default function SeasonDetailClient({ season }: { season: Season }) {
               <th>Score</th>
               <th>Scorers</th>
               {season.avg_possession !== null && <th>Poss</th>}
+              <th>Closest Match</th>
             </tr>
           </thead>
           <tbody>
@@ -393,6 +427,9 @@ export default function SeasonDetailClient({ season }: { season: Season }) {
                       {match.possession !== null ? `${match.possession}%` : 'N/A'}
                     </td>
                   )}
+                  <td style={{ fontSize: '0.8125rem', color: 'var(--color-text-secondary)' }}>
+                    {closestMatches[i] ?? '—'}
+                  </td>
                 </tr>
               );
             })}
@@ -421,6 +458,26 @@ export default function SeasonDetailClient({ season }: { season: Season }) {
           </span>
         ))}
       </div>
+
+      {/* Similar Campaigns */}
+      {similarCampaigns.length > 0 && (
+        <>
+          <h2 className="section-title">Most Similar Campaigns</h2>
+          <div style={{
+            display: 'grid',
+            gridTemplateColumns: 'repeat(auto-fit, minmax(160px, 1fr))',
+            gap: '0.75rem',
+            marginBottom: '2rem',
+          }}>
+            {similarCampaigns.map(similar => (
+              <Link key={similar.id} href={`/season/${similar.id}`} className="stat-card" style={{ textDecoration: 'none', color: 'inherit' }}>
+                <div style={{ fontSize: '1rem', fontWeight: 600 }}>{similar.display_name}</div>
+                <div className="stat-label">Distance {similar.distance.toFixed(2)}</div>
+              </Link>
+            ))}
+          </div>
+        </>
+      )}
     </>
   );
 }
@@ -1,7 +1,61 @@
 import { getSeasonById, getAllSeasons } from '@/lib/data';
+import { FORM_WINDOW, formMatch, getSeasonForm } from '@/lib/form';
+import { getHeadToHead, HeadToHeadSummary } from '@/lib/headToHead';
+import { getSimilarMatches, getSimilarSeasons } from '@/lib/similarity';
+import { Match, Season } from '@/lib/types';
+import type { MatchGoalsPoint } from '@/components/Charts';
+import type { SimilarCampaign } from './SeasonDetailClient';
 import { notFound } from 'next/navigation';
 import SeasonDetailClient from './SeasonDetailClient';
 
+// Chart rows in date order, with the rolling averages generate_data.py precomputed
+function getFormData(season: Season): MatchGoalsPoint[] {
+  const form = getSeasonForm(season.id);
+  if (!form) {
+    return season.matches.map(m => ({
+      match: `${m.opponent} (${m.home_away})`,
+      goals_scored: m.goals_scored,
+      goals_conceded: m.goals_conceded,
+    }));
+  }
+  return form.order.map((_, i) => {
+    const m = formMatch(season, form, i) as Match;
+    return {
+      match: `${m.opponent} (${m.home_away})`,
+      goals_scored: m.goals_scored,
+      goals_conceded: m.goals_conceded,
+      rolling_for: form.rolling.goals_for[i],
+      rolling_against: form.rolling.goals_against[i],
+    };
+  });
+}
+
+// Knockout opponents also met in other winning campaigns, with the record against them
+function getRivalries(season: Season): Record<string, HeadToHeadSummary> {
+  const rivalries: Record<string, HeadToHeadSummary> = {};
+  for (const { opponent } of season.knockout_path) {
+    const summary = getHeadToHead(opponent);
+    if (summary && Object.keys(summary.bySeason).length > 1) rivalries[opponent] = summary;
+  }
+  return rivalries;
+}
+
+function getSimilarCampaigns(season: Season): SimilarCampaign[] {
+  return getSimilarSeasons(season.id).map(({ season: similar, distance }) => ({
+    id: similar.id,
+    display_name: similar.display_name,
+    distance,
+  }));
+}
+
+// The closest match from any campaign to each of season.matches, if there is one
+function getClosestMatches(season: Season): (string | null)[] {
+  return season.matches.map((_, i) => {
+    const [closest] = getSimilarMatches(season.id, i);
+    return closest ? `${closest.match.opponent} ${closest.match.score} (${closest.season.display_name})` : null;
+  });
+}
+
 export function generateStaticParams() {
   const seasons = getAllSeasons();
   return seasons.map((s) => ({ id: s.id }));
@@ -19,5 +73,14 @@ export default async function SeasonPage({
     notFound();
   }
 
-  return <SeasonDetailClient season={season} />;
+  return (
+    <SeasonDetailClient
+      season={season}
+      formData={getFormData(season)}
+      formWindow={FORM_WINDOW}
+      rivalries={getRivalries(season)}
+      similarCampaigns={getSimilarCampaigns(season)}
+      closestMatches={getClosestMatches(season)}
+    />
+  );
 }
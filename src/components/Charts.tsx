@@ -114,16 +114,22 @@ export function ComparisonBar({
   );
 }
 
+// One match of a season, in date order; rolling_* are the precomputed form averages
+export interface MatchGoalsPoint {
+  match: string;
+  goals_scored: number;
+  goals_conceded: number;
+  rolling_for?: number;
+  rolling_against?: number;
+}
+
 interface MatchGoalsLineProps {
-  data: Array<{
-    match: string;
-    goals_scored: number;
-    goals_conceded: number;
-  }>;
+  data: MatchGoalsPoint[];
   height?: number;
+  rollingWindow?: number;
 }
 
-export function MatchGoalsLine({ data, height = 280 }: MatchGoalsLineProps) {
+export function MatchGoalsLine({ data, height = 280, rollingWindow }: MatchGoalsLineProps) {
   return (
     <ResponsiveContainer width="100%" height={height}>
       <LineChart data={data}>
@@ -162,6 +168,27 @@ export function MatchGoalsLine({ data, height = 280 }: MatchGoalsLineProps) {
           dot={{ r: 3, fill: COLORS.loss }}
           strokeDasharray="4 3"
         />
+        {rollingWindow !== undefined && (
+          <Line
+            type="monotone"
+            dataKey="rolling_for"
+            name={`Scored (${rollingWindow}-match avg)`}
+            stroke={COLORS.tertiary}
+            strokeWidth={2}
+            dot={false}
+          />
+        )}
+        {rollingWindow !== undefined && (
+          <Line
+            type="monotone"
+            dataKey="rolling_against"
+            name={`Conceded (${rollingWindow}-match avg)`}
+            stroke={COLORS.quaternary}
+            strokeWidth={2}
+            dot={false}
+            strokeDasharray="4 3"
+          />
+        )}
       </LineChart>
     </ResponsiveContainer>
   );
@@ -1,14 +1,17 @@
-import { DataSet, Season, CrossSeasonData } from './types';
+import { DataSet, Season, CrossSeasonData, PlayerTable, PlayerTotals } from './types';
 import rawData from '../../public/data/barca_ucl_data.json';
+import rawPlayers from '../../public/data/players.json';
 
 const data = rawData as unknown as DataSet;
+const players = rawPlayers as unknown as PlayerTable;
+const seasonsById = new Map(data.seasons.map(s => [s.id, s]));
 
 export function getAllSeasons(): Season[] {
   return data.seasons;
 }
 
 export function getSeasonById(id: string): Season | undefined {
-  return data.seasons.find(s => s.id === id);
+  return seasonsById.get(id);
 }
 
 export function getCrossSeasonData(): CrossSeasonData {
@@ -18,3 +21,8 @@ export function getCrossSeasonData(): CrossSeasonData {
 export function getMetadata() {
   return data.metadata;
 }
+
+// All scorers across seasons, ranked by goals + assists
+export function getPlayerTotals(): PlayerTotals[] {
+  return players.players;
+}
@@ -0,0 +1,17 @@
+import { FormCurves, Match, Season, SeasonForm } from './types';
+import rawForm from '../../public/data/form.json';
+
+const form = rawForm as unknown as FormCurves;
+
+// Window length of the precomputed rolling series
+export const FORM_WINDOW = form.window;
+
+export function getSeasonForm(seasonId: string): SeasonForm | undefined {
+  return form.seasons[seasonId];
+}
+
+// The Season.matches entry plotted at position i of a form series
+export function formMatch(season: Season, form: SeasonForm, i: number): Match | undefined {
+  return season.matches[form.order[i]];
+}
+
@@ -0,0 +1,27 @@
+import { HeadToHead, HeadToHeadRecord } from './types';
+import rawHeadToHead from '../../public/data/head_to_head.json';
+
+const headToHead = rawHeadToHead as unknown as HeadToHead;
+
+function toRecord(values: number[]): HeadToHeadRecord {
+  const record = {} as HeadToHeadRecord;
+  headToHead.columns.forEach((column, i) => { record[column] = values[i]; });
+  return record;
+}
+
+export interface HeadToHeadSummary {
+  opponent: string;
+  total: HeadToHeadRecord;
+  bySeason: Record<string, HeadToHeadRecord>;
+}
+
+// Record against one opponent, overall and per season it was met
+export function getHeadToHead(opponent: string): HeadToHeadSummary | undefined {
+  const o = headToHead.opponents.indexOf(opponent);
+  if (o < 0) return undefined;
+  const bySeason: Record<string, HeadToHeadRecord> = {};
+  for (const [cellOpponent, s, ...values] of headToHead.cells) {
+    if (cellOpponent === o) bySeason[headToHead.seasons[s]] = toRecord(values);
+  }
+  return { opponent, total: toRecord(headToHead.totals[o].slice(1)), bySeason };
+}
@@ -0,0 +1,47 @@
+import { NextResponse } from 'next/server';
+import { Season, SeasonIndex, SeasonIndexEntry } from './types';
+import rawIndex from '../../public/data/index.json';
+
+// Server-side access to the per-season shards written by generate_data.py.
+// Only the small index manifest is bundled eagerly; a season's shard is
+// loaded on first request and kept for the lifetime of the instance.
+
+const index = rawIndex as unknown as SeasonIndex;
+const entriesById = new Map(index.seasons.map(entry => [entry.id, entry]));
+const shardCache = new Map<string, Promise<Season>>();
+
+export function getSeasonIndex(): SeasonIndexEntry[] {
+  return index.seasons;
+}
+
+export async function loadSeason(id: string): Promise<Season | undefined> {
+  if (!entriesById.has(id)) {
+    return undefined;
+  }
+  let shard = shardCache.get(id);
+  if (!shard) {
+    shard = import(`../../public/data/seasons/${id}.json`).then(mod => mod.default as Season);
+    shardCache.set(id, shard);
+  }
+  return shard;
+}
+
+// Shard hashes change whenever a season's content does, so they double as
+// validators. Route bodies are re-serialized by NextResponse, hence weak.
+export function seasonEtag(id: string): string | undefined {
+  const entry = entriesById.get(id);
+  return entry && `W/"${entry.sha256}"`;
+}
+
+export function notModified(request: Request, etag: string): NextResponse | undefined {
+  const header = request.headers.get('if-none-match');
+  if (!header) {
+    return undefined;
+  }
+  const opaque = etag.replace(/^W\//, '');
+  const match = header.split(',').some(tag => {
+    const t = tag.trim();
+    return t === '*' || t.replace(/^W\//, '') === opaque;
+  });
+  return match ? new NextResponse(null, { status: 304, headers: { ETag: etag } }) : undefined;
+}
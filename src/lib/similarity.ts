@@ -0,0 +1,36 @@
+import { Match, Season, Similarity } from './types';
+import { getAllSeasons, getSeasonById } from './data';
+import rawSimilarity from '../../public/data/similarity.json';
+
+const similarity = rawSimilarity as unknown as Similarity;
+
+export interface SimilarSeason {
+  season: Season;
+  distance: number;
+}
+
+export interface SimilarMatch {
+  season: Season;
+  match: Match;
+  distance: number;
+}
+
+// Campaigns most like seasonId, closest first
+export function getSimilarSeasons(seasonId: string): SimilarSeason[] {
+  return (similarity.seasons[seasonId] ?? []).flatMap(({ season, distance }) => {
+    const found = getSeasonById(season);
+    return found ? [{ season: found, distance }] : [];
+  });
+}
+
+// Matches most like season.matches[matchIndex], closest first
+export function getSimilarMatches(seasonId: string, matchIndex: number): SimilarMatch[] {
+  const seasons = getAllSeasons();
+  const s = seasons.findIndex(season => season.id === seasonId);
+  if (s < 0) return [];
+  return (similarity.matches[s]?.[matchIndex] ?? []).map(([ns, nm, distance]) => ({
+    season: seasons[ns],
+    match: seasons[ns].matches[nm],
+    distance,
+  }));
+}
@@ -110,6 +110,7 @@ export interface CrossSeasonData {
 
 export interface DataSet {
   metadata: {
+    version: number;
     title: string;
     description: string;
     seasons_covered: string[];
@@ -119,3 +120,128 @@ export interface DataSet {
   seasons: Season[];
   cross_season: CrossSeasonData;
 }
+
+export interface SeasonIndexEntry {
+  id: string;
+  display_name: string;
+  manager: string;
+  matches_played: number;
+  goals_scored: number;
+  goals_conceded: number;
+  goal_difference: number;
+  win_percentage: number;
+  shard: string;
+  bytes: number;
+  sha256: string;
+}
+
+export interface SeasonIndex {
+  seasons: SeasonIndexEntry[];
+}
+
+// [season_index, match_index] into MatchIndexes.seasons / Season.matches
+export type MatchRef = [number, number];
+
+export interface MatchIndexes {
+  seasons: string[];
+  by_opponent: Record<string, MatchRef[]>;
+  by_scorer: Record<string, MatchRef[]>;
+  own_goals: MatchRef[];
+  by_stage: Record<string, MatchRef[]>;
+  by_date: {
+    dates: string[];
+    refs: MatchRef[];
+  };
+}
+
+export interface PlayerTotals {
+  id: string;
+  name: string;
+  goals: number;
+  assists: number;
+  minutes: number;
+  seasons: string[];
+  goals_by_season: Record<string, number>;
+}
+
+export interface PlayerTable {
+  players: PlayerTotals[];
+  own_goals: Record<string, number>;
+}
+
+export interface HeadToHeadRecord {
+  played: number;
+  wins: number;
+  draws: number;
+  losses: number;
+  goals_for: number;
+  goals_against: number;
+  ties_won: number;
+  ties_lost: number;
+}
+
+// Sparse opponent x season matrix; cells are [opponent, season, ...columns]
+export interface HeadToHead {
+  seasons: string[];
+  opponents: string[];
+  columns: (keyof HeadToHeadRecord)[];
+  cells: number[][];
+  totals: number[][];
+}
+
+// prefix[stat][i] = total over the first i matches of the season
+export interface FormPrefixSums {
+  goals_for: number[];
+  goals_against: number[];
+  clean_sheets: number[];
+  possession: number[];
+  possession_tracked: number[];
+  shots: number[];
+  shots_on_target: number[];
+  shots_tracked: number[];
+}
+
+// Every series runs over the season's matches in date order;
+// order[i] is the index in Season.matches of the i-th match by date
+export interface SeasonForm {
+  order: number[];
+  prefix: FormPrefixSums;
+  cumulative_goals_for: number[];
+  cumulative_goals_against: number[];
+  clean_sheet_rate: number[];
+  rolling: {
+    goals_for: number[];
+    goals_against: number[];
+    possession: (number | null)[];
+    shots: (number | null)[];
+    shot_accuracy: (number | null)[];
+  };
+}
+
+export interface FormCurves {
+  window: number;
+  seasons: Record<string, SeasonForm>;
+}
+
+// [season_index, match_index, distance] into Similarity.matches
+export type MatchNeighbour = [number, number, number];
+
+export interface Similarity {
+  k: number;
+  season_features: string[];
+  match_features: string[];
+  seasons: Record<string, { season: string; distance: number }[]>;
+  matches: MatchNeighbour[][][];
+}
+
+// RFC 6902 operation; paths are JSON Pointers into DataSet
+export type JsonPatchOperation =
+  | { op: "add" | "replace"; path: string; value: unknown }
+  | { op: "remove"; path: string };
+
+// public/data/patches/<to_version>.json
+export interface DataSetPatch {
+  from_version: number;
+  to_version: number;
+  patch: JsonPatchOperation[];
+}